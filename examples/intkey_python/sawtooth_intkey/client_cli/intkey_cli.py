@@ -14,15 +14,20 @@
 # ------------------------------------------------------------------------------
 
 import argparse
+import contextlib
 import getpass
 import logging
 import os
 import sys
 import traceback
-import pkg_resources
 
 from colorlog import ColoredFormatter
 
+from sawtooth_sdk.client.events import EventClient
+from sawtooth_sdk.client.exceptions import EventSubscriptionError
+from sawtooth_sdk.client.rest import create_session
+from sawtooth_sdk.version import VersionAction
+
 from sawtooth_intkey.client_cli.generate import add_generate_parser
 from sawtooth_intkey.client_cli.generate import do_generate
 from sawtooth_intkey.client_cli.populate import add_populate_parser
@@ -86,16 +91,11 @@ def create_parent_parser(prog_name):
         action='count',
         help='enable more verbose output')
 
-    try:
-        version = pkg_resources.get_distribution(DISTRIBUTION_NAME).version
-    except pkg_resources.DistributionNotFound:
-        version = 'UNKNOWN'
-
     parent_parser.add_argument(
         '-V', '--version',
-        action='version',
-        version=(DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}')
-        .format(version),
+        action=VersionAction,
+        distribution=DISTRIBUTION_NAME,
+        template=DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}',
         help='display version information')
 
     return parent_parser
@@ -115,6 +115,7 @@ def create_parser(prog_name):
     add_dec_parser(subparsers, parent_parser)
     add_show_parser(subparsers, parent_parser)
     add_list_parser(subparsers, parent_parser)
+    add_batch_ops_parser(subparsers, parent_parser)
 
     add_generate_parser(subparsers, parent_parser)
     add_load_parser(subparsers, parent_parser)
@@ -161,11 +162,19 @@ def add_set_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for transaction to commit')
 
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
 
 def do_set(args):
     name, value, wait = args.name, args.value, args.wait
-    client = _get_client(args)
-    response = client.set(name, value, wait)
+    with _get_events(args) as events, \
+            _get_client(args, events=events) as client:
+        response = client.set(name, value, wait)
     print(response)
 
 
@@ -205,11 +214,19 @@ def add_inc_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for transaction to commit')
 
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
 
 def do_inc(args):
     name, value, wait = args.name, args.value, args.wait
-    client = _get_client(args)
-    response = client.inc(name, value, wait)
+    with _get_events(args) as events, \
+            _get_client(args, events=events) as client:
+        response = client.inc(name, value, wait)
     print(response)
 
 
@@ -249,11 +266,19 @@ def add_dec_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for transaction to commit')
 
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
 
 def do_dec(args):
     name, value, wait = args.name, args.value, args.wait
-    client = _get_client(args)
-    response = client.dec(name, value, wait)
+    with _get_events(args) as events, \
+            _get_client(args, events=events) as client:
+        response = client.dec(name, value, wait)
     print(response)
 
 
@@ -279,8 +304,8 @@ def add_show_parser(subparsers, parent_parser):
 
 def do_show(args):
     name = args.name
-    client = _get_client(args, False)
-    value = client.show(name)
+    with _get_client(args, False) as client:
+        value = client.show(name)
     print('{}: {}'.format(name, value))
 
 
@@ -298,19 +323,144 @@ def add_list_parser(subparsers, parent_parser):
         type=str,
         help='specify URL of REST API')
 
+    parser.add_argument(
+        '--name-prefix',
+        type=str,
+        help='only display keys whose name starts with this prefix')
+
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        help='number of state entries to fetch from the REST API per request')
+
 
 def do_list(args):
-    client = _get_client(args, False)
-    results = client.list()
-    for pair in results:
-        for name, value in pair.items():
+    with _get_client(args, False) as client:
+        values = client.list_values(
+            name_prefix=args.name_prefix,
+            limit=args.page_size)
+        for name, value in values:
             print('{}: {}'.format(name, value))
 
 
-def _get_client(args, read_key_file=True):
+def add_batch_ops_parser(subparsers, parent_parser):
+    message = (
+        'Reads intkey operations from stdin, one per line, and runs them in '
+        'order over a single pooled connection to the REST API. Each line '
+        'is "set <name> <value>", "inc <name> <value>", "dec <name> <value>" '
+        'or "show <name>"; blank lines and lines starting with # are '
+        'ignored.')
+
+    parser = subparsers.add_parser(
+        'batch-ops',
+        parents=[parent_parser],
+        description=message,
+        help='Runs intkey operations read from stdin')
+
+    parser.add_argument(
+        '--url',
+        type=str,
+        help='specify URL of REST API')
+
+    parser.add_argument(
+        '--keyfile',
+        type=str,
+        help="identify file containing user's private key")
+
+    parser.add_argument(
+        '--wait',
+        nargs='?',
+        const=sys.maxsize,
+        type=int,
+        help='set time, in seconds, to wait for each transaction to commit')
+
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        help='set time, in seconds, to wait for each REST API response')
+
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='set number of times to retry failed connections '
+        '(default: 3)')
+
+    parser.add_argument(
+        '--atomic',
+        action='store_true',
+        help='submit every set, inc and dec in a single batch, which is '
+        'committed or rejected as a whole; show is not allowed')
+
+
+def do_batch_ops(args):
+    session = create_session(pool_size=1, retries=args.retries)
+    with session, _get_events(args) as events, \
+            _get_client(args, session=session, events=events) as client:
+        batch = client.batch() if args.atomic else None
+
+        for line_num, line in enumerate(sys.stdin, 1):
+            words = line.split()
+            if not words or words[0].startswith('#'):
+                continue
+
+            verb, params = words[0], words[1:]
+            try:
+                if verb in ('set', 'inc', 'dec') and len(params) == 2:
+                    if batch is not None:
+                        getattr(batch, verb)(params[0], int(params[1]))
+                    else:
+                        print(getattr(client, verb)(
+                            params[0], int(params[1]), args.wait))
+                elif verb == 'show' and batch is not None:
+                    raise IntKeyCliException(
+                        'show is not allowed with --atomic')
+                elif verb == 'show' and len(params) == 1:
+                    print('{}: {}'.format(
+                        params[0], client.show(params[0])))
+                else:
+                    raise IntKeyCliException(
+                        'invalid operation: {}'.format(line.strip()))
+            except (ValueError, IntKeyCliException,
+                    IntkeyClientException) as err:
+                raise IntKeyCliException(
+                    'line {}: {}'.format(line_num, err)) from err
+
+        if batch:
+            print(batch.submit(wait=args.wait))
+
+
+def _get_client(args, read_key_file=True, session=None, events=None):
     return IntkeyClient(
         url=DEFAULT_URL if args.url is None else args.url,
-        keyfile=_get_keyfile(args) if read_key_file else None)
+        keyfile=_get_keyfile(args) if read_key_file else None,
+        session=session,
+        timeout=getattr(args, 'timeout', None),
+        events=events)
+
+
+@contextlib.contextmanager
+def _get_events(args):
+    """Yields an EventClient connected to --events-url, or None if it was
+    not given or there is nothing to wait for."""
+    if not (args.events_url and args.wait):
+        yield None
+        return
+
+    try:
+        events = EventClient(args.events_url)
+    except EventSubscriptionError as err:
+        raise IntKeyCliException(err) from err
+
+    with events:
+        yield events
 
 
 def _get_keyfile(args):
@@ -353,6 +503,8 @@ def main(prog_name=os.path.basename(sys.argv[0]), args=None):
         do_show(args)
     elif args.command == 'list':
         do_list(args)
+    elif args.command == 'batch-ops':
+        do_batch_ops(args)
     elif args.command == 'generate':
         do_generate(args)
     elif args.command == 'populate':
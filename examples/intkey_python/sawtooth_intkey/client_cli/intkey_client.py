@@ -17,6 +17,7 @@ import hashlib
 import base64
 import time
 import random
+import threading
 import requests
 import yaml
 import cbor
@@ -28,6 +29,8 @@ from sawtooth_signing import CryptoFactory
 from sawtooth_signing import ParseError
 from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
 
+from sawtooth_sdk.client.rest import create_session
+from sawtooth_sdk.client.rest import get_paging_suffix
 from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.transaction_pb2 import Transaction
 from sawtooth_sdk.protobuf.batch_pb2 import BatchList
@@ -39,9 +42,53 @@ def _sha512(data):
     return hashlib.sha512(data).hexdigest()
 
 
+# PENDING comes first, as a batch still pending may yet fail
+_STATUSES_WORST_FIRST = ('PENDING', 'INVALID', 'UNKNOWN', 'COMMITTED')
+
+
+def _worst_status(statuses):
+    """Returns PENDING while any of the batch statuses is pending, and
+    otherwise the worst of them, so INVALID if any batch is invalid."""
+    statuses = list(statuses)
+    return next(
+        (status for status in _STATUSES_WORST_FIRST if status in statuses),
+        statuses[0])
+
+
+def _check_status(status):
+    """Raises IntkeyClientException if batches waited for, whose worst
+    status is `status`, were invalid or had not resolved in time."""
+    if status == 'INVALID':
+        raise IntkeyClientException('Batch was invalid')
+    if status == 'PENDING':
+        raise IntkeyClientException(
+            'Timed out waiting for batch to commit')
+
+
 class IntkeyClient:
-    def __init__(self, url, keyfile=None):
+    def __init__(self, url, keyfile=None, session=None, timeout=None,
+                 events=None):
+        """
+        Args:
+            url (str): the REST API url
+            keyfile (str): the file holding the signing key, required to
+                send transactions
+            session (requests.Session): the session to send requests on,
+                such as one from create_session() shared between clients; a
+                new session from create_session() if not given. Only a
+                session created here is closed by close().
+            timeout (float): seconds to wait for each response, beyond any
+                wait requested from the REST API; no limit if not given
+                or when waiting without a bound
+            events (EventClient): if given, waits for batches to commit
+                are resolved by its block commit notifications instead of by
+                polling the REST API for batch statuses
+        """
         self.url = url
+        self._timeout = timeout
+        self._events = events
+        self._owns_session = session is None
+        self._session = create_session() if session is None else session
 
         if keyfile is not None:
             try:
@@ -61,6 +108,18 @@ class IntkeyClient:
             self._signer = CryptoFactory(
                 create_context('secp256k1')).new_signer(private_key)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the client's pooled connections, if it owns its session.
+        """
+        if self._owns_session:
+            self._session.close()
+
     def set(self, name, value, wait=None):
         return self._send_transaction('set', name, value, wait=wait)
 
@@ -70,22 +129,73 @@ class IntkeyClient:
     def dec(self, name, value, wait=None):
         return self._send_transaction('dec', name, value, wait=wait)
 
-    def list(self):
-        result = self._send_request(
-            "state?address={}".format(
-                self._get_prefix()))
+    def batch(self, batch_size=None):
+        """Starts a set of operations to sign and submit in one request.
 
-        try:
-            encoded_entries = yaml.safe_load(result)["data"]
+        Args:
+            batch_size (int): the most transactions to put in each batch;
+                all of them go in one batch if not given
 
+        Returns:
+            IntkeyBatch: add operations with its set, inc and dec methods,
+                which can be chained, then call its submit method
+        """
+        return IntkeyBatch(self, batch_size=batch_size)
+
+    def list(self, limit=None):
+        try:
             return [
                 cbor.loads(base64.b64decode(entry["data"]))
-                for entry in encoded_entries
+                for entry in self._list_state(limit=limit)
             ]
 
         except BaseException:
             return None
 
+    def list_values(self, name_prefix=None, limit=None):
+        """Yields (name, value) pairs for the keys in intkey state, fetching
+        one page of state entries at a time.
+
+        Args:
+            name_prefix (str): only yield keys whose name starts with this
+                prefix.
+            limit (int): the number of state entries to request per page.
+        """
+        for entry in self._list_state(limit=limit):
+            try:
+                values = cbor.loads(base64.b64decode(entry["data"]))
+            except BaseException as err:
+                raise IntkeyClientException(
+                    'Failed to decode state entry {}: {}'.format(
+                        entry.get("address"), err)) from err
+
+            for name, value in values.items():
+                if name_prefix is None or name.startswith(name_prefix):
+                    yield name, value
+
+    def _list_state(self, limit=None):
+        """Yields the intkey state entries, following the REST API's paging
+        links until every page has been read.
+        """
+        suffix = "state?address={}".format(self._get_prefix())
+        if limit is not None:
+            suffix += "&limit={}".format(limit)
+
+        while suffix is not None:
+            result = self._send_request(suffix)
+
+            try:
+                response = yaml.safe_load(result)
+                entries = response["data"]
+                next_url = response.get("paging", {}).get("next")
+            except BaseException as err:
+                raise IntkeyClientException(
+                    'Failed to parse state listing: {}'.format(err)) from err
+
+            yield from entries
+
+            suffix = get_paging_suffix(self._get_url(), next_url)
+
     def show(self, name):
         address = self._get_address(name)
 
@@ -99,11 +209,17 @@ class IntkeyClient:
         except BaseException:
             return None
 
-    def _get_status(self, batch_id, wait):
+    def _get_status(self, batch_ids, wait):
+        """Returns PENDING while any of the comma separated batches is
+        pending, and otherwise the worst of their statuses, so INVALID if
+        any of them is invalid.
+        """
         try:
             result = self._send_request(
-                'batch_statuses?id={}&wait={}'.format(batch_id, wait),)
-            return yaml.safe_load(result)['data'][0]['status']
+                'batch_statuses?id={}&wait={}'.format(batch_ids, wait),
+                wait=wait)
+            return _worst_status(
+                entry['status'] for entry in yaml.safe_load(result)['data'])
         except BaseException as err:
             raise IntkeyClientException(err) from err
 
@@ -115,11 +231,20 @@ class IntkeyClient:
         game_address = _sha512(name.encode('utf-8'))[64:]
         return prefix + game_address
 
-    def _send_request(self, suffix, data=None, content_type=None, name=None):
+    def _get_url(self):
+        """Returns the REST API url, with an http scheme if it had none."""
         if self.url.startswith("http://"):
-            url = "{}/{}".format(self.url, suffix)
-        else:
-            url = "http://{}/{}".format(self.url, suffix)
+            return self.url
+        return "http://{}".format(self.url)
+
+    def _send_request(self, suffix, data=None, content_type=None, name=None,
+                      wait=0):
+        timeout = None if self._timeout is None else self._timeout + wait
+        if timeout is not None and timeout > threading.TIMEOUT_MAX:
+            # a bare --wait asks to wait without a bound
+            timeout = None
+
+        url = "{}/{}".format(self._get_url(), suffix)
 
         headers = {}
 
@@ -128,9 +253,11 @@ class IntkeyClient:
 
         try:
             if data is not None:
-                result = requests.post(url, headers=headers, data=data)
+                result = self._session.post(
+                    url, headers=headers, data=data, timeout=timeout)
             else:
-                result = requests.get(url, headers=headers)
+                result = self._session.get(
+                    url, headers=headers, timeout=timeout)
 
             if result.status_code == 404:
                 raise IntkeyClientException("No such key: {}".format(name))
@@ -149,6 +276,42 @@ class IntkeyClient:
         return result.text
 
     def _send_transaction(self, verb, name, value, wait=None):
+        transaction = self._create_transaction(verb, name, value)
+        return self._send_batch_list(
+            self._create_batch_list([transaction]), wait=wait)
+
+    def _send_batch_list(self, batch_list, wait=None):
+        batch_ids = ','.join(
+            batch.header_signature for batch in batch_list.batches)
+
+        response = self._send_request(
+            "batches", batch_list.SerializeToString(),
+            'application/octet-stream',
+        )
+
+        if wait and wait > 0 and self._events is not None:
+            statuses = self._events.wait_for_batches(
+                [batch.header_signature for batch in batch_list.batches],
+                timeout=wait)
+            _check_status(_worst_status(statuses.values()))
+        elif wait and wait > 0:
+            wait_time = 0
+            start_time = time.time()
+            status = 'PENDING'
+            while wait_time < wait:
+                status = self._get_status(
+                    batch_ids,
+                    wait - int(wait_time),
+                )
+                wait_time = time.time() - start_time
+
+                if status != 'PENDING':
+                    break
+            _check_status(status)
+
+        return response
+
+    def _create_transaction(self, verb, name, value):
         payload = cbor.dumps({
             'Verb': verb,
             'Name': name,
@@ -172,40 +335,13 @@ class IntkeyClient:
 
         signature = self._signer.sign(header)
 
-        transaction = Transaction(
+        return Transaction(
             header=header,
             payload=payload,
             header_signature=signature
         )
 
-        batch_list = self._create_batch_list([transaction])
-        batch_id = batch_list.batches[0].header_signature
-
-        if wait and wait > 0:
-            wait_time = 0
-            start_time = time.time()
-            response = self._send_request(
-                "batches", batch_list.SerializeToString(),
-                'application/octet-stream',
-            )
-            while wait_time < wait:
-                status = self._get_status(
-                    batch_id,
-                    wait - int(wait_time),
-                )
-                wait_time = time.time() - start_time
-
-                if status != 'PENDING':
-                    return response
-
-            return response
-
-        return self._send_request(
-            "batches", batch_list.SerializeToString(),
-            'application/octet-stream',
-        )
-
-    def _create_batch_list(self, transactions):
+    def _create_batch(self, transactions):
         transaction_signatures = [t.header_signature for t in transactions]
 
         header = BatchHeader(
@@ -215,8 +351,84 @@ class IntkeyClient:
 
         signature = self._signer.sign(header)
 
-        batch = Batch(
+        return Batch(
             header=header,
             transactions=transactions,
             header_signature=signature)
-        return BatchList(batches=[batch])
+
+    def _create_batch_list(self, transactions):
+        return BatchList(batches=[self._create_batch(transactions)])
+
+
+class IntkeyBatch:
+    """Collects intkey operations to submit together in a single request.
+
+    The operations are applied in the order they were added. Each batch is
+    committed or rejected as a whole, so unless `batch_size` splits them,
+    one invalid operation (such as a dec below zero) rejects them all.
+
+    Example:
+        client.batch().set('a', 1).inc('b', 2).submit(wait=10)
+    """
+
+    def __init__(self, client, batch_size=None):
+        """
+        Args:
+            client (IntkeyClient): the client to sign and submit with
+            batch_size (int): the most transactions to put in each batch;
+                all of them go in one batch if not given
+        """
+        self._client = client
+        self._batch_size = batch_size
+        self._transactions = []
+        self._submitted = False
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def set(self, name, value):
+        return self._add('set', name, value)
+
+    def inc(self, name, value):
+        return self._add('inc', name, value)
+
+    def dec(self, name, value):
+        return self._add('dec', name, value)
+
+    def _add(self, verb, name, value):
+        # pylint: disable=protected-access
+        if self._submitted:
+            raise IntkeyClientException('Batch has already been submitted')
+
+        self._transactions.append(
+            self._client._create_transaction(verb, name, value))
+        return self
+
+    def submit(self, wait=None):
+        """Submits every operation added so far in one request.
+
+        Args:
+            wait (int): seconds to wait for the batches to leave the
+                PENDING state, checking all of their statuses at once
+
+        Returns:
+            str: the REST API's response
+
+        Raises:
+            IntkeyClientException: if any batch is invalid, or they have not
+                all resolved within `wait`
+        """
+        # pylint: disable=protected-access
+        if self._submitted:
+            raise IntkeyClientException('Batch has already been submitted')
+        if not self._transactions:
+            raise IntkeyClientException('Batch has no operations to submit')
+
+        size = self._batch_size or len(self._transactions)
+        batch_list = BatchList(batches=[
+            self._client._create_batch(self._transactions[i:i + size])
+            for i in range(0, len(self._transactions), size)
+        ])
+
+        self._submitted = True
+        return self._client._send_batch_list(batch_list, wait=wait)
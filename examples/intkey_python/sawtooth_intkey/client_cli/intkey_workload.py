@@ -19,15 +19,11 @@ import random
 import threading
 from collections import namedtuple
 from datetime import datetime
-from http.client import RemoteDisconnected
 import getpass
 from base64 import b64encode
 
-import requests
-
-from sawtooth_intkey.client_cli.workload.workload_generator import \
-    WorkloadGenerator
-from sawtooth_intkey.client_cli.workload.sawtooth_workload import Workload
+from sawtooth_sdk.workload.workload_generator import WorkloadGenerator
+from sawtooth_sdk.workload.sawtooth_workload import Workload
 from sawtooth_intkey.client_cli.create_batch import create_intkey_transaction
 from sawtooth_intkey.client_cli.create_batch import create_batch
 from sawtooth_intkey.client_cli.exceptions import IntKeyCliException
@@ -43,31 +39,6 @@ LOGGER = logging.getLogger(__name__)
 IntKeyState = namedtuple('IntKeyState', ['name', 'url', 'value'])
 
 
-def post_batches(url, batches, auth_info=None):
-    data = batches.SerializeToString()
-    headers = {'Content-Type': 'application/octet-stream'}
-    headers['Content-Length'] = str(len(data))
-    if auth_info:
-        headers['Authorization'] = 'Basic {}'.format(auth_info)
-
-    try:
-        result = requests.post(url + "/batches", data, headers=headers)
-        result.raise_for_status()
-        code, json_result = (result.status_code, result.json())
-        if code not in (200, 201, 202):
-            LOGGER.warning("(%s): %s", code, json_result)
-        return (code, json_result)
-    except requests.exceptions.HTTPError as e:
-        LOGGER.warning("(%s): %s", e.response.status_code, e.response.reason)
-        return (e.response.status_code, e.response.reason)
-    except RemoteDisconnected as e:
-        LOGGER.warning(e)
-    except requests.exceptions.ConnectionError as e:
-        LOGGER.warning(
-            'Unable to connect to "%s": make sure URL is correct', url
-        )
-
-
 class IntKeyWorkload(Workload):
     """
     This workload is for the Sawtooth Integer Key transaction family.  In
@@ -88,7 +59,6 @@ class IntKeyWorkload(Workload):
 
     def __init__(self, delegate, args):
         super().__init__(delegate, args)
-        self._auth_info = args.auth_info
         self._urls = []
         self._pending_batches = {}
         self._lock = threading.Lock()
@@ -153,10 +123,7 @@ class IntKeyWorkload(Workload):
 
                 batch_list = batch_pb2.BatchList(batches=[batch])
 
-                (code, _) = post_batches(key.url, batch_list,
-                                         auth_info=self._auth_info)
-
-                if code == 202:
+                if self.delegate.submit_batches(key.url, batch_list):
                     with self._lock:
                         self._pending_batches[batch.header_signature] = \
                             IntKeyState(
@@ -194,10 +161,7 @@ class IntKeyWorkload(Workload):
             batch_id = batch.header_signature
 
             batch_list = batch_pb2.BatchList(batches=[batch])
-            (code, _) = post_batches(url, batch_list,
-                                     auth_info=self._auth_info)
-
-            if code == 202:
+            if self.delegate.submit_batches(url, batch_list):
                 with self._lock:
                     self._pending_batches[batch_id] = \
                         IntKeyState(name=name, url=url, value=0)
@@ -251,6 +215,18 @@ def add_workload_parser(subparsers, parent_parser):
                         help='comma separated urls of the REST API to connect '
                         'to.',
                         default="http://127.0.0.1:8008")
+    parser.add_argument('--transport',
+                        choices=['http', 'zmq'],
+                        default='http',
+                        help='how to submit batches: to the REST APIs over '
+                        'pooled HTTP connections, or straight to the '
+                        'validators over ZMQ, in which case --urls are '
+                        'validator urls such as tcp://127.0.0.1:4004.')
+    parser.add_argument('--events-url',
+                        help='url of a validator to get batch commit '
+                        'notifications from, such as tcp://127.0.0.1:4004, '
+                        'instead of polling the REST API for batch '
+                        'statuses.')
     parser.add_argument('--auth-user',
                         type=str,
                         help='username for authentication '
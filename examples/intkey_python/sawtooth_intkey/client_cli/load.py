@@ -19,40 +19,15 @@ import time
 import getpass
 from base64 import b64encode
 
-from http.client import RemoteDisconnected
 import concurrent.futures
 from concurrent.futures import wait
-import requests
+from sawtooth_sdk.messaging.exceptions import WorkloadConnectionError
 from sawtooth_sdk.protobuf import batch_pb2
+from sawtooth_sdk.workload.transport import HttpTransport
 
 LOGGER = logging.getLogger(__file__)
 
 
-def post_batches(url, auth_info, batches):
-    data = batches.SerializeToString()
-    headers = {'Content-Type': 'application/octet-stream'}
-    headers['Content-Length'] = str(len(data))
-    if auth_info is not None:
-        headers['Authorization'] = 'Basic {}'.format(auth_info)
-
-    try:
-        result = requests.post(url + "/batches", data, headers=headers)
-        result.raise_for_status()
-        code, json_result = (result.status_code, result.json())
-        if code not in (200, 201, 202):
-            LOGGER.warning("(%s): %s", code, json_result)
-        return (code, json_result)
-    except requests.exceptions.HTTPError as e:
-        LOGGER.warning("(%s): %s", e.response.status_code, e.response.reason)
-        return (e.response.status_code, e.response.reason)
-    except RemoteDisconnected as e:
-        LOGGER.warning(e)
-    except requests.exceptions.ConnectionError as e:
-        LOGGER.warning(
-            'Unable to connect to "%s": make sure URL is correct', url,
-        )
-
-
 def _split_batch_list(batch_list):
     new_list = []
     for batch in batch_list.batches:
@@ -70,17 +45,28 @@ def do_load(args):
         batches = batch_pb2.BatchList()
         batches.ParseFromString(fd.read())
 
+    transport = HttpTransport(auth_info=auth_info, pool_size=5)
+
     start = time.time()
     futures = []
     executor = concurrent.futures.ThreadPoolExecutor(max_workers=5)
     for batch_list in _split_batch_list(batches):
-        fut = executor.submit(post_batches, args.url, auth_info, batch_list)
+        fut = executor.submit(
+            transport.submit_batches, args.url, batch_list)
         futures.append(fut)
 
     # Wait until all futures are complete
     wait(futures)
 
     stop = time.time()
+    transport.close()
+
+    for fut in futures:
+        if isinstance(fut.exception(), WorkloadConnectionError):
+            LOGGER.warning(
+                'Unable to connect to "%s": make sure URL is correct',
+                args.url)
+            break
 
     print("batches: {} batch/sec: {}".format(
         str(len(batches.batches)),
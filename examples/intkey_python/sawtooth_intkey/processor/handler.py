@@ -164,8 +164,7 @@ def _do_intkey(verb, name, value, state):
 
 
 def _do_set(name, value, state):
-    msg = 'Setting "{n}" to {v}'.format(n=name, v=value)
-    LOGGER.debug(msg)
+    LOGGER.debug('Setting "%s" to %s', name, value)
 
     if name in state:
         raise InvalidTransaction(
@@ -180,8 +179,7 @@ def _do_set(name, value, state):
 
 
 def _do_inc(name, value, state):
-    msg = 'Incrementing "{n}" by {v}'.format(n=name, v=value)
-    LOGGER.debug(msg)
+    LOGGER.debug('Incrementing "%s" by %s', name, value)
 
     if name not in state:
         raise InvalidTransaction(
@@ -202,8 +200,7 @@ def _do_inc(name, value, state):
 
 
 def _do_dec(name, value, state):
-    msg = 'Decrementing "{n}" by {v}'.format(n=name, v=value)
-    LOGGER.debug(msg)
+    LOGGER.debug('Decrementing "%s" by %s', name, value)
 
     if name not in state:
         raise InvalidTransaction(
@@ -15,15 +15,17 @@
 
 import sys
 import argparse
-import pkg_resources
 
 from sawtooth_intkey.processor.handler import IntkeyTransactionHandler
 
+from sawtooth_sdk.metrics.registry import MetricsRegistry
 from sawtooth_sdk.processor.core import TransactionProcessor
+from sawtooth_sdk.processor.profiling import HandlerProfiler
 from sawtooth_sdk.processor.log import init_console_logging
 from sawtooth_sdk.processor.log import log_configuration
 from sawtooth_sdk.processor.config import get_log_config
 from sawtooth_sdk.processor.config import get_log_dir
+from sawtooth_sdk.version import VersionAction
 
 
 DISTRIBUTION_NAME = 'sawtooth-intkey'
@@ -43,16 +45,46 @@ def parse_args(args):
                         default=0,
                         help='Increase output sent to stderr')
 
-    try:
-        version = pkg_resources.get_distribution(DISTRIBUTION_NAME).version
-    except pkg_resources.DistributionNotFound:
-        version = 'UNKNOWN'
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Serve Prometheus metrics on this local port')
+
+    parser.add_argument(
+        '--metrics-log-interval',
+        type=float,
+        help='Log the metrics every this many seconds')
+
+    parser.add_argument(
+        '--log-max-bytes',
+        type=int,
+        default=0,
+        help='Rotate the log files once they reach this size '
+        '(default: never)')
+
+    parser.add_argument(
+        '--profile-dir',
+        help='Profile a sample of transactions, writing the results here; '
+        'SIGUSR2 switches profiling on and off')
+
+    parser.add_argument(
+        '--profile-mode',
+        choices=['cprofile', 'sample'],
+        default='sample',
+        help='cProfile each sampled transaction, writing .pstats files, or '
+        'sample their stacks, writing .collapsed files (default: sample)')
+
+    parser.add_argument(
+        '--profile-rate',
+        type=float,
+        default=0.01,
+        help='Fraction of transactions to profile (default: 0.01)')
 
     parser.add_argument(
         '-V', '--version',
-        action='version',
-        version=(DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}')
-        .format(version),
+        action=VersionAction,
+        distribution=DISTRIBUTION_NAME,
+        template=DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}',
         help='print version information')
 
     return parser.parse_args(args)
@@ -63,8 +95,33 @@ def main(args=None):
         args = sys.argv[1:]
     opts = parse_args(args)
     processor = None
+    exporters = []
+    profiler = None
     try:
-        processor = TransactionProcessor(url=opts.connect)
+        metrics = None
+        if opts.metrics_port is not None \
+                or opts.metrics_log_interval is not None:
+            # The exporters pull in http.server, so import them only when
+            # they are wanted
+            from sawtooth_sdk.metrics.exporters import LogExporter
+            from sawtooth_sdk.metrics.exporters import PrometheusExporter
+
+            metrics = MetricsRegistry()
+            if opts.metrics_port is not None:
+                exporters.append(
+                    PrometheusExporter(metrics, opts.metrics_port))
+            if opts.metrics_log_interval is not None:
+                exporters.append(
+                    LogExporter(metrics, interval=opts.metrics_log_interval))
+
+        if opts.profile_dir is not None:
+            profiler = HandlerProfiler(
+                opts.profile_dir, mode=opts.profile_mode,
+                rate=opts.profile_rate)
+            profiler.install_signal_handler()
+
+        processor = TransactionProcessor(
+            url=opts.connect, metrics=metrics, profiler=profiler)
         log_config = get_log_config(filename="intkey_log_config.toml")
 
         # If no toml, try loading yaml
@@ -72,15 +129,17 @@ def main(args=None):
             log_config = get_log_config(filename="intkey_log_config.yaml")
 
         if log_config is not None:
-            log_configuration(log_config=log_config)
+            log_configuration(log_config=log_config, queued=True)
         else:
             log_dir = get_log_dir()
             # use the transaction processor zmq identity for filename
             log_configuration(
                 log_dir=log_dir,
-                name="intkey-" + str(processor.zmq_id)[2:-1])
+                name="intkey-" + str(processor.zmq_id)[2:-1],
+                queued=True,
+                max_bytes=opts.log_max_bytes)
 
-        init_console_logging(verbose_level=opts.verbose)
+        init_console_logging(verbose_level=opts.verbose, queued=True)
 
         # The prefix should eventually be looked up from the
         # validator's namespace registry.
@@ -88,6 +147,11 @@ def main(args=None):
 
         processor.add_handler(handler)
 
+        for exporter in exporters:
+            exporter.start()
+        if profiler is not None:
+            profiler.start()
+
         processor.start()
     except KeyboardInterrupt:
         pass
@@ -96,3 +160,7 @@ def main(args=None):
     finally:
         if processor is not None:
             processor.stop()
+        for exporter in exporters:
+            exporter.stop()
+        if profiler is not None:
+            profiler.stop()
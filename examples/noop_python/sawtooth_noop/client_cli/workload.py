@@ -19,9 +19,7 @@ import logging
 import random
 import threading
 from base64 import b64encode
-from http.client import RemoteDisconnected
 
-import requests
 from sawtooth_signing import create_context
 from sawtooth_signing import CryptoFactory
 from sawtooth_sdk.workload.workload_generator import WorkloadGenerator
@@ -33,29 +31,6 @@ from sawtooth_noop.client_cli.create_batch import create_batch
 LOGGER = logging.getLogger(__name__)
 
 
-def post_batches(url, batches):
-    data = batches.SerializeToString()
-    headers = {'Content-Type': 'application/octet-stream'}
-    headers['Content-Length'] = str(len(data))
-
-    try:
-        result = requests.post(url + "/batches", data, headers=headers)
-        result.raise_for_status()
-        code, json_result = (result.status_code, result.json())
-        if not (code == 200 or code == 201 or code == 202):
-            LOGGER.warning("(%s): %s", code, json_result)
-        return (code, json_result)
-    except requests.exceptions.HTTPError as e:
-        LOGGER.warning("(%s): %s", e.response.status_code, e.response.reason)
-        return (e.response.status_code, e.response.reason)
-    except RemoteDisconnected as e:
-        LOGGER.warning(e)
-    except requests.exceptions.ConnectionError as e:
-        LOGGER.warning(
-            'Unable to connect to "%s": make sure URL is correct', url
-        )
-
-
 class NoopWorkload(Workload):
     """
     This workload is for the Sawtooth Noop transaction family.
@@ -111,9 +86,8 @@ class NoopWorkload(Workload):
             batch_id = batch.header_signature
 
             batch_list = batch_pb2.BatchList(batches=[batch])
-            post_batches(url, batch_list)
-
-            self.delegate.on_new_batch(batch_id, url)
+            if self.delegate.submit_batches(url, batch_list):
+                self.delegate.on_new_batch(batch_id, url)
 
 
 def do_workload(args):
@@ -162,6 +136,17 @@ def add_workload_parser(subparsers, parent_parser):
                         help='comma separated urls of the REST API to connect '
                         'to.',
                         default="http://127.0.0.1:8008")
+    parser.add_argument('--transport',
+                        choices=['http', 'zmq'],
+                        default='http',
+                        help='how to submit batches: to the REST APIs over '
+                        'pooled HTTP connections, or straight to the '
+                        'validators over ZMQ, in which case --urls are '
+                        'validator urls such as tcp://127.0.0.1:4004.')
+    parser.add_argument('--events-url',
+                        help='url of a validator to get batch commit '
+                        'notifications from, such as tcp://127.0.0.1:4004, '
+                        'instead of polling for batch statuses.')
     parser.add_argument('--auth-user',
                         type=str,
                         help='username for authentication '
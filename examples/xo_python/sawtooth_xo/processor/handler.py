@@ -205,6 +205,9 @@ def _game_data_to_str(board, game_state, player1, player2, name):
 
 
 def _display(msg):
+    if not LOGGER.isEnabledFor(logging.DEBUG):
+        return
+
     n = msg.count("\n")
 
     if n > 0:
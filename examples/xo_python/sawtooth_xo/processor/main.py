@@ -16,7 +16,6 @@
 import sys
 import os
 import argparse
-import pkg_resources
 
 from sawtooth_xo.processor.handler import XoTransactionHandler
 from sawtooth_xo.processor.config.xo import XOConfig
@@ -33,6 +32,7 @@ from sawtooth_sdk.processor.log import log_configuration
 from sawtooth_sdk.processor.config import get_log_config
 from sawtooth_sdk.processor.config import get_log_dir
 from sawtooth_sdk.processor.config import get_config_dir
+from sawtooth_sdk.version import VersionAction
 
 
 DISTRIBUTION_NAME = 'sawtooth-xo'
@@ -51,16 +51,18 @@ def parse_args(args):
                         default=0,
                         help='Increase output sent to stderr')
 
-    try:
-        version = pkg_resources.get_distribution(DISTRIBUTION_NAME).version
-    except pkg_resources.DistributionNotFound:
-        version = 'UNKNOWN'
+    parser.add_argument(
+        '--log-max-bytes',
+        type=int,
+        default=0,
+        help='Rotate the log files once they reach this size '
+        '(default: never)')
 
     parser.add_argument(
         '-V', '--version',
-        action='version',
-        version=(DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}')
-        .format(version),
+        action=VersionAction,
+        distribution=DISTRIBUTION_NAME,
+        template=DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}',
         help='print version information')
 
     return parser.parse_args(args)
@@ -97,15 +99,17 @@ def main(args=None):
             log_config = get_log_config(filename="xo_log_config.yaml")
 
         if log_config is not None:
-            log_configuration(log_config=log_config)
+            log_configuration(log_config=log_config, queued=True)
         else:
             log_dir = get_log_dir()
             # use the transaction processor zmq identity for filename
             log_configuration(
                 log_dir=log_dir,
-                name="xo-" + str(processor.zmq_id)[2:-1])
+                name="xo-" + str(processor.zmq_id)[2:-1],
+                queued=True,
+                max_bytes=opts.log_max_bytes)
 
-        init_console_logging(verbose_level=opts.verbose)
+        init_console_logging(verbose_level=opts.verbose, queued=True)
 
         handler = XoTransactionHandler()
 
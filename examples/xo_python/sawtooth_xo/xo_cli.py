@@ -16,16 +16,22 @@
 from __future__ import print_function
 
 import argparse
+import contextlib
 import getpass
 import logging
 import os
 import traceback
 import sys
-import pkg_resources
 
 from colorlog import ColoredFormatter
 
+from sawtooth_sdk.client.events import EventClient
+from sawtooth_sdk.client.exceptions import EventSubscriptionError
+from sawtooth_sdk.version import VersionAction
+
 from sawtooth_xo.xo_client import XoClient
+from sawtooth_xo.xo_workload import add_workload_parser
+from sawtooth_xo.xo_workload import do_workload
 from sawtooth_xo.xo_exceptions import XoException
 
 
@@ -122,6 +128,13 @@ def add_create_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for game to commit')
 
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
 
 def add_list_parser(subparsers, parent_parser):
     parser = subparsers.add_parser(
@@ -131,6 +144,22 @@ def add_list_parser(subparsers, parent_parser):
         'the players, the game state, and the board for each game.',
         parents=[parent_parser])
 
+    parser.add_argument(
+        '--name-prefix',
+        type=str,
+        help='only display games whose name starts with this prefix')
+
+    parser.add_argument(
+        '--state',
+        type=str,
+        choices=['P1-NEXT', 'P2-NEXT', 'P1-WIN', 'P2-WIN', 'TIE'],
+        help='only display games in this state')
+
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        help='number of state entries to fetch from the REST API per request')
+
     parser.add_argument(
         '--url',
         type=str,
@@ -255,6 +284,13 @@ def add_take_parser(subparsers, parent_parser):
         help='set time, in seconds, to wait for take transaction '
         'to commit')
 
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
 
 def add_delete_parser(subparsers, parent_parser):
     parser = subparsers.add_parser('delete', parents=[parent_parser])
@@ -298,6 +334,13 @@ def add_delete_parser(subparsers, parent_parser):
         type=int,
         help='set time, in seconds, to wait for delete transaction to commit')
 
+    parser.add_argument(
+        '--events-url',
+        type=str,
+        help='specify URL of the validator to get commit notifications from '
+        'when waiting, such as tcp://localhost:4004, instead of polling the '
+        'REST API')
+
 
 def create_parent_parser(prog_name):
     parent_parser = argparse.ArgumentParser(prog=prog_name, add_help=False)
@@ -306,16 +349,11 @@ def create_parent_parser(prog_name):
         action='count',
         help='enable more verbose output')
 
-    try:
-        version = pkg_resources.get_distribution(DISTRIBUTION_NAME).version
-    except pkg_resources.DistributionNotFound:
-        version = 'UNKNOWN'
-
     parent_parser.add_argument(
         '-V', '--version',
-        action='version',
-        version=(DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}')
-        .format(version),
+        action=VersionAction,
+        distribution=DISTRIBUTION_NAME,
+        template=DISTRIBUTION_NAME + ' (Hyperledger Sawtooth) version {}',
         help='display version information')
 
     return parent_parser
@@ -338,6 +376,7 @@ def create_parser(prog_name):
     add_show_parser(subparsers, parent_parser)
     add_take_parser(subparsers, parent_parser)
     add_delete_parser(subparsers, parent_parser)
+    add_workload_parser(subparsers, parent_parser)
 
     return parser
 
@@ -346,25 +385,20 @@ def do_list(args):
     url = _get_url(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = XoClient(base_url=url, keyfile=None)
-
-    game_list = [
-        game.split(',')
-        for games in client.list(auth_user=auth_user,
-                                 auth_password=auth_password)
-        for game in games.decode().split('|')
-    ]
+    with XoClient(base_url=url, keyfile=None) as client:
+        games = client.list_games(
+            name_prefix=args.name_prefix,
+            game_state=args.state,
+            limit=args.page_size,
+            auth_user=auth_user,
+            auth_password=auth_password)
 
-    if game_list is not None:
+        # games are fetched page by page, so print them while the client
+        # is still open
         fmt = "%-15s %-15.15s %-15.15s %-9s %s"
         print(fmt % ('GAME', 'PLAYER 1', 'PLAYER 2', 'BOARD', 'STATE'))
-        for game_data in game_list:
-
-            name, board, game_state, player1, player2 = game_data
-
+        for name, board, game_state, player1, player2 in games:
             print(fmt % (name, player1[:6], player2[:6], board, game_state))
-    else:
-        raise XoException("Could not retrieve game listing.")
 
 
 def do_show(args):
@@ -373,9 +407,9 @@ def do_show(args):
     url = _get_url(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = XoClient(base_url=url, keyfile=None)
-
-    data = client.show(name, auth_user=auth_user, auth_password=auth_password)
+    with XoClient(base_url=url, keyfile=None) as client:
+        data = client.show(
+            name, auth_user=auth_user, auth_password=auth_password)
 
     if data is not None:
 
@@ -412,17 +446,17 @@ def do_create(args):
     keyfile = _get_keyfile(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = XoClient(base_url=url, keyfile=keyfile)
-
-    if args.wait and args.wait > 0:
-        response = client.create(
-            name, wait=args.wait,
-            auth_user=auth_user,
-            auth_password=auth_password)
-    else:
-        response = client.create(
-            name, auth_user=auth_user,
-            auth_password=auth_password)
+    with _get_events(args) as events, \
+            XoClient(base_url=url, keyfile=keyfile, events=events) as client:
+        if args.wait and args.wait > 0:
+            response = client.create(
+                name, wait=args.wait,
+                auth_user=auth_user,
+                auth_password=auth_password)
+        else:
+            response = client.create(
+                name, auth_user=auth_user,
+                auth_password=auth_password)
 
     print("Response: {}".format(response))
 
@@ -435,18 +469,18 @@ def do_take(args):
     keyfile = _get_keyfile(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = XoClient(base_url=url, keyfile=keyfile)
-
-    if args.wait and args.wait > 0:
-        response = client.take(
-            name, space, wait=args.wait,
-            auth_user=auth_user,
-            auth_password=auth_password)
-    else:
-        response = client.take(
-            name, space,
-            auth_user=auth_user,
-            auth_password=auth_password)
+    with _get_events(args) as events, \
+            XoClient(base_url=url, keyfile=keyfile, events=events) as client:
+        if args.wait and args.wait > 0:
+            response = client.take(
+                name, space, wait=args.wait,
+                auth_user=auth_user,
+                auth_password=auth_password)
+        else:
+            response = client.take(
+                name, space,
+                auth_user=auth_user,
+                auth_password=auth_password)
 
     print("Response: {}".format(response))
 
@@ -458,17 +492,17 @@ def do_delete(args):
     keyfile = _get_keyfile(args)
     auth_user, auth_password = _get_auth_info(args)
 
-    client = XoClient(base_url=url, keyfile=keyfile)
-
-    if args.wait and args.wait > 0:
-        response = client.delete(
-            name, wait=args.wait,
-            auth_user=auth_user,
-            auth_password=auth_password)
-    else:
-        response = client.delete(
-            name, auth_user=auth_user,
-            auth_password=auth_password)
+    with _get_events(args) as events, \
+            XoClient(base_url=url, keyfile=keyfile, events=events) as client:
+        if args.wait and args.wait > 0:
+            response = client.delete(
+                name, wait=args.wait,
+                auth_user=auth_user,
+                auth_password=auth_password)
+        else:
+            response = client.delete(
+                name, auth_user=auth_user,
+                auth_password=auth_password)
 
     print("Response: {}".format(response))
 
@@ -477,6 +511,23 @@ def _get_url(args):
     return DEFAULT_URL if args.url is None else args.url
 
 
+@contextlib.contextmanager
+def _get_events(args):
+    """Yields an EventClient connected to --events-url, or None if it was
+    not given or there is nothing to wait for."""
+    if not (args.events_url and args.wait):
+        yield None
+        return
+
+    try:
+        events = EventClient(args.events_url)
+    except EventSubscriptionError as err:
+        raise XoException(err) from err
+
+    with events:
+        yield events
+
+
 def _get_keyfile(args):
     username = getpass.getuser() if args.username is None else args.username
     home = os.path.expanduser("~")
@@ -517,6 +568,8 @@ def main(prog_name=os.path.basename(sys.argv[0]), args=None):
         do_take(args)
     elif args.command == 'delete':
         do_delete(args)
+    elif args.command == 'workload':
+        do_workload(args)
     else:
         raise XoException("invalid command: {}".format(args.command))
 
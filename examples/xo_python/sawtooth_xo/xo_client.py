@@ -18,6 +18,7 @@ import base64
 from base64 import b64encode
 import time
 import random
+import threading
 import requests
 import yaml
 
@@ -28,6 +29,8 @@ from sawtooth_signing import CryptoFactory
 from sawtooth_signing import ParseError
 from sawtooth_signing.secp256k1 import Secp256k1PrivateKey
 
+from sawtooth_sdk.client.rest import create_session
+from sawtooth_sdk.client.rest import get_paging_suffix
 from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.transaction_pb2 import Transaction
 from sawtooth_sdk.protobuf.batch_pb2 import BatchList
@@ -39,10 +42,39 @@ def _sha512(data):
     return hashlib.sha512(data).hexdigest()
 
 
-class XoClient:
-    def __init__(self, base_url, keyfile=None):
+def _check_status(status):
+    """Raises XoException if the batch waited for was invalid or had not
+    resolved in time."""
+    if status == 'INVALID':
+        raise XoException('Batch was invalid')
+    if status == 'PENDING':
+        raise XoException('Timed out waiting for batch to commit')
+
 
+class XoClient:
+    def __init__(self, base_url, keyfile=None, session=None, timeout=None,
+                 events=None):
+        """
+        Args:
+            base_url (str): the REST API url
+            keyfile (str): the file holding the signing key, required to
+                send transactions
+            session (requests.Session): the session to send requests on,
+                such as one from create_session() shared between clients; a
+                new session from create_session() if not given. Only a
+                session created here is closed by close().
+            timeout (float): seconds to wait for each response, beyond any
+                wait requested from the REST API; no limit if not given
+                or when waiting without a bound
+            events (EventClient): if given, waits for batches to commit
+                are resolved by its block commit notifications instead of by
+                polling the REST API for batch statuses
+        """
         self._base_url = base_url
+        self._timeout = timeout
+        self._events = events
+        self._owns_session = session is None
+        self._session = create_session() if session is None else session
 
         if keyfile is None:
             self._signer = None
@@ -65,6 +97,18 @@ class XoClient:
         self._signer = CryptoFactory(create_context('secp256k1')) \
             .new_signer(private_key)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes the client's pooled connections, if it owns its session.
+        """
+        if self._owns_session:
+            self._session.close()
+
     def create(self, name, wait=None, auth_user=None, auth_password=None):
         return self._send_xo_txn(
             name,
@@ -90,24 +134,88 @@ class XoClient:
             auth_user=auth_user,
             auth_password=auth_password)
 
-    def list(self, auth_user=None, auth_password=None):
-        xo_prefix = self._get_prefix()
-
-        result = self._send_request(
-            "state?address={}".format(xo_prefix),
-            auth_user=auth_user,
-            auth_password=auth_password)
-
+    def list(self, auth_user=None, auth_password=None, limit=None):
         try:
-            encoded_entries = yaml.safe_load(result)["data"]
-
             return [
-                base64.b64decode(entry["data"]) for entry in encoded_entries
+                base64.b64decode(entry["data"])
+                for entry in self._list_state(
+                    limit=limit,
+                    auth_user=auth_user,
+                    auth_password=auth_password)
             ]
 
         except BaseException:
             return None
 
+    def list_games(self,
+                   name_prefix=None,
+                   game_state=None,
+                   limit=None,
+                   auth_user=None,
+                   auth_password=None):
+        """Yields the games in state as (name, board, state, player1,
+        player2) tuples, fetching one page of state entries at a time.
+
+        Args:
+            name_prefix (str): only yield games whose name starts with this
+                prefix.
+            game_state (str): only yield games in this state, e.g. 'P1-NEXT'.
+            limit (int): the number of state entries to request per page.
+        """
+        for entry in self._list_state(
+                limit=limit,
+                auth_user=auth_user,
+                auth_password=auth_password):
+            try:
+                games = base64.b64decode(entry["data"]).decode().split('|')
+            except BaseException as err:
+                raise XoException(
+                    'Failed to decode state entry {}: {}'.format(
+                        entry.get("address"), err)) from err
+
+            for game in games:
+                # The name is the first field, so it can be checked before
+                # the rest of the game is parsed
+                if name_prefix is not None and \
+                        not game.startswith(name_prefix):
+                    continue
+
+                game_data = tuple(game.split(','))
+                if len(game_data) != 5:
+                    raise XoException(
+                        'Malformed game data in state: {}'.format(game))
+
+                if game_state is not None and game_data[2] != game_state:
+                    continue
+
+                yield game_data
+
+    def _list_state(self, limit=None, auth_user=None, auth_password=None):
+        """Yields the xo state entries, following the REST API's paging
+        links until every page has been read.
+        """
+        suffix = "state?address={}".format(self._get_prefix())
+        if limit is not None:
+            suffix += "&limit={}".format(limit)
+
+        while suffix is not None:
+            result = self._send_request(
+                suffix,
+                auth_user=auth_user,
+                auth_password=auth_password)
+
+            try:
+                response = yaml.safe_load(result)
+                entries = response["data"]
+                next_url = response.get("paging", {}).get("next")
+            except BaseException as err:
+                raise XoException(
+                    'Failed to parse state listing: {}'.format(err)) from err
+
+            yield from entries
+
+            suffix = get_paging_suffix(self._get_url(), next_url)
+
     def show(self, name, auth_user=None, auth_password=None):
         address = self._get_address(name)
 
@@ -127,7 +235,8 @@ class XoClient:
             result = self._send_request(
                 'batch_statuses?id={}&wait={}'.format(batch_id, wait),
                 auth_user=auth_user,
-                auth_password=auth_password)
+                auth_password=auth_password,
+                wait=wait)
             return yaml.safe_load(result)['data'][0]['status']
         except BaseException as err:
             raise XoException(err) from err
@@ -140,17 +249,26 @@ class XoClient:
         game_address = _sha512(name.encode('utf-8'))[0:64]
         return xo_prefix + game_address
 
+    def _get_url(self):
+        """Returns the REST API url, with an http scheme if it had none."""
+        if self._base_url.startswith("http://"):
+            return self._base_url
+        return "http://{}".format(self._base_url)
+
     def _send_request(self,
                       suffix,
                       data=None,
                       content_type=None,
                       name=None,
                       auth_user=None,
-                      auth_password=None):
-        if self._base_url.startswith("http://"):
-            url = "{}/{}".format(self._base_url, suffix)
-        else:
-            url = "http://{}/{}".format(self._base_url, suffix)
+                      auth_password=None,
+                      wait=0):
+        timeout = None if self._timeout is None else self._timeout + wait
+        if timeout is not None and timeout > threading.TIMEOUT_MAX:
+            # a bare --wait asks to wait without a bound
+            timeout = None
+
+        url = "{}/{}".format(self._get_url(), suffix)
 
         headers = {}
         if auth_user is not None:
@@ -164,9 +282,11 @@ class XoClient:
 
         try:
             if data is not None:
-                result = requests.post(url, headers=headers, data=data)
+                result = self._session.post(
+                    url, headers=headers, data=data, timeout=timeout)
             else:
-                result = requests.get(url, headers=headers)
+                result = self._session.get(
+                    url, headers=headers, timeout=timeout)
 
             if result.status_code == 404:
                 raise XoException("No such game: {}".format(name))
@@ -220,6 +340,17 @@ class XoClient:
         batch_list = self._create_batch_list([transaction])
         batch_id = batch_list.batches[0].header_signature
 
+        if wait and wait > 0 and self._events is not None:
+            response = self._send_request(
+                "batches", batch_list.SerializeToString(),
+                'application/octet-stream',
+                auth_user=auth_user,
+                auth_password=auth_password)
+            statuses = self._events.wait_for_batches(
+                [batch_id], timeout=wait)
+            _check_status(statuses[batch_id])
+            return response
+
         if wait and wait > 0:
             wait_time = 0
             start_time = time.time()
@@ -228,6 +359,7 @@ class XoClient:
                 'application/octet-stream',
                 auth_user=auth_user,
                 auth_password=auth_password)
+            status = 'PENDING'
             while wait_time < wait:
                 status = self._get_status(
                     batch_id,
@@ -237,7 +369,8 @@ class XoClient:
                 wait_time = time.time() - start_time
 
                 if status != 'PENDING':
-                    return response
+                    break
+            _check_status(status)
 
             return response
 
@@ -0,0 +1,234 @@
+# Copyright 2016 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import argparse
+import getpass
+import hashlib
+import logging
+import random
+import threading
+import uuid
+from base64 import b64encode
+
+from sawtooth_signing import create_context
+from sawtooth_signing import CryptoFactory
+from sawtooth_sdk.workload.workload_generator import WorkloadGenerator
+from sawtooth_sdk.workload.sawtooth_workload import Workload
+from sawtooth_sdk.protobuf.batch_pb2 import Batch
+from sawtooth_sdk.protobuf.batch_pb2 import BatchHeader
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.protobuf.transaction_pb2 import Transaction
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+LOGGER = logging.getLogger(__name__)
+
+XO_PREFIX = hashlib.sha512('xo'.encode('utf-8')).hexdigest()[0:6]
+
+# The moves of a game, each as (action, space, player). Player 1 wins on
+# the top row.
+GAME = [
+    ('create', '', 0),
+    ('take', '1', 0),
+    ('take', '4', 1),
+    ('take', '2', 0),
+    ('take', '5', 1),
+    ('take', '3', 0),
+]
+
+
+def _sha512(data):
+    return hashlib.sha512(data).hexdigest()
+
+
+def _create_transaction(signer, name, action, space):
+    payload = ",".join([name, action, space]).encode()
+    address = XO_PREFIX + _sha512(name.encode('utf-8'))[0:64]
+    public_key = signer.get_public_key().as_hex()
+
+    header = TransactionHeader(
+        signer_public_key=public_key,
+        family_name="xo",
+        family_version="1.0",
+        inputs=[address],
+        outputs=[address],
+        dependencies=[],
+        payload_sha512=_sha512(payload),
+        batcher_public_key=public_key,
+        nonce=hex(random.randint(0, 2**64))
+    ).SerializeToString()
+
+    return Transaction(
+        header=header,
+        payload=payload,
+        header_signature=signer.sign(header))
+
+
+def _create_batch(signer, transactions):
+    header = BatchHeader(
+        signer_public_key=signer.get_public_key().as_hex(),
+        transaction_ids=[t.header_signature for t in transactions]
+    ).SerializeToString()
+
+    return Batch(
+        header=header,
+        transactions=transactions,
+        header_signature=signer.sign(header))
+
+
+class XoWorkload(Workload):
+    """
+    This workload is for the Sawtooth XO transaction family. Each game is
+    played between two random players, one move per batch, with each move
+    submitted once the previous one has been committed. A new game is
+    started whenever the generator asks for a new batch.
+    """
+
+    def __init__(self, delegate, args):
+        super().__init__(delegate, args)
+        self._urls = []
+        self._lock = threading.Lock()
+        # The game name, url and next move for each pending batch
+        self._pending_batches = {}
+        context = create_context('secp256k1')
+        factory = CryptoFactory(context)
+        self._players = [
+            factory.new_signer(context.new_random_private_key())
+            for _ in range(2)
+        ]
+
+    def on_will_start(self):
+        pass
+
+    def on_will_stop(self):
+        pass
+
+    def on_validator_discovered(self, url):
+        self._urls.append(url)
+
+    def on_validator_removed(self, url):
+        with self._lock:
+            if url in self._urls:
+                self._urls.remove(url)
+                self._pending_batches = \
+                    {b: g for b, g in self._pending_batches.items()
+                     if g[1] != url}
+
+    def on_all_batches_committed(self):
+        self._new_game()
+
+    def on_batch_committed(self, batch_id):
+        with self._lock:
+            game = self._pending_batches.pop(batch_id, None)
+
+        if game is None:
+            return
+
+        name, url, move = game
+        if move < len(GAME):
+            self._send_move(name, url, move)
+        else:
+            LOGGER.debug('Game %s completed', name)
+            self._new_game()
+
+    def on_batch_not_yet_committed(self):
+        self._new_game()
+
+    def _new_game(self):
+        with self._lock:
+            url = random.choice(self._urls) if self._urls else None
+
+        if url is not None:
+            self._send_move(uuid.uuid4().hex[:20], url, 0)
+
+    def _send_move(self, name, url, move):
+        action, space, player = GAME[move]
+        signer = self._players[player]
+        batch = _create_batch(
+            signer, [_create_transaction(signer, name, action, space)])
+
+        if self.delegate.submit_batches(url, BatchList(batches=[batch])):
+            with self._lock:
+                self._pending_batches[batch.header_signature] = \
+                    (name, url, move + 1)
+            self.delegate.on_new_batch(batch.header_signature, url)
+
+
+def do_workload(args):
+    """
+    Create WorkloadGenerator and XoWorkload. Set XO workload in generator
+    and run.
+    """
+    args.auth_info = _get_auth_info(args.auth_user, args.auth_password)
+    generator = WorkloadGenerator(args)
+    workload = XoWorkload(generator, args)
+    generator.set_workload(workload)
+    try:
+        generator.run()
+    except KeyboardInterrupt:
+        generator.stop()
+
+
+def _get_auth_info(auth_user, auth_password):
+    if auth_user is not None:
+        if auth_password is None:
+            auth_password = getpass.getpass(prompt="Auth Password: ")
+        auth_string = "{}:{}".format(auth_user, auth_password)
+        return b64encode(auth_string.encode()).decode()
+
+    return None
+
+
+def add_workload_parser(subparsers, parent_parser):
+    parser = subparsers.add_parser(
+        'workload',
+        parents=[parent_parser],
+        description='Plays xo games against the validators at a fixed '
+        'batch rate, reporting the submission and commit rates.',
+        help='Generates a load of xo games',
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument('--rate',
+                        type=int,
+                        help='Batch rate in batches per second. '
+                             'Should be greater then 0.',
+                        default=1)
+    parser.add_argument('-d', '--display-frequency',
+                        type=int,
+                        help='time in seconds between display of batches '
+                             'rate updates.',
+                        default=30)
+    parser.add_argument('-u', '--urls',
+                        help='comma separated urls of the REST API to connect '
+                        'to.',
+                        default="http://127.0.0.1:8008")
+    parser.add_argument('--transport',
+                        choices=['http', 'zmq'],
+                        default='http',
+                        help='how to submit batches: to the REST APIs over '
+                        'pooled HTTP connections, or straight to the '
+                        'validators over ZMQ, in which case --urls are '
+                        'validator urls such as tcp://127.0.0.1:4004.')
+    parser.add_argument('--events-url',
+                        help='url of a validator to get batch commit '
+                        'notifications from, such as tcp://127.0.0.1:4004, '
+                        'instead of polling for batch statuses.')
+    parser.add_argument('--auth-user',
+                        type=str,
+                        help='username for authentication '
+                             'if REST API is using Basic Auth')
+    parser.add_argument('--auth-password',
+                        type=str,
+                        help='password for authentication '
+                             'if REST API is using Basic Auth')
@@ -0,0 +1,486 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Throughput benchmarks for the transaction processor hot path.
+
+Each run starts a MockValidator in this process, connects a real
+TransactionProcessor to it from a background thread over ipc:// or tcp://,
+and pushes a pregenerated workload through the processor against in-memory
+state. The results are reported as JSON.
+
+A recovery run restarts the mock validator halfway through the workload
+instead, and reports how long the processor takes to register with the new
+one.
+
+The intkey and xo workloads import their handlers from the example
+packages, which must be importable (bin/tp-benchmark arranges this).
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from sawtooth_sdk.processor.core import TransactionProcessor
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+
+
+def _public_key(seed):
+    return '02' + hashlib.sha256(seed.encode()).hexdigest()
+
+
+def _make_request(family_name, address, payload, signer, index):
+    return TpProcessRequest(
+        header=TransactionHeader(
+            family_name=family_name,
+            family_version='1.0',
+            signer_public_key=signer,
+            batcher_public_key=signer,
+            inputs=[address],
+            outputs=[address],
+            payload_sha512=hashlib.sha512(payload).hexdigest(),
+            nonce=str(index)),
+        payload=payload,
+        signature='{}-{:08d}'.format(family_name, index))
+
+
+def _pad_name(index, width):
+    return str(index).rjust(width, 'k')
+
+
+def intkey_workload(transactions, payload_size, keys=100):
+    """Sets `keys` intkey names, then increments them in turn.
+
+    The payload size is reached by padding the names, up to intkey's
+    20 character limit.
+
+    Returns:
+        (TransactionHandler, list of TpProcessRequest)
+    """
+    # pylint: disable=import-error
+    import cbor
+    from sawtooth_intkey.processor.handler import IntkeyTransactionHandler
+    from sawtooth_intkey.processor.handler import INTKEY_ADDRESS_PREFIX
+    from sawtooth_intkey.processor.handler import MAX_NAME_LENGTH
+
+    overhead = len(cbor.dumps({'Verb': 'set', 'Name': '', 'Value': 0}))
+    width = min(MAX_NAME_LENGTH, max(payload_size - overhead, 1))
+    signer = _public_key('intkey')
+
+    requests = []
+    for i in range(transactions):
+        if i < keys:
+            verb, value = 'set', 0
+        else:
+            verb, value = 'inc', 1
+        payload = cbor.dumps({
+            'Verb': verb,
+            'Name': _pad_name(i % keys, width),
+            'Value': value,
+        })
+        requests.append(_make_request(
+            'intkey', INTKEY_ADDRESS_PREFIX, payload, signer, i))
+
+    return IntkeyTransactionHandler(), requests
+
+
+# Player 1 wins on the top row after six transactions
+_XO_GAME = [
+    ('create', '', 0),
+    ('take', '1', 0),
+    ('take', '4', 1),
+    ('take', '2', 0),
+    ('take', '5', 1),
+    ('take', '3', 0),
+]
+
+
+def xo_workload(transactions, payload_size):
+    """Plays as many six move xo games as fit in `transactions`, two
+    players per game.
+
+    The payload size is reached by padding the game names. Each move only
+    touches its game's address, so a ParallelScheduler can run moves of
+    different games at once while keeping each game's moves in order.
+
+    Returns:
+        (TransactionHandler, list of TpProcessRequest)
+    """
+    # pylint: disable=import-error
+    from sawtooth_xo.processor.handler import XoTransactionHandler
+    from sawtooth_xo.processor.xo_state import XO_NAMESPACE
+
+    width = max(payload_size - len(',create,'), 1)
+    players = [_public_key('player1'), _public_key('player2')]
+
+    requests = []
+    for i in range(transactions):
+        game, move = divmod(i, len(_XO_GAME))
+        action, space, player = _XO_GAME[move]
+        name = _pad_name(game, width)
+        payload = ','.join([name, action, space]).encode()
+        address = XO_NAMESPACE + \
+            hashlib.sha512(name.encode('utf-8')).hexdigest()[:64]
+        requests.append(_make_request(
+            'xo', address, payload, players[player], i))
+
+    return XoTransactionHandler(), requests
+
+
+WORKLOADS = {
+    'intkey': intkey_workload,
+    'xo': xo_workload,
+}
+
+# Workloads whose transactions fail if run before the ones they follow on
+# the same address; they are dispatched through a ParallelScheduler
+ORDERED_WORKLOADS = frozenset(['xo'])
+
+
+def _endpoint(transport):
+    """Returns the url to listen on for `transport`, and the temporary
+    directory holding it for ipc, to be removed afterwards."""
+    if transport == 'ipc':
+        ipc_dir = tempfile.mkdtemp()
+        return 'ipc://{}'.format(os.path.join(ipc_dir, 'validator.ipc')), \
+            ipc_dir
+    if transport == 'tcp':
+        return 'tcp://127.0.0.1:*', None
+    raise ValueError('Unknown transport: {}'.format(transport))
+
+
+def run_benchmark(workload,
+                  transactions=1000,
+                  concurrency=1,
+                  payload_size=32,
+                  transport='ipc',
+                  timeout=300,
+                  processors=1,
+                  dispatch='round_robin',
+                  connections=1):
+    """Runs one workload through one or more transaction processors.
+
+    Args:
+        workload (str): a key of WORKLOADS; one in ORDERED_WORKLOADS is
+            dispatched through a ParallelScheduler
+        transactions (int): the number of transactions to process
+        concurrency (int): the most transactions in flight at once on
+            each processor
+        payload_size (int): the approximate payload size in bytes
+        transport (str): 'ipc' or 'tcp'
+        timeout (float): the most seconds to run for
+        processors (int): the number of processors to dispatch to. They
+            run as threads of this process, so they share its interpreter
+            lock.
+        dispatch (str): 'round_robin' or 'least_loaded'
+        connections (int): the connections each processor opens to the
+            validator. Each registers separately, so the validator
+            dispatches across processors * connections.
+
+    Returns:
+        dict: the benchmark parameters and results. cpu_per_txn is the CPU
+            time of the whole process, including the mock validator, per
+            transaction.
+    """
+    handler, requests = WORKLOADS[workload](transactions, payload_size)
+
+    url, ipc_dir = _endpoint(transport)
+
+    validator = MockValidator()
+    validator.listen(url)
+
+    transaction_processors = []
+    for _ in range(processors):
+        processor = TransactionProcessor(
+            validator.url, connections=connections)
+        processor.add_handler(handler)
+        threading.Thread(target=processor.start, daemon=True).start()
+        transaction_processors.append(processor)
+
+    try:
+        if not validator.register_processors(processors * connections):
+            raise RuntimeError('Transaction processors failed to register')
+
+        cpu_start = time.process_time()
+        result = validator.run(
+            requests,
+            max_in_flight=concurrency,
+            timeout=timeout,
+            dispatch=dispatch,
+            parallel=workload in ORDERED_WORKLOADS)
+        cpu = time.process_time() - cpu_start
+    finally:
+        for processor in transaction_processors:
+            processor.stop()
+        validator.close()
+        if ipc_dir is not None:
+            shutil.rmtree(ipc_dir, ignore_errors=True)
+
+    return {
+        'workload': workload,
+        'transport': transport,
+        'processors': processors,
+        'dispatch': dispatch,
+        'connections': connections,
+        'concurrency': concurrency,
+        'payload_size': payload_size,
+        'transactions': result.transactions,
+        'valid': result.valid,
+        'invalid': result.invalid,
+        'internal_errors': result.internal_errors,
+        'duration': result.duration,
+        'tps': result.tps,
+        'latency_mean': result.latency.mean,
+        'latency_p50': result.latency.p50,
+        'latency_p99': result.latency.p99,
+        'latency_max': result.latency.max,
+        'cpu_per_txn': cpu / result.transactions
+        if result.transactions else 0.0,
+        'processor_tps': [p.tps for p in result.processors.values()],
+    }
+
+
+def run_recovery_benchmark(workload,
+                           transactions=1000,
+                           concurrency=1,
+                           payload_size=32,
+                           transport='ipc',
+                           timeout=300,
+                           downtime=0.0,
+                           reconnect=None):
+    """Runs half of a workload through a transaction processor, restarts
+    the mock validator, and runs the other half once the processor has
+    registered again.
+
+    Args:
+        workload (str): a key of WORKLOADS
+        transactions (int): the number of transactions to process
+        concurrency (int): the most transactions in flight at once
+        payload_size (int): the approximate payload size in bytes
+        transport (str): 'ipc' or 'tcp'
+        timeout (float): the most seconds to run each half for
+        downtime (float): seconds the validator is down for
+        reconnect (ReconnectPolicy): the processor's reconnect policy
+
+    Returns:
+        dict: the benchmark parameters and results. recovery_seconds is
+            the time from the validator coming back to the processor
+            registering with it, and outage_seconds the time from the
+            validator going down to that registration.
+    """
+    handler, requests = WORKLOADS[workload](transactions, payload_size)
+    half = len(requests) // 2
+    state = InMemoryState()
+
+    url, ipc_dir = _endpoint(transport)
+
+    validator = MockValidator()
+    validator.listen(url)
+
+    processor = TransactionProcessor(validator.url, reconnect=reconnect)
+    processor.add_handler(handler)
+    threading.Thread(target=processor.start, daemon=True).start()
+
+    try:
+        if not validator.register_processors(1):
+            raise RuntimeError('Transaction processor failed to register')
+        before = validator.run(
+            requests[:half],
+            state=state,
+            max_in_flight=concurrency,
+            timeout=timeout,
+            parallel=workload in ORDERED_WORKLOADS)
+
+        # Rebind the resolved address, so a tcp port stays the same
+        url = validator.url
+        stopped = time.time()
+        validator.close()
+        time.sleep(downtime)
+        validator = MockValidator()
+        validator.listen(url)
+        restarted = time.time()
+        if not validator.register_processors(1):
+            raise RuntimeError('Transaction processor failed to register '
+                               'after the restart')
+        registered = time.time()
+
+        after = validator.run(
+            requests[half:],
+            state=state,
+            max_in_flight=concurrency,
+            timeout=timeout,
+            parallel=workload in ORDERED_WORKLOADS)
+    finally:
+        processor.stop()
+        validator.close()
+        if ipc_dir is not None:
+            shutil.rmtree(ipc_dir, ignore_errors=True)
+
+    return {
+        'workload': workload,
+        'transport': transport,
+        'concurrency': concurrency,
+        'payload_size': payload_size,
+        'downtime': downtime,
+        'transactions': before.transactions + after.transactions,
+        'valid': before.valid + after.valid,
+        'invalid': before.invalid + after.invalid,
+        'internal_errors': before.internal_errors + after.internal_errors,
+        'recovery_seconds': registered - restarted,
+        'outage_seconds': registered - stopped,
+        'tps_before': before.tps,
+        'tps_after': after.tps,
+    }
+
+
+def create_parser(prog_name):
+    parser = argparse.ArgumentParser(
+        prog=prog_name,
+        description='Measures transaction processor throughput against an '
+        'in-process mock validator and prints the results as JSON.')
+
+    parser.add_argument(
+        '-w', '--workload',
+        action='append',
+        choices=sorted(WORKLOADS),
+        help='workload to run; may be given more than once (default: all)')
+    parser.add_argument(
+        '-n', '--transactions',
+        type=int,
+        default=1000,
+        help='transactions per run (default: 1000)')
+    parser.add_argument(
+        '-c', '--concurrency',
+        type=int,
+        nargs='+',
+        default=[1],
+        help='transactions in flight at once on each processor, one run '
+        'per value (default: 1)')
+    parser.add_argument(
+        '-p', '--processors',
+        type=int,
+        nargs='+',
+        default=[1],
+        help='processor threads to dispatch across, one run per value '
+        '(default: 1)')
+    parser.add_argument(
+        '--dispatch',
+        choices=['round_robin', 'least_loaded'],
+        default='round_robin',
+        help='how transactions are spread across processors '
+        '(default: round_robin)')
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=1,
+        help='connections each processor opens to the validator '
+        '(default: 1)')
+    parser.add_argument(
+        '-s', '--payload-size',
+        type=int,
+        nargs='+',
+        default=[32],
+        help='approximate payload size in bytes, one run per value '
+        '(default: 32)')
+    parser.add_argument(
+        '-t', '--transport',
+        choices=['ipc', 'tcp'],
+        default='ipc',
+        help='ZMQ transport between the validator and processor '
+        '(default: ipc)')
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=300,
+        help='seconds allowed per run (default: 300)')
+    parser.add_argument(
+        '--recovery',
+        action='store_true',
+        help='restart the validator halfway through each run and report '
+        'how long the processor takes to register again; --processors and '
+        '--connections are ignored')
+    parser.add_argument(
+        '--downtime',
+        type=float,
+        default=0.0,
+        help='seconds the validator is down for in a recovery run '
+        '(default: 0)')
+    parser.add_argument(
+        '-o', '--output',
+        help='file to write the JSON results to (default: stdout)')
+
+    return parser
+
+
+def main(prog_name=os.path.basename(sys.argv[0]), args=None):
+    if args is None:
+        args = sys.argv[1:]
+    args = create_parser(prog_name).parse_args(args)
+
+    logging.basicConfig(level=logging.ERROR)
+
+    if args.recovery:
+        results = [
+            run_recovery_benchmark(
+                workload,
+                transactions=args.transactions,
+                concurrency=concurrency,
+                payload_size=payload_size,
+                transport=args.transport,
+                timeout=args.timeout,
+                downtime=args.downtime)
+            for workload, concurrency, payload_size
+            in itertools.product(
+                args.workload or sorted(WORKLOADS),
+                args.concurrency,
+                args.payload_size)
+        ]
+    else:
+        results = [
+            run_benchmark(
+                workload,
+                transactions=args.transactions,
+                concurrency=concurrency,
+                payload_size=payload_size,
+                transport=args.transport,
+                timeout=args.timeout,
+                processors=processors,
+                dispatch=args.dispatch,
+                connections=args.connections)
+            for workload, processors, concurrency, payload_size
+            in itertools.product(
+                args.workload or sorted(WORKLOADS),
+                args.processors,
+                args.concurrency,
+                args.payload_size)
+        ]
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as fd:
+            fd.write(output + '\n')
+    else:
+        print(output)
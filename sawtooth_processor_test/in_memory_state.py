@@ -0,0 +1,123 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from collections import namedtuple
+
+
+TransactionReceipt = namedtuple(
+    'TransactionReceipt', ['signature', 'status', 'events', 'data'])
+
+
+class _Context:
+    def __init__(self, signature):
+        self.signature = signature
+        # address -> bytes, or None for a deletion
+        self.changes = {}
+        self.events = []
+        self.data = []
+
+
+class InMemoryState:
+    """An address to bytes map standing in for the validator's global state.
+
+    Each transaction runs in its own context: reads see the committed state
+    plus the context's own writes, and the writes, events and receipt data
+    only reach the committed state when the context is committed. Contexts
+    are committed one at a time, but nothing detects conflicts: reads see
+    whatever is committed when they are made. With more than one
+    transaction in flight, as with several processors or a max_in_flight
+    above one, transactions touching the same addresses can lose each
+    other's updates. MockValidator.run(parallel=True) avoids this by only
+    running non-conflicting transactions at the same time.
+    """
+
+    def __init__(self, initial=None):
+        """
+        Args:
+            initial (dict): address to bytes entries to start from
+        """
+        self._state = dict(initial) if initial is not None else {}
+        self._contexts = {}
+        self.receipts = []
+
+    def __getitem__(self, address):
+        return self._state[address]
+
+    def __contains__(self, address):
+        return address in self._state
+
+    def __len__(self):
+        return len(self._state)
+
+    def items(self):
+        return self._state.items()
+
+    def create_context(self, context_id, signature=None):
+        self._contexts[context_id] = _Context(signature)
+
+    def get(self, context_id, addresses):
+        """Returns (address, data) pairs for the addresses that are set."""
+        changes = self._contexts[context_id].changes
+        entries = []
+        for address in addresses:
+            if address in changes:
+                data = changes[address]
+            else:
+                data = self._state.get(address)
+            if data is not None:
+                entries.append((address, data))
+        return entries
+
+    def set(self, context_id, entries):
+        """Stages the (address, data) entries and returns their addresses.
+        """
+        changes = self._contexts[context_id].changes
+        for address, data in entries:
+            changes[address] = data
+        return [address for address, _ in entries]
+
+    def delete(self, context_id, addresses):
+        """Stages deletion of the addresses that are set and returns them.
+        """
+        changes = self._contexts[context_id].changes
+        deleted = [
+            address for address, _ in self.get(context_id, addresses)
+        ]
+        for address in deleted:
+            changes[address] = None
+        return deleted
+
+    def add_event(self, context_id, event):
+        self._contexts[context_id].events.append(event)
+
+    def add_receipt_data(self, context_id, data):
+        self._contexts[context_id].data.append(data)
+
+    def commit(self, context_id, status):
+        """Applies the context's changes and records its receipt."""
+        context = self._contexts.pop(context_id)
+        for address, data in context.changes.items():
+            if data is None:
+                self._state.pop(address, None)
+            else:
+                self._state[address] = data
+        self.receipts.append(TransactionReceipt(
+            context.signature, status, context.events, context.data))
+
+    def discard(self, context_id, status):
+        """Drops the context's changes and records an empty receipt."""
+        context = self._contexts.pop(context_id)
+        self.receipts.append(
+            TransactionReceipt(context.signature, status, [], []))
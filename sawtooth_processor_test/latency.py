@@ -0,0 +1,38 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from collections import namedtuple
+
+
+LatencySummary = namedtuple(
+    'LatencySummary', ['count', 'mean', 'p50', 'p99', 'max'])
+
+
+def summarize_latencies(latencies):
+    """Returns a LatencySummary of the given latencies, in seconds."""
+    if not latencies:
+        return LatencySummary(0, 0.0, 0.0, 0.0, 0.0)
+
+    ordered = sorted(latencies)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return LatencySummary(
+        count=len(ordered),
+        mean=sum(ordered) / len(ordered),
+        p50=percentile(0.50),
+        p99=percentile(0.99),
+        max=ordered[-1])
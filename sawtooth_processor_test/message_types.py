@@ -17,6 +17,8 @@ from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterRequest
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterResponse
 from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
 from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.processor_pb2 import TpUnregisterRequest
+from sawtooth_sdk.protobuf.processor_pb2 import TpUnregisterResponse
 
 from sawtooth_sdk.protobuf.state_context_pb2 import TpStateGetResponse
 from sawtooth_sdk.protobuf.state_context_pb2 import TpStateGetRequest
@@ -26,6 +28,8 @@ from sawtooth_sdk.protobuf.state_context_pb2 import TpStateDeleteRequest
 from sawtooth_sdk.protobuf.state_context_pb2 import TpStateDeleteResponse
 from sawtooth_sdk.protobuf.state_context_pb2 import TpEventAddRequest
 from sawtooth_sdk.protobuf.state_context_pb2 import TpEventAddResponse
+from sawtooth_sdk.protobuf.state_context_pb2 import TpReceiptAddDataRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpReceiptAddDataResponse
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
 
@@ -34,6 +38,8 @@ _TYPE_TO_PROTO = {
     Message.TP_REGISTER_RESPONSE: TpRegisterResponse,
     Message.TP_PROCESS_RESPONSE: TpProcessResponse,
     Message.TP_PROCESS_REQUEST: TpProcessRequest,
+    Message.TP_UNREGISTER_REQUEST: TpUnregisterRequest,
+    Message.TP_UNREGISTER_RESPONSE: TpUnregisterResponse,
 
     Message.TP_STATE_GET_REQUEST: TpStateGetRequest,
     Message.TP_STATE_GET_RESPONSE: TpStateGetResponse,
@@ -43,6 +49,8 @@ _TYPE_TO_PROTO = {
     Message.TP_STATE_DELETE_RESPONSE: TpStateDeleteResponse,
     Message.TP_EVENT_ADD_REQUEST: TpEventAddRequest,
     Message.TP_EVENT_ADD_RESPONSE: TpEventAddResponse,
+    Message.TP_RECEIPT_ADD_DATA_REQUEST: TpReceiptAddDataRequest,
+    Message.TP_RECEIPT_ADD_DATA_RESPONSE: TpReceiptAddDataResponse,
 }
 
 _PROTO_TO_TYPE = {
@@ -55,18 +63,16 @@ class UnknownMessageTypeException(Exception):
 
 
 def to_protobuf_class(message_type):
-    if message_type in _TYPE_TO_PROTO:
+    try:
         return _TYPE_TO_PROTO[message_type]
-
-    raise UnknownMessageTypeException(
-        "Unknown message type: {}".format(message_type))
+    except KeyError:
+        raise UnknownMessageTypeException(
+            "Unknown message type: {}".format(message_type)) from None
 
 
 def to_message_type(proto):
-    proto_class = proto.__class__
-
-    if proto_class in _PROTO_TO_TYPE:
-        return _PROTO_TO_TYPE[proto_class]
-
-    raise UnknownMessageTypeException(
-        "Unknown protobuf class: {}".format(proto_class))
+    try:
+        return _PROTO_TO_TYPE[proto.__class__]
+    except KeyError:
+        raise UnknownMessageTypeException(
+            "Unknown protobuf class: {}".format(proto.__class__)) from None
@@ -0,0 +1,529 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from collections import namedtuple
+
+import zmq
+import zmq.asyncio
+
+from sawtooth_sdk.protobuf import consensus_pb2
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from sawtooth_processor_test.latency import summarize_latencies
+
+LOGGER = logging.getLogger(__name__)
+
+
+ConsensusSimulationResult = namedtuple(
+    'ConsensusSimulationResult',
+    ['duration',
+     'notifications_sent',
+     'notifications_acked',
+     'commands_received',
+     'blocks_committed',
+     'notification_throughput',
+     'ack_latency',
+     'command_latency'])
+ConsensusSimulationResult.__doc__ = """The outcome of a consensus simulation.
+
+Throughput is in acknowledged notifications per second. The latencies are
+LatencySummary tuples in seconds: ack_latency runs from sending a
+notification to receiving its ACK, and command_latency runs from the most
+recent notification about a block to the engine's next command naming it.
+"""
+
+
+# Each service request the engine can make, with its response class and
+# message type
+_REQUESTS = {
+    Message.CONSENSUS_SEND_TO_REQUEST: (
+        consensus_pb2.ConsensusSendToRequest,
+        consensus_pb2.ConsensusSendToResponse,
+        Message.CONSENSUS_SEND_TO_RESPONSE),
+    Message.CONSENSUS_BROADCAST_REQUEST: (
+        consensus_pb2.ConsensusBroadcastRequest,
+        consensus_pb2.ConsensusBroadcastResponse,
+        Message.CONSENSUS_BROADCAST_RESPONSE),
+    Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusInitializeBlockRequest,
+        consensus_pb2.ConsensusInitializeBlockResponse,
+        Message.CONSENSUS_INITIALIZE_BLOCK_RESPONSE),
+    Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusSummarizeBlockRequest,
+        consensus_pb2.ConsensusSummarizeBlockResponse,
+        Message.CONSENSUS_SUMMARIZE_BLOCK_RESPONSE),
+    Message.CONSENSUS_FINALIZE_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusFinalizeBlockRequest,
+        consensus_pb2.ConsensusFinalizeBlockResponse,
+        Message.CONSENSUS_FINALIZE_BLOCK_RESPONSE),
+    Message.CONSENSUS_CANCEL_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusCancelBlockRequest,
+        consensus_pb2.ConsensusCancelBlockResponse,
+        Message.CONSENSUS_CANCEL_BLOCK_RESPONSE),
+    Message.CONSENSUS_CHECK_BLOCKS_REQUEST: (
+        consensus_pb2.ConsensusCheckBlocksRequest,
+        consensus_pb2.ConsensusCheckBlocksResponse,
+        Message.CONSENSUS_CHECK_BLOCKS_RESPONSE),
+    Message.CONSENSUS_COMMIT_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusCommitBlockRequest,
+        consensus_pb2.ConsensusCommitBlockResponse,
+        Message.CONSENSUS_COMMIT_BLOCK_RESPONSE),
+    Message.CONSENSUS_IGNORE_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusIgnoreBlockRequest,
+        consensus_pb2.ConsensusIgnoreBlockResponse,
+        Message.CONSENSUS_IGNORE_BLOCK_RESPONSE),
+    Message.CONSENSUS_FAIL_BLOCK_REQUEST: (
+        consensus_pb2.ConsensusFailBlockRequest,
+        consensus_pb2.ConsensusFailBlockResponse,
+        Message.CONSENSUS_FAIL_BLOCK_RESPONSE),
+    Message.CONSENSUS_BLOCKS_GET_REQUEST: (
+        consensus_pb2.ConsensusBlocksGetRequest,
+        consensus_pb2.ConsensusBlocksGetResponse,
+        Message.CONSENSUS_BLOCKS_GET_RESPONSE),
+    Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST: (
+        consensus_pb2.ConsensusChainHeadGetRequest,
+        consensus_pb2.ConsensusChainHeadGetResponse,
+        Message.CONSENSUS_CHAIN_HEAD_GET_RESPONSE),
+    Message.CONSENSUS_SETTINGS_GET_REQUEST: (
+        consensus_pb2.ConsensusSettingsGetRequest,
+        consensus_pb2.ConsensusSettingsGetResponse,
+        Message.CONSENSUS_SETTINGS_GET_RESPONSE),
+    Message.CONSENSUS_STATE_GET_REQUEST: (
+        consensus_pb2.ConsensusStateGetRequest,
+        consensus_pb2.ConsensusStateGetResponse,
+        Message.CONSENSUS_STATE_GET_RESPONSE),
+}
+
+
+def _block_id(block_num, salt=b''):
+    return hashlib.sha256(
+        salt + str(block_num).encode()).hexdigest().encode()
+
+
+class MockConsensusValidator:
+    """Plays the validator's side of the consensus protocol against a
+    consensus engine, so that an engine (and ZmqDriver/ZmqService) can be
+    exercised and benchmarked without a network.
+
+    Typical use, with the engine's driver started in another thread or
+    process against the same url:
+
+        validator = MockConsensusValidator()
+        validator.listen('tcp://127.0.0.1:5050')
+        validator.register_engine()
+        result = validator.simulate(blocks=1000, block_rate=200)
+        validator.close()
+    """
+
+    def __init__(self, settings=None, peer_count=3):
+        """
+        Args:
+            settings (dict): on-chain settings returned to the engine for
+                every block
+            peer_count (int): the number of simulated peers
+        """
+        self._settings = settings if settings is not None else {}
+
+        self._url = None
+        self._context = None
+        self._socket = None
+        self._loop = None
+        self._engine_ident = None
+
+        self._local_peer = consensus_pb2.ConsensusPeerInfo(
+            peer_id=b'mock-validator')
+        self._peers = [
+            consensus_pb2.ConsensusPeerInfo(
+                peer_id='peer-{}'.format(i).encode())
+            for i in range(peer_count)
+        ]
+
+        genesis = consensus_pb2.ConsensusBlock(
+            block_id=_block_id(0),
+            previous_id=b'',
+            signer_id=self._local_peer.peer_id,
+            block_num=0)
+        self._blocks = {genesis.block_id: genesis}
+        self._chain_head = genesis
+
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._pending_acks = {}
+        self._last_notified = {}
+        self._ack_latencies = []
+        self._command_latencies = []
+        self._notifications_sent = 0
+        self._commands_received = 0
+        self._committed = set()
+
+    @property
+    def chain_head(self):
+        return self._chain_head
+
+    @property
+    def url(self):
+        return self._url
+
+    def listen(self, url):
+        """
+        Binds to the given url, where the engine's driver should connect.
+        Must be called before register_engine or simulate.
+        """
+        self._url = url
+
+        self._loop = zmq.asyncio.ZMQEventLoop()
+        asyncio.set_event_loop(self._loop)
+
+        self._context = zmq.asyncio.Context()
+
+        # ROUTER socket; the engine's driver uses DEALER
+        self._socket = self._context.socket(zmq.ROUTER)
+        self._socket.set(zmq.LINGER, 0)
+        self._socket.bind(self._url)
+        # Resolves wildcard ports, such as tcp://127.0.0.1:*
+        self._url = self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
+    def close(self):
+        """
+        Closes the connection to the engine. Must be called at the end of
+        the program or sockets may be left open.
+        """
+        self._socket.close()
+        self._context.term()
+        self._loop.close()
+
+    def register_engine(self, timeout=None):
+        """Waits for the engine to register, then activates it with the
+        genesis block as chain head.
+
+        Returns:
+            (str, str): the engine's name and version
+        """
+        return self._loop.run_until_complete(
+            asyncio.wait_for(self._register_engine(), timeout))
+
+    def deactivate_engine(self, grace=1.0):
+        """Tells the engine it has been deactivated, which stops its
+        driver, then keeps answering its requests for grace seconds so
+        that an engine blocked on the service can exit."""
+        self._loop.run_until_complete(self._deactivate_engine(grace))
+
+    def simulate(self,
+                 blocks=100,
+                 block_rate=100.0,
+                 peer_message_rate=0.0,
+                 respond_to_commands=True,
+                 timeout=60):
+        """Feeds a stream of new blocks (and optionally peer messages) to
+        the engine and answers its requests until every block has been
+        handled or the timeout expires.
+
+        Args:
+            blocks (int): the number of blocks to announce
+            block_rate (float): BLOCK_NEW notifications per second
+            peer_message_rate (float): PEER_MESSAGE notifications per
+                second, sent while blocks are being announced
+            respond_to_commands (bool): if True, blocks are validated when
+                the engine asks for them to be checked and committed when
+                the engine commits them, and the simulation ends when every
+                block is committed. If False, BLOCK_VALID and BLOCK_COMMIT
+                follow each BLOCK_NEW immediately, and the simulation ends
+                when every notification is acknowledged.
+            timeout (float): the most seconds to run for
+
+        Returns:
+            ConsensusSimulationResult
+        """
+        self._reset_counters()
+        return self._loop.run_until_complete(self._simulate(
+            blocks, block_rate, peer_message_rate, respond_to_commands,
+            timeout))
+
+    async def _register_engine(self):
+        while True:
+            ident, message = await self._receive()
+            if message.message_type == Message.CONSENSUS_REGISTER_REQUEST:
+                break
+            LOGGER.warning(
+                'Ignoring message type %s before registration',
+                message.message_type)
+
+        self._engine_ident = ident
+
+        request = consensus_pb2.ConsensusRegisterRequest()
+        request.ParseFromString(message.content)
+
+        await self._send(
+            Message.CONSENSUS_REGISTER_RESPONSE,
+            consensus_pb2.ConsensusRegisterResponse(
+                status=consensus_pb2.ConsensusRegisterResponse.OK),
+            message.correlation_id)
+
+        await self._notify(
+            Message.CONSENSUS_NOTIFY_ENGINE_ACTIVATED,
+            consensus_pb2.ConsensusNotifyEngineActivated(
+                chain_head=self._chain_head,
+                peers=self._peers,
+                local_peer_info=self._local_peer))
+
+        return request.name, request.version
+
+    async def _deactivate_engine(self, grace):
+        await self._notify(
+            Message.CONSENSUS_NOTIFY_ENGINE_DEACTIVATED,
+            consensus_pb2.ConsensusNotifyEngineDeactivated())
+        try:
+            await asyncio.wait_for(
+                self._serve(False, lambda: False, asyncio.Event()), grace)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _simulate(self, blocks, block_rate, peer_message_rate,
+                        respond_to_commands, timeout):
+        start = time.time()
+        done = asyncio.Event()
+        generated = []
+
+        def is_done():
+            if len(generated) < blocks:
+                return False
+            if respond_to_commands:
+                return all(
+                    block_id in self._committed for block_id in generated)
+            return not self._pending_acks
+
+        receiver = asyncio.ensure_future(
+            self._serve(respond_to_commands, is_done, done))
+        generator = asyncio.ensure_future(
+            self._generate_blocks(
+                blocks, block_rate, respond_to_commands, generated))
+        peers = None
+        if peer_message_rate > 0:
+            peers = asyncio.ensure_future(
+                self._generate_peer_messages(peer_message_rate, generator))
+
+        try:
+            await asyncio.wait_for(done.wait(), timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning('Consensus simulation timed out after %ss',
+                           timeout)
+        finally:
+            for task in (receiver, generator, peers):
+                if task is not None:
+                    task.cancel()
+
+        duration = time.time() - start
+        acked = len(self._ack_latencies)
+
+        return ConsensusSimulationResult(
+            duration=duration,
+            notifications_sent=self._notifications_sent,
+            notifications_acked=acked,
+            commands_received=self._commands_received,
+            blocks_committed=len(
+                [b for b in generated if b in self._committed]),
+            notification_throughput=acked / duration if duration else 0.0,
+            ack_latency=summarize_latencies(self._ack_latencies),
+            command_latency=summarize_latencies(self._command_latencies))
+
+    async def _generate_blocks(self, blocks, block_rate, scripted_only,
+                               generated):
+        interval = 1.0 / block_rate
+        previous = self._chain_head
+        next_send = time.time()
+        for _ in range(blocks):
+            block = self._new_block(previous, salt=b'sim')
+            generated.append(block.block_id)
+            await self._notify_block_new(block)
+            if not scripted_only:
+                await self._notify_block_valid(block.block_id)
+                await self._notify_block_commit(block.block_id)
+            previous = block
+
+            next_send += interval
+            delay = next_send - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    async def _generate_peer_messages(self, rate, generator):
+        interval = 1.0 / rate
+        count = 0
+        while not generator.done():
+            peer = self._peers[count % len(self._peers)]
+            content = 'message-{}'.format(count).encode()
+            header = consensus_pb2.ConsensusPeerMessageHeader(
+                signer_id=peer.peer_id,
+                content_sha512=hashlib.sha512(content).digest(),
+                message_type='mock',
+                name='mock',
+                version='1.0')
+            await self._notify(
+                Message.CONSENSUS_NOTIFY_PEER_MESSAGE,
+                consensus_pb2.ConsensusNotifyPeerMessage(
+                    message=consensus_pb2.ConsensusPeerMessage(
+                        header=header.SerializeToString(),
+                        header_signature=b'',
+                        content=content),
+                    sender_id=peer.peer_id))
+            count += 1
+            await asyncio.sleep(interval)
+
+    def _new_block(self, previous, salt=b''):
+        block_num = previous.block_num + 1
+        block = consensus_pb2.ConsensusBlock(
+            block_id=_block_id(block_num, salt + previous.block_id),
+            previous_id=previous.block_id,
+            signer_id=self._peers[block_num % len(self._peers)].peer_id
+            if self._peers else self._local_peer.peer_id,
+            block_num=block_num,
+            payload=b'',
+            summary=b'')
+        self._blocks[block.block_id] = block
+        return block
+
+    async def _notify_block_new(self, block):
+        await self._notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_NEW,
+            consensus_pb2.ConsensusNotifyBlockNew(block=block),
+            block_id=block.block_id)
+
+    async def _notify_block_valid(self, block_id):
+        await self._notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_VALID,
+            consensus_pb2.ConsensusNotifyBlockValid(block_id=block_id),
+            block_id=block_id)
+
+    async def _notify_block_commit(self, block_id):
+        self._chain_head = self._blocks[block_id]
+        self._committed.add(block_id)
+        await self._notify(
+            Message.CONSENSUS_NOTIFY_BLOCK_COMMIT,
+            consensus_pb2.ConsensusNotifyBlockCommit(block_id=block_id),
+            block_id=block_id)
+
+    async def _serve(self, respond_to_commands, is_done, done):
+        while True:
+            _, message = await self._receive()
+            now = time.time()
+
+            if message.message_type == Message.CONSENSUS_NOTIFY_ACK:
+                sent = self._pending_acks.pop(message.correlation_id, None)
+                if sent is not None:
+                    self._ack_latencies.append(now - sent)
+            elif message.message_type in _REQUESTS:
+                self._commands_received += 1
+                await self._handle_request(message, now, respond_to_commands)
+            else:
+                LOGGER.warning(
+                    'Ignoring unexpected message type %s',
+                    message.message_type)
+
+            if is_done():
+                done.set()
+
+    async def _handle_request(self, message, now, respond_to_commands):
+        request_class, response_class, response_type = \
+            _REQUESTS[message.message_type]
+        request = request_class()
+        request.ParseFromString(message.content)
+        response = response_class(status=response_class.OK)
+        followups = []
+
+        if message.message_type == Message.CONSENSUS_CHECK_BLOCKS_REQUEST:
+            block_ids = list(request.block_ids)
+            self._record_command(block_ids, now)
+            if any(b not in self._blocks for b in block_ids):
+                response.status = response_class.UNKNOWN_BLOCK
+            elif respond_to_commands:
+                followups = [
+                    self._notify_block_valid(b) for b in block_ids]
+
+        elif message.message_type in (
+                Message.CONSENSUS_COMMIT_BLOCK_REQUEST,
+                Message.CONSENSUS_IGNORE_BLOCK_REQUEST,
+                Message.CONSENSUS_FAIL_BLOCK_REQUEST):
+            self._record_command([request.block_id], now)
+            if request.block_id not in self._blocks:
+                response.status = response_class.UNKNOWN_BLOCK
+            elif respond_to_commands and message.message_type == \
+                    Message.CONSENSUS_COMMIT_BLOCK_REQUEST:
+                followups = [self._notify_block_commit(request.block_id)]
+
+        elif message.message_type == Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST:
+            response.summary = b'summary'
+
+        elif message.message_type == Message.CONSENSUS_FINALIZE_BLOCK_REQUEST:
+            block = self._new_block(self._chain_head, salt=b'local')
+            response.block_id = block.block_id
+            followups = [self._notify_block_new(block)]
+
+        elif message.message_type == Message.CONSENSUS_BLOCKS_GET_REQUEST:
+            if any(b not in self._blocks for b in request.block_ids):
+                response.status = response_class.UNKNOWN_BLOCK
+            else:
+                response.blocks.extend(
+                    [self._blocks[b] for b in request.block_ids])
+
+        elif message.message_type == Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST:
+            response.block.CopyFrom(self._chain_head)
+
+        elif message.message_type == Message.CONSENSUS_SETTINGS_GET_REQUEST:
+            response.entries.extend([
+                consensus_pb2.ConsensusSettingsEntry(
+                    key=key, value=self._settings[key])
+                for key in request.keys if key in self._settings
+            ])
+
+        await self._send(response_type, response, message.correlation_id)
+
+        for followup in followups:
+            await followup
+
+    def _record_command(self, block_ids, now):
+        for block_id in block_ids:
+            notified = self._last_notified.get(block_id)
+            if notified is not None:
+                self._command_latencies.append(now - notified)
+
+    async def _notify(self, message_type, notification, block_id=None):
+        correlation_id = uuid.uuid4().hex
+        now = time.time()
+        self._pending_acks[correlation_id] = now
+        if block_id is not None:
+            self._last_notified[block_id] = now
+        self._notifications_sent += 1
+        await self._send(message_type, notification, correlation_id)
+
+    async def _send(self, message_type, content, correlation_id):
+        message = Message(
+            message_type=message_type,
+            correlation_id=correlation_id,
+            content=content.SerializeToString())
+        await self._socket.send_multipart([
+            self._engine_ident,
+            message.SerializeToString()
+        ])
+
+    async def _receive(self):
+        ident, result = await self._socket.recv_multipart()
+        message = Message()
+        message.ParseFromString(result)
+        return ident, message
@@ -17,21 +17,66 @@ import asyncio
 import binascii
 import logging
 import subprocess
+import time
+import uuid
+from collections import namedtuple
 
 import zmq
 import zmq.asyncio
 
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterRequest
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterResponse
+from sawtooth_sdk.protobuf import state_context_pb2
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.latency import summarize_latencies
 from sawtooth_processor_test.message_types import to_protobuf_class
 from sawtooth_processor_test.message_types import to_message_type
+from sawtooth_processor_test.scheduler import InOrderScheduler
+from sawtooth_processor_test.scheduler import ParallelScheduler
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.setLevel(logging.INFO)
 
 
+ThroughputResult = namedtuple(
+    'ThroughputResult',
+    ['transactions',
+     'valid',
+     'invalid',
+     'internal_errors',
+     'duration',
+     'tps',
+     'latency',
+     'peak_in_flight',
+     'processors'])
+ThroughputResult.__doc__ = """The outcome of MockValidator.run().
+
+tps counts every answered transaction, and latency is a LatencySummary in
+seconds from sending each TpProcessRequest to receiving its response.
+peak_in_flight is the most transactions that were in flight at once.
+processors maps each processor's zmq identity to a ProcessorThroughput.
+"""
+
+ProcessorThroughput = namedtuple(
+    'ProcessorThroughput', ['transactions', 'tps', 'latency'])
+
+
+class _RegisteredProcessor:
+    def __init__(self, ident, header_style, max_occupancy):
+        self.ident = ident
+        self.families = set()
+        self.header_style = header_style
+        self.max_occupancy = max_occupancy
+        self.occupancy = 0
+        self.latencies = []
+
+
 class UnexpectedMessageException(Exception):
     def __init__(self, message_type, expected, received):
         super().__init__("{}: Expected {}({}):'{}', Got {}({}):'{}'".format(
@@ -60,8 +105,11 @@ class MockValidator:
         # asyncio
         self._loop = None
 
-        # Transaction processor
+        # Transaction processors, by zmq identity, in registration order.
+        # send() targets the most recently registered one.
         self._tp_ident = None
+        self._processors = {}
+        self._next_processor = 0
 
         # The set request comparison is a little more complex by default
         self.register_comparator(Message.TP_STATE_SET_REQUEST,
@@ -69,6 +117,10 @@ class MockValidator:
         self.register_comparator(Message.TP_PROCESS_RESPONSE,
                                  compare_tp_process_response_status_only)
 
+    @property
+    def url(self):
+        return self._url
+
     def listen(self, url):
         """
         Opens a connection to the processor. Must be called before using send
@@ -90,6 +142,8 @@ class MockValidator:
 
         try:
             self._socket.bind(self._url)
+            # Resolves wildcard ports, such as tcp://127.0.0.1:*
+            self._url = self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
 
         # Catch errors with binding and print out more debug info
         except zmq.error.ZMQError:
@@ -133,17 +187,33 @@ class MockValidator:
 
         request = TpRegisterRequest()
         request.ParseFromString(message.content)
+
+        if ident not in self._processors:
+            self._processors[ident] = _RegisteredProcessor(
+                ident, request.request_header_style, request.max_occupancy)
+        self._processors[ident].families.add(
+            (request.family, request.version))
+
         LOGGER.debug(
             "Processor registered: %s, %s, %s",
-            str(request.family), str(request.version),
-            str(request.namespaces)
-        )
+            request.family, request.version, request.namespaces)
         response = TpRegisterResponse(
             status=TpRegisterResponse.OK,
             protocol_version=request.protocol_version)
         self.send(response, message.correlation_id)
         return True
 
+    def register_processors(self, count):
+        """
+        Accepts registration requests until `count` distinct processors
+        have registered, for use with run(). Returns False if any other
+        message is received first.
+        """
+        while len(self._processors) < count:
+            if not self.register_processor():
+                return False
+        return True
+
     def send(self, message_content, correlation_id=None):
         """
         Convert the message content to a protobuf message, including
@@ -168,12 +238,12 @@ class MockValidator:
         :param ident (str) the identity of the zmq.DEALER to send to
         """
 
-        LOGGER.debug(
-            "Sending %s(%s) to %s",
-            str(to_protobuf_class(message.message_type).__name__),
-            str(message.message_type),
-            str(ident)
-        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "Sending %s(%s) to %s",
+                Message.MessageType.Name(message.message_type),
+                message.message_type,
+                ident)
 
         return await self._socket.send_multipart([
             ident,
@@ -188,19 +258,17 @@ class MockValidator:
             self._receive()
         )
 
-        LOGGER.debug(result)
-        LOGGER.debug("%s:%s", len(result), binascii.hexlify(result))
-
         # Deconstruct the message
         message = Message()
         message.ParseFromString(result)
 
-        LOGGER.debug(
-            "Received %s(%s) from %s",
-            str(to_protobuf_class(message.message_type).__name__),
-            str(message.message_type),
-            str(ident)
-        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug("%s:%s", len(result), binascii.hexlify(result))
+            LOGGER.debug(
+                "Received %s(%s) from %s",
+                Message.MessageType.Name(message.message_type),
+                message.message_type,
+                ident)
 
         return message, ident
 
@@ -267,6 +335,254 @@ class MockValidator:
         """
         return self.send(message_content, message.correlation_id)
 
+    def run(self, requests, state=None, max_in_flight=1, timeout=None,
+            dispatch='round_robin', parallel=False, window=1000):
+        """
+        Feeds the TpProcessRequests to the registered processors and answers
+        their state, event and receipt requests from `state`, instead of
+        scripting each exchange with expect() and respond(). The state
+        changes of each transaction are committed if the processor returns
+        OK and discarded otherwise. INTERNAL_ERROR responses are counted but
+        not retried.
+
+        Each request goes to a processor registered for its family and
+        version that has spare capacity, chosen by `dispatch`. Requests are
+        dispatched in order, so a request waits while every processor for
+        its family is full. Unless `parallel` is set, transactions on
+        different processors run concurrently against the same state without
+        conflict detection, so workloads should not expect serial results
+        across processors.
+
+        Args:
+            requests (iterable of TpProcessRequest): the transactions to
+                process, for example from load_process_requests(); any
+                context_id is replaced
+            state (InMemoryState): the state to run against; a new, empty
+                one is used if not given
+            max_in_flight (int): the most requests in flight on each
+                processor that did not register a max_occupancy
+            timeout (float): the most seconds to run for
+            dispatch (str): 'round_robin' to cycle through the processors
+                with capacity, or 'least_loaded' to pick the one with the
+                fewest requests in flight
+            parallel (bool): dispatch with a ParallelScheduler, which runs
+                a request as soon as its dependencies have completed and
+                it does not conflict with any earlier incomplete request,
+                giving the same state as running `requests` serially.
+                `requests` must already be in dependency order.
+            window (int): how many incomplete requests a parallel run
+                looks ahead through; 1 runs them strictly one at a time
+
+        Returns:
+            ThroughputResult
+        """
+        if dispatch not in ('round_robin', 'least_loaded'):
+            raise ValueError('Unknown dispatch: {}'.format(dispatch))
+
+        if state is None:
+            state = InMemoryState()
+
+        if parallel:
+            scheduler = ParallelScheduler(requests, window=window)
+        else:
+            scheduler = InOrderScheduler(requests)
+
+        for processor in self._processors.values():
+            processor.occupancy = 0
+            processor.latencies = []
+
+        return self._loop.run_until_complete(asyncio.wait_for(
+            self._run(scheduler, state, max_in_flight, dispatch),
+            timeout))
+
+    def _choose_processor(self, request, max_in_flight, dispatch):
+        family = (request.header.family_name, request.header.family_version)
+        processors = list(self._processors.values())
+        eligible = [p for p in processors if family in p.families]
+        if not eligible:
+            raise ValueError(
+                'No processor registered for {} {}'.format(*family))
+
+        available = [
+            p for p in eligible
+            if p.occupancy < (p.max_occupancy or max_in_flight)
+        ]
+        if not available:
+            return None
+
+        if dispatch == 'least_loaded':
+            return min(available, key=lambda p: p.occupancy)
+
+        # Round robin: the first available processor at or after the one
+        # following the last choice, in registration order
+        chosen = min(
+            available,
+            key=lambda p: (processors.index(p) - self._next_processor)
+            % len(processors))
+        self._next_processor = processors.index(chosen) + 1
+        return chosen
+
+    async def _run(self, scheduler, state, max_in_flight, dispatch):
+        in_flight = {}
+        peak_in_flight = 0
+        latencies = []
+        statuses = []
+        pending = None
+        start = time.time()
+
+        while True:
+            while True:
+                if pending is None:
+                    pending = scheduler.next_request()
+                    if pending is None:
+                        break
+                processor = self._choose_processor(
+                    pending, max_in_flight, dispatch)
+                if processor is None:
+                    break
+                await self._send_process_request(
+                    pending, processor, state, in_flight)
+                pending = None
+            peak_in_flight = max(peak_in_flight, len(in_flight))
+
+            if pending is None and not in_flight:
+                if not scheduler.done:
+                    raise RuntimeError(
+                        'Scheduler has requests left but none can run')
+                break
+
+            ident, result = await self._receive()
+            message = Message()
+            message.ParseFromString(result)
+
+            if message.message_type == Message.TP_PROCESS_RESPONSE:
+                request, context_id, sent, processor = \
+                    in_flight.pop(message.correlation_id)
+                scheduler.complete(request)
+                latency = time.time() - sent
+                latencies.append(latency)
+                processor.latencies.append(latency)
+                processor.occupancy -= 1
+
+                response = TpProcessResponse()
+                response.ParseFromString(message.content)
+                statuses.append(response.status)
+                if response.status == TpProcessResponse.OK:
+                    state.commit(context_id, response.status)
+                else:
+                    state.discard(context_id, response.status)
+            else:
+                await self._respond_to_state_request(ident, message, state)
+
+        duration = time.time() - start
+
+        return ThroughputResult(
+            transactions=len(statuses),
+            valid=statuses.count(TpProcessResponse.OK),
+            invalid=statuses.count(TpProcessResponse.INVALID_TRANSACTION),
+            internal_errors=statuses.count(TpProcessResponse.INTERNAL_ERROR),
+            duration=duration,
+            tps=len(statuses) / duration if duration else 0.0,
+            latency=summarize_latencies(latencies),
+            peak_in_flight=peak_in_flight,
+            processors={
+                ident: ProcessorThroughput(
+                    transactions=len(processor.latencies),
+                    tps=len(processor.latencies) / duration
+                    if duration else 0.0,
+                    latency=summarize_latencies(processor.latencies))
+                for ident, processor in self._processors.items()
+            })
+
+    async def _send_process_request(self, request, processor, state,
+                                    in_flight):
+        context_id = uuid.uuid4().hex
+        correlation_id = uuid.uuid4().hex
+
+        process_request = TpProcessRequest()
+        process_request.CopyFrom(request)
+        process_request.context_id = context_id
+        if processor.header_style == TpRegisterRequest.RAW \
+                and not process_request.header_bytes:
+            process_request.header_bytes = \
+                process_request.header.SerializeToString()
+
+        state.create_context(context_id, request.signature)
+        in_flight[correlation_id] = \
+            (request, context_id, time.time(), processor)
+        processor.occupancy += 1
+
+        await self._socket.send_multipart([
+            processor.ident,
+            Message(
+                message_type=Message.TP_PROCESS_REQUEST,
+                correlation_id=correlation_id,
+                content=process_request.SerializeToString()
+            ).SerializeToString()
+        ])
+
+    async def _respond_to_state_request(self, ident, message, state):
+        if message.message_type == Message.TP_STATE_GET_REQUEST:
+            request = state_context_pb2.TpStateGetRequest()
+            request.ParseFromString(message.content)
+            response_type = Message.TP_STATE_GET_RESPONSE
+            response = state_context_pb2.TpStateGetResponse(
+                status=state_context_pb2.TpStateGetResponse.OK,
+                entries=[
+                    state_context_pb2.TpStateEntry(address=a, data=d)
+                    for a, d in state.get(
+                        request.context_id, request.addresses)
+                ])
+
+        elif message.message_type == Message.TP_STATE_SET_REQUEST:
+            request = state_context_pb2.TpStateSetRequest()
+            request.ParseFromString(message.content)
+            response_type = Message.TP_STATE_SET_RESPONSE
+            response = state_context_pb2.TpStateSetResponse(
+                status=state_context_pb2.TpStateSetResponse.OK,
+                addresses=state.set(
+                    request.context_id,
+                    [(e.address, e.data) for e in request.entries]))
+
+        elif message.message_type == Message.TP_STATE_DELETE_REQUEST:
+            request = state_context_pb2.TpStateDeleteRequest()
+            request.ParseFromString(message.content)
+            response_type = Message.TP_STATE_DELETE_RESPONSE
+            response = state_context_pb2.TpStateDeleteResponse(
+                status=state_context_pb2.TpStateDeleteResponse.OK,
+                addresses=state.delete(
+                    request.context_id, request.addresses))
+
+        elif message.message_type == Message.TP_EVENT_ADD_REQUEST:
+            request = state_context_pb2.TpEventAddRequest()
+            request.ParseFromString(message.content)
+            state.add_event(request.context_id, request.event)
+            response_type = Message.TP_EVENT_ADD_RESPONSE
+            response = state_context_pb2.TpEventAddResponse(
+                status=state_context_pb2.TpEventAddResponse.OK)
+
+        elif message.message_type == Message.TP_RECEIPT_ADD_DATA_REQUEST:
+            request = state_context_pb2.TpReceiptAddDataRequest()
+            request.ParseFromString(message.content)
+            state.add_receipt_data(request.context_id, request.data)
+            response_type = Message.TP_RECEIPT_ADD_DATA_RESPONSE
+            response = state_context_pb2.TpReceiptAddDataResponse(
+                status=state_context_pb2.TpReceiptAddDataResponse.OK)
+
+        else:
+            LOGGER.warning(
+                "Ignoring unexpected message type %s", message.message_type)
+            return
+
+        await self._socket.send_multipart([
+            ident,
+            Message(
+                message_type=response_type,
+                correlation_id=message.correlation_id,
+                content=response.SerializeToString()
+            ).SerializeToString()
+        ])
+
     def register_comparator(self, message_type, comparator):
         self._comparators[message_type] = comparator
 
@@ -283,6 +599,27 @@ class MockValidator:
         return obj1 == obj2
 
 
+def load_process_requests(path):
+    """
+    Yields a TpProcessRequest for each transaction in the serialized
+    BatchList at `path`, such as one written by `intkey create_batch`, in
+    batch order.
+    """
+    batch_list = BatchList()
+    with open(path, 'rb') as batch_file:
+        batch_list.ParseFromString(batch_file.read())
+
+    for batch in batch_list.batches:
+        for transaction in batch.transactions:
+            header = TransactionHeader()
+            header.ParseFromString(transaction.header)
+            yield TpProcessRequest(
+                header=header,
+                header_bytes=transaction.header,
+                payload=transaction.payload,
+                signature=transaction.header_signature)
+
+
 def compare_set_request(req1, req2):
     if len(req1.entries) != len(req2.entries):
         return False
@@ -0,0 +1,386 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Replays a BatchList file through a transaction processor.
+
+The transactions are executed in dependency order by a MockValidator
+against in-memory state, either one at a time or with non-conflicting
+transactions in parallel. The resulting state can be reduced to a digest,
+to check that a processor is deterministic, or saved and diffed address by
+address against another run.
+"""
+
+import argparse
+import hashlib
+import heapq
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+
+from sawtooth_sdk.processor.core import TransactionProcessor
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+from sawtooth_processor_test.mock_validator import load_process_requests
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DependencyCycleError(Exception):
+    pass
+
+
+def order_by_dependencies(requests):
+    """Orders TpProcessRequests so that each comes after the transactions
+    it depends on, keeping the original order otherwise. Dependencies on
+    transactions that are not among the requests are assumed to have been
+    committed already.
+
+    Raises:
+        DependencyCycleError: if the dependencies form a cycle
+    """
+    requests = list(requests)
+    index = {request.signature: i for i, request in enumerate(requests)}
+
+    # For each transaction, how many of its dependencies are still to be
+    # ordered, and which transactions depend on it
+    waiting_on = [0] * len(requests)
+    dependents = [[] for _ in requests]
+    for i, request in enumerate(requests):
+        for dep in set(request.header.dependencies):
+            if dep in index:
+                waiting_on[i] += 1
+                dependents[index[dep]].append(i)
+
+    ready = [i for i, count in enumerate(waiting_on) if count == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        i = heapq.heappop(ready)
+        ordered.append(requests[i])
+        for dependent in dependents[i]:
+            waiting_on[dependent] -= 1
+            if waiting_on[dependent] == 0:
+                heapq.heappush(ready, dependent)
+
+    if len(ordered) < len(requests):
+        cyclic = [r for i, r in enumerate(requests) if waiting_on[i] > 0]
+        raise DependencyCycleError(
+            'Dependency cycle among {} transactions, including {}'.format(
+                len(cyclic), cyclic[0].signature))
+
+    return ordered
+
+
+def state_digest(state):
+    """Returns a hex SHA-256 digest of the (address, data) entries in
+    `state`, independent of insertion order."""
+    digest = hashlib.sha256()
+    for address, data in sorted(state.items()):
+        digest.update(address.encode())
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def diff_states(before, after):
+    """Compares two address to bytes mappings.
+
+    Returns:
+        dict: sorted lists of the addresses 'added' to, 'removed' from and
+            'changed' between `before` and `after`
+    """
+    return {
+        'added': sorted(set(after) - set(before)),
+        'removed': sorted(set(before) - set(after)),
+        'changed': sorted(
+            address for address in set(before) & set(after)
+            if before[address] != after[address]),
+    }
+
+
+def load_handler(spec):
+    """Instantiates a TransactionHandler from 'module:ClassName'."""
+    module_name, _, class_name = spec.partition(':')
+    if not class_name:
+        raise ValueError(
+            'Handler must be given as module:ClassName, not {}'.format(spec))
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class _Harness:
+    """A MockValidator with registered processors, either started here from
+    handlers or connecting from outside."""
+
+    def __init__(self, handlers=None, url='tcp://127.0.0.1:*', processors=1):
+        self._validator = MockValidator()
+        self._validator.listen(url)
+        self._processors = []
+
+        if handlers:
+            for _ in range(processors):
+                processor = TransactionProcessor(self._validator.url)
+                for handler in handlers:
+                    processor.add_handler(handler)
+                threading.Thread(
+                    target=processor.start, daemon=True).start()
+                self._processors.append(processor)
+        else:
+            LOGGER.warning('Waiting for %s processors to connect to %s',
+                           processors, self._validator.url)
+
+        try:
+            if not self._validator.register_processors(processors):
+                raise RuntimeError(
+                    'Transaction processors failed to register')
+        except BaseException:
+            self.close()
+            raise
+
+    def run(self, requests, **kwargs):
+        state = InMemoryState()
+        result = self._validator.run(requests, state=state, **kwargs)
+        return state, result
+
+    def close(self):
+        for processor in self._processors:
+            processor.stop()
+        self._validator.close()
+
+
+def replay(batch_file, handlers=None, url='tcp://127.0.0.1:*', timeout=None,
+           processors=1, parallel=False):
+    """Replays the transactions in a serialized BatchList.
+
+    Args:
+        batch_file (str): the path of the BatchList
+        handlers (list of TransactionHandler): handlers to run in
+            TransactionProcessors in this process. If not given, the replay
+            waits for external processors to register at `url`.
+        url (str): the endpoint to listen on
+        timeout (float): the most seconds to run for
+        processors (int): the number of processors to dispatch to
+        parallel (bool): run non-conflicting transactions concurrently
+            (see ParallelScheduler) rather than one at a time
+
+    Returns:
+        (InMemoryState, ThroughputResult)
+    """
+    requests = order_by_dependencies(load_process_requests(batch_file))
+
+    harness = _Harness(handlers, url, processors)
+    try:
+        return harness.run(
+            requests,
+            timeout=timeout,
+            parallel=True,
+            window=1000 if parallel else 1)
+    finally:
+        harness.close()
+
+
+def compare_schedules(batch_file, handlers=None, url='tcp://127.0.0.1:*',
+                      timeout=None, processors=2):
+    """Replays a BatchList serially and then in parallel on the same
+    processors, to measure how much parallelism it contains.
+
+    Returns:
+        (dict, dict): the serial and parallel states, address to bytes
+        (ThroughputResult, ThroughputResult): the serial and parallel
+            results
+    """
+    requests = order_by_dependencies(load_process_requests(batch_file))
+
+    harness = _Harness(handlers, url, processors)
+    try:
+        serial_state, serial = harness.run(
+            requests, timeout=timeout, parallel=True, window=1)
+        parallel_state, parallel = harness.run(
+            requests, timeout=timeout, parallel=True)
+    finally:
+        harness.close()
+
+    return (
+        (dict(serial_state.items()), dict(parallel_state.items())),
+        (serial, parallel))
+
+
+def _summarize(state, result):
+    return {
+        'state_digest': state_digest(state),
+        'entries': len(state),
+        'transactions': result.transactions,
+        'valid': result.valid,
+        'invalid': result.invalid,
+        'internal_errors': result.internal_errors,
+        'duration': result.duration,
+        'tps': result.tps,
+        'latency_p50': result.latency.p50,
+        'latency_p99': result.latency.p99,
+        'peak_in_flight': result.peak_in_flight,
+    }
+
+
+def _write_state(state, path):
+    with open(path, 'w') as fd:
+        json.dump(
+            {address: data.hex() for address, data in sorted(state.items())},
+            fd, indent=2)
+
+
+def _read_state(path):
+    with open(path) as fd:
+        return {
+            address: bytes.fromhex(data)
+            for address, data in json.load(fd).items()
+        }
+
+
+def do_run(args):
+    state, result = replay(
+        args.batch_file,
+        handlers=[load_handler(spec) for spec in args.handler],
+        url=args.url,
+        timeout=args.timeout,
+        processors=args.processors,
+        parallel=args.parallel)
+
+    if args.save_state:
+        _write_state(state, args.save_state)
+
+    print(json.dumps(_summarize(state, result), indent=2))
+
+
+def do_compare(args):
+    states, results = compare_schedules(
+        args.batch_file,
+        handlers=[load_handler(spec) for spec in args.handler],
+        url=args.url,
+        timeout=args.timeout,
+        processors=args.processors)
+
+    serial, parallel = (
+        _summarize(state, result) for state, result in zip(states, results))
+    match = states[0] == states[1]
+
+    print(json.dumps({
+        'serial': serial,
+        'parallel': parallel,
+        'speedup': serial['duration'] / parallel['duration']
+        if parallel['duration'] else 0.0,
+        'state_match': match,
+    }, indent=2))
+
+    if not match:
+        sys.exit(1)
+
+
+def do_diff(args):
+    before = _read_state(args.before)
+    after = _read_state(args.after)
+    diff = diff_states(before, after)
+
+    for label, key in (('+', 'added'), ('-', 'removed'), ('~', 'changed')):
+        for address in diff[key]:
+            print('{} {}'.format(label, address))
+
+    if any(diff.values()):
+        sys.exit(1)
+
+
+def create_parser(prog_name):
+    parser = argparse.ArgumentParser(
+        prog=prog_name,
+        description='Replays a BatchList file through a transaction '
+        'processor against in-memory state, or diffs two saved states.')
+
+    subparsers = parser.add_subparsers(title='subcommands', dest='command')
+    subparsers.required = True
+
+    replay_parser = argparse.ArgumentParser(add_help=False)
+    replay_parser.add_argument(
+        'batch_file',
+        help='serialized BatchList, such as from intkey create_batch')
+    replay_parser.add_argument(
+        '--handler',
+        action='append',
+        default=[],
+        help='handler to run in process, as module:ClassName; may be given '
+        'more than once. Without it, external processors must connect '
+        'to --url')
+    replay_parser.add_argument(
+        '--url',
+        default='tcp://127.0.0.1:*',
+        help='endpoint for the processors to connect to '
+        '(default: a free local port)')
+    replay_parser.add_argument(
+        '--timeout',
+        type=float,
+        help='seconds allowed for each replay')
+
+    run_parser = subparsers.add_parser(
+        'run',
+        parents=[replay_parser],
+        help='replay a batch file and print its state digest and timing')
+    run_parser.add_argument(
+        '--processors',
+        type=int,
+        default=1,
+        help='number of processors to dispatch to (default: 1)')
+    run_parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='run transactions that do not conflict concurrently')
+    run_parser.add_argument(
+        '--save-state',
+        help='file to write the resulting state to, for diff')
+
+    compare_parser = subparsers.add_parser(
+        'compare',
+        parents=[replay_parser],
+        help='replay a batch file serially and in parallel, and check that '
+        'the states match; exits 1 if they do not')
+    compare_parser.add_argument(
+        '--processors',
+        type=int,
+        default=2,
+        help='number of processors to dispatch to (default: 2)')
+
+    diff_parser = subparsers.add_parser(
+        'diff',
+        help='compare two saved states address by address; exits 1 if '
+        'they differ')
+    diff_parser.add_argument('before', help='state saved by run')
+    diff_parser.add_argument('after', help='state saved by run')
+
+    return parser
+
+
+def main(prog_name=os.path.basename(sys.argv[0]), args=None):
+    if args is None:
+        args = sys.argv[1:]
+    args = create_parser(prog_name).parse_args(args)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.command == 'run':
+        do_run(args)
+    elif args.command == 'compare':
+        do_compare(args)
+    elif args.command == 'diff':
+        do_diff(args)
@@ -0,0 +1,188 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from collections import defaultdict
+import heapq
+import itertools
+
+
+class InOrderScheduler:
+    """Hands out requests in the given order, without waiting for earlier
+    ones to complete. With one processor, which handles one transaction at
+    a time, this executes them serially."""
+
+    def __init__(self, requests):
+        self._requests = iter(requests)
+
+    def next_request(self):
+        """Returns the next request to dispatch, or None if there is none
+        until another completes, or none left at all."""
+        return next(self._requests, None)
+
+    def complete(self, request):
+        pass
+
+    @property
+    def done(self):
+        return True
+
+
+class _Entry:
+    """An incomplete request, with the later requests it holds back and the
+    number of earlier ones holding it back."""
+
+    def __init__(self, position, request):
+        self.position = position
+        self.request = request
+        self.blocked_by = 0
+        self.blocks = []
+
+    def __lt__(self, other):
+        return self.position < other.position
+
+
+class _AddressIndex:
+    """The incomplete requests reading or writing each address, able to
+    find those on any address overlapping a given one, where addresses
+    overlap if one is a prefix of the other."""
+
+    def __init__(self):
+        # address -> entries on exactly that address
+        self._entries = defaultdict(list)
+        # prefix -> the addresses in _entries that start with it
+        self._extensions = defaultdict(set)
+
+    def add(self, address, entry):
+        if address not in self._entries:
+            for end in range(len(address) + 1):
+                self._extensions[address[:end]].add(address)
+        self._entries[address].append(entry)
+
+    def remove(self, address, entry):
+        entries = self._entries[address]
+        entries.remove(entry)
+        if entries:
+            return
+
+        del self._entries[address]
+        for end in range(len(address) + 1):
+            extensions = self._extensions[address[:end]]
+            extensions.discard(address)
+            if not extensions:
+                del self._extensions[address[:end]]
+
+    def overlapping(self, address):
+        """Yields the entries on addresses overlapping `address`."""
+        for end in range(len(address)):
+            if address[:end] in self._entries:
+                yield from self._entries[address[:end]]
+        for extension in self._extensions.get(address, ()):
+            yield from self._entries[extension]
+
+
+class ParallelScheduler:
+    """Hands out requests as soon as they can run without changing the
+    result of executing them serially in the given order.
+
+    A request may run once every request it lists in its dependencies has
+    completed, and no earlier request that has not completed conflicts with
+    it. Two requests conflict if either one's outputs overlap the other's
+    inputs or outputs, where addresses overlap if one is a prefix of the
+    other. Only the first `window` incomplete requests are considered.
+
+    The requests must already be in dependency order: a dependency that has
+    not been seen yet is taken to be outside the set and already committed.
+
+    Each request's conflicts are found once, when it enters the window,
+    from the readers and writers of each address among the incomplete
+    requests. Completing a request then only releases the requests it held
+    back, so neither takes time in the size of the window.
+    """
+
+    def __init__(self, requests, window=1000):
+        self._requests = iter(requests)
+        self._window = window
+        self._positions = itertools.count()
+        # signature -> entry, for the incomplete requests
+        self._pending = {}
+        self._readers = _AddressIndex()
+        self._writers = _AddressIndex()
+        # Entries not yet handed out that nothing holds back, in order
+        self._ready = []
+        self._exhausted = False
+
+    def _fill(self):
+        while not self._exhausted and len(self._pending) < self._window:
+            request = next(self._requests, None)
+            if request is None:
+                self._exhausted = True
+            else:
+                self._add(request)
+
+    def _add(self, request):
+        entry = _Entry(next(self._positions), request)
+        inputs = request.header.inputs
+        outputs = request.header.outputs
+
+        # Every incomplete request is earlier than this one
+        blockers = set()
+        for address in inputs:
+            blockers.update(self._writers.overlapping(address))
+        for address in outputs:
+            blockers.update(self._writers.overlapping(address))
+            blockers.update(self._readers.overlapping(address))
+        for dependency in request.header.dependencies:
+            if dependency in self._pending:
+                blockers.add(self._pending[dependency])
+
+        for blocker in blockers:
+            blocker.blocks.append(entry)
+        entry.blocked_by = len(blockers)
+        if not blockers:
+            heapq.heappush(self._ready, entry)
+
+        self._pending[request.signature] = entry
+        for address in inputs:
+            self._readers.add(address, entry)
+        for address in outputs:
+            self._writers.add(address, entry)
+
+    def next_request(self):
+        """Returns the next request that can run, or None if there is none
+        until another completes, or none left at all."""
+        self._fill()
+
+        if not self._ready:
+            return None
+        return heapq.heappop(self._ready).request
+
+    def complete(self, request):
+        entry = self._pending.pop(request.signature, None)
+        if entry is None:
+            return
+
+        for address in entry.request.header.inputs:
+            self._readers.remove(address, entry)
+        for address in entry.request.header.outputs:
+            self._writers.remove(address, entry)
+
+        for blocked in entry.blocks:
+            blocked.blocked_by -= 1
+            if blocked.blocked_by == 0:
+                heapq.heappush(self._ready, blocked)
+
+    @property
+    def done(self):
+        return self._exhausted and not self._pending
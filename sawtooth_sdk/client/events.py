@@ -0,0 +1,308 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from concurrent.futures import CancelledError
+import logging
+import threading
+
+from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
+from sawtooth_sdk.messaging.future import FutureTimeoutError
+from sawtooth_sdk.messaging.stream import RECONNECT_EVENT
+from sawtooth_sdk.messaging.stream import Stream
+
+from sawtooth_sdk.client.exceptions import EventSubscriptionError
+
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import ClientBatchStatus
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchStatusRequest
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchStatusResponse
+from sawtooth_sdk.protobuf.client_event_pb2 import \
+    ClientEventsSubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 import \
+    ClientEventsSubscribeResponse
+from sawtooth_sdk.protobuf.client_event_pb2 import \
+    ClientEventsUnsubscribeRequest
+from sawtooth_sdk.protobuf.events_pb2 import EventList
+from sawtooth_sdk.protobuf.events_pb2 import EventSubscription
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+LOGGER = logging.getLogger(__name__)
+
+BLOCK_COMMIT = 'sawtooth/block-commit'
+
+# Batch statuses that will not change, which resolve a watch
+_FINAL_STATUSES = (ClientBatchStatus.COMMITTED, ClientBatchStatus.INVALID)
+
+
+class EventClient:
+    """Subscribes to events from a validator's client endpoint, and
+    resolves waiters on batches when they are committed, so that clients
+    need not poll the REST API for batch statuses.
+
+    Block commit events do not list the batches in a block, so on each one
+    the client asks the validator for the statuses of all watched batches
+    in a single request over the same connection. A watched batch that is
+    INVALID is therefore only reported after the next block is committed.
+    """
+
+    def __init__(self, url, subscriptions=None, on_event=None,
+                 request_timeout=10):
+        """
+        Args:
+            url (str): the validator's client endpoint, such as
+                tcp://localhost:4004
+            subscriptions (list of EventSubscription): events to receive
+                in addition to block commits
+            on_event (callable): called with each Event received, from the
+                client's receive thread
+            request_timeout (float): seconds to wait for the validator to
+                respond to each request
+
+        Raises:
+            EventSubscriptionError: if the validator rejects the
+                subscription or does not respond
+        """
+        self._stream = Stream(url)
+        self._subscriptions = \
+            [EventSubscription(event_type=BLOCK_COMMIT)] \
+            + list(subscriptions or [])
+        self._on_event = on_event
+        self._request_timeout = request_timeout
+
+        self._last_block_id = None
+        self._closed = False
+
+        # Callbacks for each watched batch id
+        self._watches = {}
+        self._lock = threading.Lock()
+
+        try:
+            self._subscribe()
+        except BaseException:
+            self._stream.close()
+            raise
+
+        self._thread = threading.Thread(
+            target=self._receive_events, name='EventClient', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def last_block_id(self):
+        """The id of the most recent block committed, if any has been since
+        subscribing."""
+        return self._last_block_id
+
+    def watch_batches(self, batch_ids, callback):
+        """Calls callback(batch_id, status) once for each batch, where
+        status is 'COMMITTED' or 'INVALID', as soon as that is known.
+        Callbacks run on the client's receive thread, or on this one if the
+        batch is already resolved, so they should not block.
+
+        Args:
+            batch_ids (list of str): the batches to watch
+            callback (callable): called with each batch id and its status
+        """
+        batch_ids = list(batch_ids)
+        with self._lock:
+            for batch_id in batch_ids:
+                self._watches.setdefault(batch_id, []).append(callback)
+
+        # Any that were committed before they were watched will have no
+        # block commit event to come
+        self._check_batches(batch_ids)
+
+    def unwatch_batches(self, batch_ids, callback):
+        """Stops calling callback for batches that have not resolved yet.
+        """
+        with self._lock:
+            for batch_id in batch_ids:
+                callbacks = self._watches.get(batch_id, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._watches.pop(batch_id, None)
+
+    def wait_for_batches(self, batch_ids, timeout=None):
+        """Blocks until every batch is committed or invalid, or until
+        timeout.
+
+        Args:
+            batch_ids (list of str): the batches to wait for
+            timeout (float): the most seconds to wait; no limit if not given
+
+        Returns:
+            dict: the status of each batch, 'PENDING' for those that had
+                not resolved when the timeout expired
+        """
+        batch_ids = list(batch_ids)
+        statuses = {batch_id: 'PENDING' for batch_id in batch_ids}
+        remaining = set(batch_ids)
+        resolved = threading.Event()
+        lock = threading.Lock()
+
+        def on_status(batch_id, status):
+            with lock:
+                statuses[batch_id] = status
+                remaining.discard(batch_id)
+                if not remaining:
+                    resolved.set()
+
+        if not batch_ids:
+            return statuses
+
+        self.watch_batches(batch_ids, on_status)
+        resolved.wait(
+            None if timeout is None else min(timeout, threading.TIMEOUT_MAX))
+        self.unwatch_batches(batch_ids, on_status)
+
+        with lock:
+            return dict(statuses)
+
+    def close(self):
+        """Unsubscribes from the validator and closes the connection."""
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            self._stream.send(
+                Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST,
+                ClientEventsUnsubscribeRequest().SerializeToString(),
+                timeout=self._request_timeout
+            ).result(self._request_timeout)
+        except (ValidatorConnectionError, FutureTimeoutError) as err:
+            LOGGER.debug('Failed to unsubscribe: %s', err)
+
+        self._stream.close()
+
+    def _subscribe(self):
+        request = ClientEventsSubscribeRequest(
+            subscriptions=self._subscriptions,
+            last_known_block_ids=[self._last_block_id]
+            if self._last_block_id else [])
+
+        future = self._stream.send(
+            Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+            request.SerializeToString(),
+            timeout=self._request_timeout)
+
+        response = ClientEventsSubscribeResponse()
+        try:
+            response.ParseFromString(
+                future.result(self._request_timeout).content)
+        except FutureTimeoutError as err:
+            raise EventSubscriptionError(
+                'Validator at {} did not respond to event '
+                'subscription'.format(self._stream.url)) from err
+
+        if response.status != ClientEventsSubscribeResponse.OK:
+            raise EventSubscriptionError(
+                'Failed to subscribe to events: {} {}'.format(
+                    ClientEventsSubscribeResponse.Status.Name(
+                        response.status),
+                    response.response_message))
+
+    def _receive_events(self):
+        while not self._closed:
+            try:
+                message = self._stream.receive().result()
+            except CancelledError:
+                # Raised when the stream cancels its tasks on disconnect or
+                # close
+                continue
+
+            if message is RECONNECT_EVENT:
+                self._resubscribe()
+            elif message.message_type == Message.CLIENT_EVENTS:
+                self._handle_events(message.content)
+            elif LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    'Ignoring message of type %s',
+                    Message.MessageType.Name(message.message_type))
+
+    def _resubscribe(self):
+        self._stream.wait_for_ready()
+        try:
+            self._subscribe()
+        except (EventSubscriptionError, ValidatorConnectionError) as err:
+            LOGGER.warning('Failed to resubscribe after reconnect: %s', err)
+            return
+
+        with self._lock:
+            batch_ids = list(self._watches)
+        self._check_batches(batch_ids)
+
+    def _handle_events(self, content):
+        event_list = EventList()
+        event_list.ParseFromString(content)
+
+        committed = False
+        for event in event_list.events:
+            if event.event_type == BLOCK_COMMIT:
+                committed = True
+                for attribute in event.attributes:
+                    if attribute.key == 'block_id':
+                        self._last_block_id = attribute.value
+
+            if self._on_event is not None:
+                self._on_event(event)
+
+        if committed:
+            with self._lock:
+                batch_ids = list(self._watches)
+            self._check_batches(batch_ids)
+
+    def _check_batches(self, batch_ids):
+        if not batch_ids:
+            return
+
+        try:
+            future = self._stream.send(
+                Message.CLIENT_BATCH_STATUS_REQUEST,
+                ClientBatchStatusRequest(
+                    batch_ids=batch_ids).SerializeToString(),
+                timeout=self._request_timeout)
+            response = ClientBatchStatusResponse()
+            response.ParseFromString(
+                future.result(self._request_timeout).content)
+        except (ValidatorConnectionError, FutureTimeoutError) as err:
+            LOGGER.warning('Failed to get batch statuses: %s', err)
+            return
+
+        if response.status != ClientBatchStatusResponse.OK:
+            LOGGER.warning(
+                'Failed to get batch statuses: %s',
+                ClientBatchStatusResponse.Status.Name(response.status))
+            return
+
+        for batch_status in response.batch_statuses:
+            if batch_status.status in _FINAL_STATUSES:
+                self._resolve(
+                    batch_status.batch_id,
+                    ClientBatchStatus.Status.Name(batch_status.status))
+
+    def _resolve(self, batch_id, status):
+        with self._lock:
+            callbacks = self._watches.pop(batch_id, [])
+
+        for callback in callbacks:
+            callback(batch_id, status)
@@ -0,0 +1,69 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+"""Helpers shared by clients of the REST API. Importing this module needs
+requests, which the rest of the SDK does not.
+"""
+
+from urllib.parse import urljoin
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(pool_size=10, retries=3):
+    """Creates a requests.Session that keeps up to `pool_size` connections
+    to the REST API alive for reuse.
+
+    Failed connection attempts are retried up to `retries` times with a
+    short backoff, as are idempotent requests (not batch submissions) that
+    get a 502, 503 or 504 response.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=pool_size,
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False))
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_paging_suffix(base_url, next_url):
+    """Converts a paging link returned by the REST API into a request suffix
+    relative to `base_url`, or None if there is no next page.
+
+    The link is resolved against `base_url`, so a relative link or one under
+    a path prefix that `base_url` has, such as http://host/sawtooth, keeps
+    that prefix. A link elsewhere, such as one naming the REST API's own
+    address behind a proxy, has its path and query taken as the suffix.
+    """
+    if not next_url:
+        return None
+
+    base_url = base_url.rstrip('/') + '/'
+    url = urljoin(base_url, next_url)
+    if url.startswith(base_url):
+        return url[len(base_url):]
+
+    parsed = urlparse(url)
+    return "{}?{}".format(parsed.path.lstrip('/'), parsed.query)
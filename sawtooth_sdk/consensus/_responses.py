@@ -0,0 +1,164 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""How ZmqService and AsyncZmqService build consensus requests and read
+the responses, shared so both services behave the same way."""
+
+import functools
+
+from sawtooth_sdk.consensus.service import Block
+from sawtooth_sdk.consensus import exceptions
+from sawtooth_sdk.protobuf import consensus_pb2
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+class _Response:
+    """How to read the response to one kind of request: its type, the
+    exceptions its failure statuses raise and how to get the result."""
+
+    def __init__(self, response_type, errors=None, result=None):
+        """
+        Args:
+            response_type (type): the response protobuf class
+            errors (dict): status name to a callable returning the
+                exception to raise; any other status but OK raises
+                ReceiveError
+            result (callable): takes the response and returns the result;
+                None is returned if not given
+        """
+        self._response_type = response_type
+        self._errors = {
+            getattr(response_type, name): error
+            for name, error in (errors or {}).items()
+        }
+        self._result = result
+
+    def handle(self, content):
+        """Parses the response bytes and returns the result.
+
+        Raises:
+            ConsensusException: if the response's status is not OK
+        """
+        response = self._response_type()
+        response.ParseFromString(content)
+
+        status = response.status
+
+        if status in self._errors:
+            raise self._errors[status]()
+
+        if status != self._response_type.OK:
+            raise exceptions.ReceiveError(
+                'Failed with status {}'.format(status))
+
+        return self._result(response) if self._result is not None else None
+
+
+def _state_error(message):
+    return functools.partial(exceptions.InvalidState, message)
+
+
+def _not_ready_error(message):
+    return functools.partial(exceptions.BlockNotReady, message)
+
+
+_UNKNOWN_BLOCK = {'UNKNOWN_BLOCK': exceptions.UnknownBlock}
+
+# Request message type to how its response is read
+RESPONSES = {
+    Message.CONSENSUS_SEND_TO_REQUEST: _Response(
+        consensus_pb2.ConsensusSendToResponse),
+    Message.CONSENSUS_BROADCAST_REQUEST: _Response(
+        consensus_pb2.ConsensusBroadcastResponse),
+    Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusInitializeBlockResponse,
+        errors={
+            'INVALID_STATE': _state_error(
+                'Cannot initialize block in current state'),
+            'UNKNOWN_BLOCK': exceptions.UnknownBlock,
+        }),
+    Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusSummarizeBlockResponse,
+        errors={
+            'INVALID_STATE': _state_error(
+                'Cannot summarize block in current state'),
+            'BLOCK_NOT_READY': _not_ready_error(
+                'Block not ready to be summarize'),
+        },
+        result=lambda response: response.summary),
+    Message.CONSENSUS_FINALIZE_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusFinalizeBlockResponse,
+        errors={
+            'INVALID_STATE': _state_error(
+                'Cannot finalize block in current state'),
+            'BLOCK_NOT_READY': _not_ready_error(
+                'Block not ready to be finalized'),
+        },
+        result=lambda response: response.block_id),
+    Message.CONSENSUS_CANCEL_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusCancelBlockResponse,
+        errors={
+            'INVALID_STATE': _state_error(
+                'Cannot cancel block in current state'),
+        }),
+    Message.CONSENSUS_CHECK_BLOCKS_REQUEST: _Response(
+        consensus_pb2.ConsensusCheckBlocksResponse,
+        errors=_UNKNOWN_BLOCK),
+    Message.CONSENSUS_COMMIT_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusCommitBlockResponse,
+        errors=_UNKNOWN_BLOCK),
+    Message.CONSENSUS_IGNORE_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusIgnoreBlockResponse,
+        errors=_UNKNOWN_BLOCK),
+    Message.CONSENSUS_FAIL_BLOCK_REQUEST: _Response(
+        consensus_pb2.ConsensusFailBlockResponse,
+        errors=_UNKNOWN_BLOCK),
+    Message.CONSENSUS_BLOCKS_GET_REQUEST: _Response(
+        consensus_pb2.ConsensusBlocksGetResponse,
+        errors=_UNKNOWN_BLOCK,
+        result=lambda response: {
+            block.block_id: Block(block)
+            for block in response.blocks
+        }),
+    Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST: _Response(
+        consensus_pb2.ConsensusChainHeadGetResponse,
+        errors={
+            'NO_CHAIN_HEAD': exceptions.NoChainHead,
+        },
+        result=lambda response: Block(response.block)),
+    Message.CONSENSUS_SETTINGS_GET_REQUEST: _Response(
+        consensus_pb2.ConsensusSettingsGetResponse,
+        errors=_UNKNOWN_BLOCK,
+        result=lambda response: {
+            entry.key: entry.value
+            for entry in response.entries
+        }),
+    Message.CONSENSUS_STATE_GET_REQUEST: _Response(
+        consensus_pb2.ConsensusStateGetResponse,
+        errors=_UNKNOWN_BLOCK,
+        result=lambda response: {
+            entry.address: entry.data
+            for entry in response.entries
+        }),
+}
+
+
+def initialize_block_request(previous_id):
+    return (
+        consensus_pb2.ConsensusInitializeBlockRequest(
+            previous_id=previous_id)
+        if previous_id
+        else consensus_pb2.ConsensusInitializeBlockRequest()
+    )
@@ -0,0 +1,153 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import asyncio
+
+from sawtooth_sdk.consensus._responses import RESPONSES
+from sawtooth_sdk.consensus._responses import initialize_block_request
+from sawtooth_sdk.messaging.future import FutureTimeoutError
+from sawtooth_sdk.protobuf import consensus_pb2
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+class AsyncZmqService:
+    '''Provides the same requests as ZmqService, but as coroutines.
+
+    Requests are handed to the stream without blocking, and the response
+    is delivered back to LOOP when it arrives, so an AsyncEngine can have
+    several requests outstanding at once. Responses are read in the same
+    way as by ZmqService.
+    '''
+
+    def __init__(self, stream, timeout, loop):
+        self._stream = stream
+        self._timeout = timeout
+        self._loop = loop
+
+    async def _send(self, message_type, request):
+        future = self._stream.send(
+            message_type=message_type,
+            content=request.SerializeToString(),
+            timeout=self._timeout)
+
+        waiter = self._loop.create_future()
+
+        def _resolve(result):
+            if not waiter.done():
+                waiter.set_result(result)
+
+        def _done(fut):
+            # The engine may have stopped, closing the loop, before the
+            # response arrived
+            if not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(_resolve, fut.result())
+
+        future.add_done_callback(_done)
+
+        try:
+            result = await asyncio.wait_for(waiter, self._timeout)
+        except asyncio.TimeoutError:
+            raise FutureTimeoutError(
+                'Future timed out waiting for response to {}'.format(
+                    Message.MessageType.Name(message_type))) from None
+
+        return RESPONSES[message_type].handle(result.content)
+
+    # -- P2P --
+
+    async def send_to(self, receiver_id, message_type, payload):
+        await self._send(
+            Message.CONSENSUS_SEND_TO_REQUEST,
+            consensus_pb2.ConsensusSendToRequest(
+                message_type=message_type,
+                content=payload,
+                receiver_id=receiver_id))
+
+    async def broadcast(self, message_type, payload):
+        await self._send(
+            Message.CONSENSUS_BROADCAST_REQUEST,
+            consensus_pb2.ConsensusBroadcastRequest(
+                message_type=message_type,
+                content=payload))
+
+    # -- Block Creation --
+
+    async def initialize_block(self, previous_id=None):
+        await self._send(
+            Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST,
+            initialize_block_request(previous_id))
+
+    async def summarize_block(self):
+        return await self._send(
+            Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST,
+            consensus_pb2.ConsensusSummarizeBlockRequest())
+
+    async def finalize_block(self, data):
+        return await self._send(
+            Message.CONSENSUS_FINALIZE_BLOCK_REQUEST,
+            consensus_pb2.ConsensusFinalizeBlockRequest(data=data))
+
+    async def cancel_block(self):
+        await self._send(
+            Message.CONSENSUS_CANCEL_BLOCK_REQUEST,
+            consensus_pb2.ConsensusCancelBlockRequest())
+
+    # -- Block Directives --
+
+    async def check_blocks(self, priority):
+        await self._send(
+            Message.CONSENSUS_CHECK_BLOCKS_REQUEST,
+            consensus_pb2.ConsensusCheckBlocksRequest(block_ids=priority))
+
+    async def commit_block(self, block_id):
+        await self._send(
+            Message.CONSENSUS_COMMIT_BLOCK_REQUEST,
+            consensus_pb2.ConsensusCommitBlockRequest(block_id=block_id))
+
+    async def ignore_block(self, block_id):
+        await self._send(
+            Message.CONSENSUS_IGNORE_BLOCK_REQUEST,
+            consensus_pb2.ConsensusIgnoreBlockRequest(block_id=block_id))
+
+    async def fail_block(self, block_id):
+        await self._send(
+            Message.CONSENSUS_FAIL_BLOCK_REQUEST,
+            consensus_pb2.ConsensusFailBlockRequest(block_id=block_id))
+
+    # -- Queries --
+
+    async def get_blocks(self, block_ids):
+        return await self._send(
+            Message.CONSENSUS_BLOCKS_GET_REQUEST,
+            consensus_pb2.ConsensusBlocksGetRequest(block_ids=block_ids))
+
+    async def get_chain_head(self):
+        return await self._send(
+            Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST,
+            consensus_pb2.ConsensusChainHeadGetRequest())
+
+    async def get_settings(self, block_id, settings):
+        return await self._send(
+            Message.CONSENSUS_SETTINGS_GET_REQUEST,
+            consensus_pb2.ConsensusSettingsGetRequest(
+                block_id=block_id,
+                keys=settings))
+
+    async def get_state(self, block_id, addresses):
+        return await self._send(
+            Message.CONSENSUS_STATE_GET_REQUEST,
+            consensus_pb2.ConsensusStateGetRequest(
+                block_id=block_id,
+                addresses=addresses))
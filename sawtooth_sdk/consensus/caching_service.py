@@ -0,0 +1,215 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from collections import OrderedDict
+from threading import RLock
+
+from sawtooth_sdk.consensus.service import Service
+
+
+# Marks a setting or address that the validator reported as unset, so that
+# repeated queries for it are answered from the cache as well.
+_UNSET = object()
+
+
+class _LruCache:
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        value = self._entries[key]
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def items(self):
+        return list(self._entries.items())
+
+    def evict(self, predicate):
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class CachingService(Service):
+    '''Wraps a Service and answers repeated queries from memory.
+
+    Blocks are immutable, so they are cached by ID. Settings and state are
+    fixed as of a given block, so they are cached by (block_id, key) and
+    (block_id, address). The chain head is cached until the next block
+    commit. Each cache holds at most max_size entries, evicting the least
+    recently used ones first, and block_commit() evicts entries for blocks
+    at or below the committed height, which belong either to the committed
+    chain or to abandoned forks.
+
+    All commands are passed straight through to the wrapped service.
+    '''
+
+    def __init__(self, service, max_size=1000):
+        self._service = service
+        self._lock = RLock()
+        self._blocks = _LruCache(max_size)
+        self._settings = _LruCache(max_size)
+        self._state = _LruCache(max_size)
+        self._chain_head = None
+        # Incremented on every commit, so a chain head fetched while a
+        # commit arrives is not cached
+        self._commits = 0
+
+    def block_commit(self, block_id):
+        '''Notify the cache that a block has been committed.
+
+        Args:
+            block_id (bytes)
+        '''
+        with self._lock:
+            self._chain_head = None
+            self._commits += 1
+
+            if block_id not in self._blocks:
+                return
+
+            block_num = self._blocks.get(block_id).block_num
+            stale = {
+                key for key, block in self._blocks.items()
+                if key != block_id and block.block_num <= block_num
+            }
+
+            self._blocks.evict(lambda key: key in stale)
+            self._settings.evict(lambda key: key[0] in stale)
+            self._state.evict(lambda key: key[0] in stale)
+
+    def clear(self):
+        '''Drop every cached entry.'''
+        with self._lock:
+            self._blocks.clear()
+            self._settings.clear()
+            self._state.clear()
+            self._chain_head = None
+
+    # -- P2P --
+
+    def send_to(self, receiver_id, message_type, payload):
+        self._service.send_to(receiver_id, message_type, payload)
+
+    def broadcast(self, message_type, payload):
+        self._service.broadcast(message_type, payload)
+
+    # -- Block Creation --
+
+    def initialize_block(self, previous_id=None):
+        self._service.initialize_block(previous_id)
+
+    def summarize_block(self):
+        return self._service.summarize_block()
+
+    def finalize_block(self, data):
+        return self._service.finalize_block(data)
+
+    def cancel_block(self):
+        self._service.cancel_block()
+
+    # -- Block Directives --
+
+    def check_blocks(self, priority):
+        self._service.check_blocks(priority)
+
+    def commit_block(self, block_id):
+        self._service.commit_block(block_id)
+
+    def ignore_block(self, block_id):
+        self._service.ignore_block(block_id)
+
+    def fail_block(self, block_id):
+        self._service.fail_block(block_id)
+
+    # -- Queries --
+
+    def get_blocks(self, block_ids):
+        with self._lock:
+            blocks = {
+                block_id: self._blocks.get(block_id)
+                for block_id in block_ids
+                if block_id in self._blocks
+            }
+
+        missing = [
+            block_id for block_id in block_ids if block_id not in blocks
+        ]
+        if missing:
+            fetched = self._service.get_blocks(missing)
+            with self._lock:
+                for block_id, block in fetched.items():
+                    self._blocks.put(block_id, block)
+            blocks.update(fetched)
+
+        return blocks
+
+    def get_chain_head(self):
+        with self._lock:
+            if self._chain_head is not None:
+                return self._chain_head
+            commits = self._commits
+
+        chain_head = self._service.get_chain_head()
+        with self._lock:
+            if commits == self._commits:
+                self._chain_head = chain_head
+            self._blocks.put(chain_head.block_id, chain_head)
+
+        return chain_head
+
+    def get_settings(self, block_id, settings):
+        return self._get_cached(
+            self._settings, self._service.get_settings, block_id, settings)
+
+    def get_state(self, block_id, addresses):
+        return self._get_cached(
+            self._state, self._service.get_state, block_id, addresses)
+
+    def _get_cached(self, cache, fetch, block_id, keys):
+        result = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                if (block_id, key) in cache:
+                    value = cache.get((block_id, key))
+                    if value is not _UNSET:
+                        result[key] = value
+                else:
+                    missing.append(key)
+
+        if missing:
+            fetched = fetch(block_id, missing)
+            with self._lock:
+                for key in missing:
+                    cache.put((block_id, key), fetched.get(key, _UNSET))
+            result.update(fetched)
+
+        return result
@@ -35,6 +35,9 @@ class Engine(metaclass=abc.ABCMeta):
         validator are sent along UPDATES. SERVICE is used to send
         requests to the validator.
 
+        Each update is a (message_type, data) tuple, or a list of them
+        if the driver was configured to deliver updates in batches.
+
         Args:
             updates (Queue)
             service (Service)
@@ -70,3 +73,25 @@ class Engine(metaclass=abc.ABCMeta):
             List of (string, string) tuples
         '''
         return []
+
+
+class AsyncEngine(Engine):
+    '''An engine whose start() is a coroutine. The driver runs it on an
+    event loop of its own, delivers notifications on an asyncio.Queue and
+    passes an AsyncZmqService, whose requests are coroutines, so the engine
+    can overlap requests to the validator without blocking.'''
+
+    # start() is meant to be a coroutine here
+    # pylint: disable=invalid-overridden-method
+    @abc.abstractmethod
+    async def start(self, updates, service, startup_state):
+        '''Called after the engine is initialized, when a connection to the
+        validator has been established. Notifications from the
+        validator are sent along UPDATES. SERVICE is used to send
+        requests to the validator.
+
+        Args:
+            updates (asyncio.Queue)
+            service (AsyncZmqService)
+            startup (StartupInfo)
+        '''
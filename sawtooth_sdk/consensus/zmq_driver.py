@@ -13,12 +13,16 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+import asyncio
 import concurrent
 import logging
 from queue import Queue
 from threading import Thread
 
+from sawtooth_sdk.consensus.async_zmq_service import AsyncZmqService
+from sawtooth_sdk.consensus.caching_service import CachingService
 from sawtooth_sdk.consensus.driver import Driver
+from sawtooth_sdk.consensus.engine import AsyncEngine
 from sawtooth_sdk.consensus.engine import StartupState
 from sawtooth_sdk.consensus.engine import PeerMessage
 from sawtooth_sdk.consensus.zmq_service import ZmqService
@@ -34,12 +38,43 @@ SERVICE_TIMEOUT = 300
 
 
 class ZmqDriver(Driver):
-    def __init__(self, engine):
+    def __init__(self, engine, batch_size=None, update_loop=None,
+                 cache_size=None):
+        """
+        Args:
+            engine (Engine): the consensus engine to drive
+            batch_size (int, optional): when set, every notification that is
+                available (up to batch_size) is drained from the validator
+                at once, acknowledged with a single hand-off to the stream,
+                and put on the updates queue as one list of
+                (message_type, data) tuples
+            update_loop (asyncio.AbstractEventLoop, optional): when set,
+                updates are delivered on an asyncio.Queue bound to this loop
+                instead of a queue.Queue
+            cache_size (int, optional): when set, the engine's service
+                caches blocks, settings and state, holding at most this many
+                entries of each, and is told about every block commit; only
+                supported with a synchronous Engine
+
+        An AsyncEngine is run on update_loop, or on a new event loop if none
+        is given, which is closed once the engine has stopped, and is passed
+        an AsyncZmqService.
+
+        Raises:
+            ValueError: if cache_size is given with an AsyncEngine
+        """
+        if cache_size is not None and isinstance(engine, AsyncEngine):
+            raise ValueError('cache_size is not supported with an AsyncEngine')
         super().__init__(engine)
         self._engine = engine
         self._stream = None
         self._exit = False
         self._updates = None
+        self._batch_size = batch_size
+        self._update_loop = update_loop
+        self._owns_loop = False
+        self._cache_size = cache_size
+        self._cache = None
 
     def start(self, endpoint):
         self._stream = Stream(endpoint)
@@ -52,25 +87,64 @@ class ZmqDriver(Driver):
         if startup_state is None:
             startup_state = self._wait_until_active()
 
-        self._updates = Queue()
+        if isinstance(self._engine, AsyncEngine) \
+                and self._update_loop is None:
+            self._update_loop = asyncio.new_event_loop()
+            self._owns_loop = True
+
+        if self._update_loop is None:
+            self._updates = Queue()
+        else:
+            self._updates = asyncio.Queue(loop=self._update_loop)
 
         driver_thread = Thread(
-            target=self._driver_loop)
+            target=self._driver_loop
+            if self._batch_size is None
+            else self._batched_driver_loop)
         driver_thread.start()
 
         try:
-            self._engine.start(
-                self._updates,
-                ZmqService(
-                    stream=self._stream,
-                    timeout=SERVICE_TIMEOUT),
-                startup_state)
+            if isinstance(self._engine, AsyncEngine):
+                self._start_async_engine(startup_state)
+            else:
+                self._start_engine(startup_state)
         except Exception:  # pylint: disable=broad-except
             LOGGER.exception("Uncaught engine exception")
 
         self.stop()
         driver_thread.join()
 
+        if self._owns_loop:
+            asyncio.set_event_loop(None)
+            self._update_loop.close()
+
+    def _start_engine(self, startup_state):
+        service = ZmqService(
+            stream=self._stream,
+            timeout=SERVICE_TIMEOUT)
+
+        if self._cache_size is not None:
+            self._cache = CachingService(service, max_size=self._cache_size)
+            service = self._cache
+
+        self._engine.start(
+            self._updates,
+            service,
+            startup_state)
+
+    def _start_async_engine(self, startup_state):
+        service = AsyncZmqService(
+            stream=self._stream,
+            timeout=SERVICE_TIMEOUT,
+            loop=self._update_loop)
+
+        asyncio.set_event_loop(self._update_loop)
+        self._update_loop.run_until_complete(
+            self._engine.start(
+                self._updates,
+                service,
+                startup_state))
+
     def _driver_loop(self):
         try:
             future = self._stream.receive()
@@ -90,7 +164,7 @@ class ZmqDriver(Driver):
                     if result[0] == Message.PING_REQUEST:
                         continue
 
-                    self._updates.put(result)
+                    self._put_update(result)
 
                 except exceptions.ReceiveError as err:
                     LOGGER.warning("%s", err)
@@ -98,6 +172,53 @@ class ZmqDriver(Driver):
         except Exception:  # pylint: disable=broad-except
             LOGGER.exception("Uncaught driver exception")
 
+    def _batched_driver_loop(self):
+        try:
+            future = self._stream.receive_batch(self._batch_size)
+            while True:
+                if self._exit:
+                    self._engine.stop()
+                    break
+
+                try:
+                    messages = future.result(1)
+                    future = self._stream.receive_batch(self._batch_size)
+                except concurrent.futures.TimeoutError:
+                    continue
+
+                updates = []
+                acks = []
+                for message in messages:
+                    try:
+                        result = self._parse(message)
+                    except exceptions.ReceiveError as err:
+                        LOGGER.warning("%s", err)
+                        continue
+
+                    acks.append((
+                        Message.CONSENSUS_NOTIFY_ACK,
+                        message.correlation_id,
+                        consensus_pb2.ConsensusNotifyAck()
+                                     .SerializeToString()))
+
+                    # if message was a ping ignore
+                    if result[0] != Message.PING_REQUEST:
+                        updates.append(result)
+
+                self._stream.send_back_batch(acks)
+
+                if updates:
+                    self._put_update(updates)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Uncaught driver exception")
+
+    def _put_update(self, update):
+        if self._update_loop is None:
+            self._updates.put(update)
+        else:
+            self._update_loop.call_soon_threadsafe(
+                self._updates.put_nowait, update)
+
     def stop(self):
         self._exit = True
         self._engine.stop()
@@ -182,6 +303,16 @@ class ZmqDriver(Driver):
             future = self._stream.receive()
 
     def _process(self, message):
+        type_tag, data = self._parse(message)
+
+        self._stream.send_back(
+            message_type=Message.CONSENSUS_NOTIFY_ACK,
+            correlation_id=message.correlation_id,
+            content=consensus_pb2.ConsensusNotifyAck().SerializeToString())
+
+        return type_tag, data
+
+    def _parse(self, message):
         type_tag = message.message_type
 
         if type_tag == Message.CONSENSUS_NOTIFY_PEER_CONNECTED:
@@ -235,6 +366,9 @@ class ZmqDriver(Driver):
 
             data = notification.block_id
 
+            if self._cache is not None:
+                self._cache.block_commit(data)
+
         elif type_tag == Message.CONSENSUS_NOTIFY_ENGINE_DEACTIVATED:
             self.stop()
             data = None
@@ -246,9 +380,4 @@ class ZmqDriver(Driver):
             raise exceptions.ReceiveError(
                 'Received unexpected message type: {}'.format(type_tag))
 
-        self._stream.send_back(
-            message_type=Message.CONSENSUS_NOTIFY_ACK,
-            correlation_id=message.correlation_id,
-            content=consensus_pb2.ConsensusNotifyAck().SerializeToString())
-
         return type_tag, data
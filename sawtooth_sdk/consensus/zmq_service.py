@@ -14,8 +14,8 @@
 # -----------------------------------------------------------------------------
 
 from sawtooth_sdk.consensus.service import Service
-from sawtooth_sdk.consensus.service import Block
-from sawtooth_sdk.consensus import exceptions
+from sawtooth_sdk.consensus._responses import RESPONSES
+from sawtooth_sdk.consensus._responses import initialize_block_request
 from sawtooth_sdk.protobuf import consensus_pb2
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
@@ -25,323 +25,98 @@ class ZmqService(Service):
         self._stream = stream
         self._timeout = timeout
 
-    def _send(self, request, message_type, response_type):
-        response_bytes = self._stream.send(
+    def _send(self, message_type, request):
+        content = self._stream.send(
             message_type=message_type,
             content=request.SerializeToString(),
+            timeout=self._timeout,
         ).result(self._timeout).content
 
-        response = response_type()
-        response.ParseFromString(response_bytes)
-
-        return response
+        return RESPONSES[message_type].handle(content)
 
     # -- P2P --
 
     def send_to(self, receiver_id, message_type, payload):
-        request = consensus_pb2.ConsensusSendToRequest(
-            message_type=message_type,
-            content=payload,
-            receiver_id=receiver_id)
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_SEND_TO_REQUEST,
-            response_type=consensus_pb2.ConsensusSendToResponse)
-
-        if response.status != consensus_pb2.ConsensusSendToResponse.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(response.status))
+        self._send(
+            Message.CONSENSUS_SEND_TO_REQUEST,
+            consensus_pb2.ConsensusSendToRequest(
+                message_type=message_type,
+                content=payload,
+                receiver_id=receiver_id))
 
     def broadcast(self, message_type, payload):
-        request = consensus_pb2.ConsensusBroadcastRequest(
-            message_type=message_type,
-            content=payload)
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_BROADCAST_REQUEST,
-            response_type=consensus_pb2.ConsensusBroadcastResponse)
-
-        if response.status != consensus_pb2.ConsensusBroadcastResponse.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(response.status))
+        self._send(
+            Message.CONSENSUS_BROADCAST_REQUEST,
+            consensus_pb2.ConsensusBroadcastRequest(
+                message_type=message_type,
+                content=payload))
 
     # -- Block Creation --
 
     def initialize_block(self, previous_id=None):
-        request = (
-            consensus_pb2.ConsensusInitializeBlockRequest(
-                previous_id=previous_id)
-            if previous_id
-            else consensus_pb2.ConsensusInitializeBlockRequest()
-        )
-
-        response_type = consensus_pb2.ConsensusInitializeBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.INVALID_STATE:
-            raise exceptions.InvalidState(
-                'Cannot initialize block in current state')
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
+        self._send(
+            Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST,
+            initialize_block_request(previous_id))
 
     def summarize_block(self):
-        request = consensus_pb2.ConsensusSummarizeBlockRequest()
-
-        response_type = consensus_pb2.ConsensusSummarizeBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.INVALID_STATE:
-            raise exceptions.InvalidState(
-                'Cannot summarize block in current state')
-
-        if status == response_type.BLOCK_NOT_READY:
-            raise exceptions.BlockNotReady(
-                'Block not ready to be summarize')
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
-
-        return response.summary
+        return self._send(
+            Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST,
+            consensus_pb2.ConsensusSummarizeBlockRequest())
 
     def finalize_block(self, data):
-        request = consensus_pb2.ConsensusFinalizeBlockRequest(data=data)
-
-        response_type = consensus_pb2.ConsensusFinalizeBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_FINALIZE_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.INVALID_STATE:
-            raise exceptions.InvalidState(
-                'Cannot finalize block in current state')
-
-        if status == response_type.BLOCK_NOT_READY:
-            raise exceptions.BlockNotReady(
-                'Block not ready to be finalized')
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
-
-        return response.block_id
+        return self._send(
+            Message.CONSENSUS_FINALIZE_BLOCK_REQUEST,
+            consensus_pb2.ConsensusFinalizeBlockRequest(data=data))
 
     def cancel_block(self):
-        request = consensus_pb2.ConsensusCancelBlockRequest()
-
-        response_type = consensus_pb2.ConsensusCancelBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_CANCEL_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.INVALID_STATE:
-            raise exceptions.InvalidState(
-                'Cannot cancel block in current state')
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
+        self._send(
+            Message.CONSENSUS_CANCEL_BLOCK_REQUEST,
+            consensus_pb2.ConsensusCancelBlockRequest())
 
     # -- Block Directives --
 
     def check_blocks(self, priority):
-        request = consensus_pb2.ConsensusCheckBlocksRequest(block_ids=priority)
-
-        response_type = consensus_pb2.ConsensusCheckBlocksResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_CHECK_BLOCKS_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
+        self._send(
+            Message.CONSENSUS_CHECK_BLOCKS_REQUEST,
+            consensus_pb2.ConsensusCheckBlocksRequest(block_ids=priority))
 
     def commit_block(self, block_id):
-        request = consensus_pb2.ConsensusCommitBlockRequest(block_id=block_id)
-
-        response_type = consensus_pb2.ConsensusCommitBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_COMMIT_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
+        self._send(
+            Message.CONSENSUS_COMMIT_BLOCK_REQUEST,
+            consensus_pb2.ConsensusCommitBlockRequest(block_id=block_id))
 
     def ignore_block(self, block_id):
-        request = consensus_pb2.ConsensusIgnoreBlockRequest(block_id=block_id)
-
-        response_type = consensus_pb2.ConsensusIgnoreBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_IGNORE_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
+        self._send(
+            Message.CONSENSUS_IGNORE_BLOCK_REQUEST,
+            consensus_pb2.ConsensusIgnoreBlockRequest(block_id=block_id))
 
     def fail_block(self, block_id):
-        request = consensus_pb2.ConsensusFailBlockRequest(block_id=block_id)
-
-        response_type = consensus_pb2.ConsensusFailBlockResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_FAIL_BLOCK_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
+        self._send(
+            Message.CONSENSUS_FAIL_BLOCK_REQUEST,
+            consensus_pb2.ConsensusFailBlockRequest(block_id=block_id))
 
     # -- Queries --
 
     def get_blocks(self, block_ids):
-        request = consensus_pb2.ConsensusBlocksGetRequest(block_ids=block_ids)
-
-        response_type = consensus_pb2.ConsensusBlocksGetResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_BLOCKS_GET_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
-
-        return {
-            block.block_id: Block(block)
-            for block in response.blocks
-        }
+        return self._send(
+            Message.CONSENSUS_BLOCKS_GET_REQUEST,
+            consensus_pb2.ConsensusBlocksGetRequest(block_ids=block_ids))
 
     def get_chain_head(self):
-        request = consensus_pb2.ConsensusChainHeadGetRequest()
-
-        response_type = consensus_pb2.ConsensusChainHeadGetResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.NO_CHAIN_HEAD:
-            raise exceptions.NoChainHead()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
-
-        return Block(response.block)
+        return self._send(
+            Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST,
+            consensus_pb2.ConsensusChainHeadGetRequest())
 
     def get_settings(self, block_id, settings):
-        request = consensus_pb2.ConsensusSettingsGetRequest(
-            block_id=block_id,
-            keys=settings)
-
-        response_type = consensus_pb2.ConsensusSettingsGetResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_SETTINGS_GET_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
-
-        return {
-            entry.key: entry.value
-            for entry in response.entries
-        }
+        return self._send(
+            Message.CONSENSUS_SETTINGS_GET_REQUEST,
+            consensus_pb2.ConsensusSettingsGetRequest(
+                block_id=block_id,
+                keys=settings))
 
     def get_state(self, block_id, addresses):
-        request = consensus_pb2.ConsensusStateGetRequest(
-            block_id=block_id,
-            addresses=addresses)
-
-        response_type = consensus_pb2.ConsensusStateGetResponse
-
-        response = self._send(
-            request=request,
-            message_type=Message.CONSENSUS_STATE_GET_REQUEST,
-            response_type=response_type)
-
-        status = response.status
-
-        if status == response_type.UNKNOWN_BLOCK:
-            raise exceptions.UnknownBlock()
-
-        if status != response_type.OK:
-            raise exceptions.ReceiveError(
-                'Failed with status {}'.format(status))
-
-        return {
-            entry.address: entry.data
-            for entry in response.entries
-        }
+        return self._send(
+            Message.CONSENSUS_STATE_GET_REQUEST,
+            consensus_pb2.ConsensusStateGetRequest(
+                block_id=block_id,
+                addresses=addresses))
@@ -21,11 +21,28 @@ class ValidatorConnectionError(Exception):
         super().__init__("the connection to the validator was lost")
 
 
+class StreamFullError(ValidatorConnectionError):
+    """Raised by Stream when a message cannot be sent within the Stream's
+    limits on pending requests or queued bytes. It is a
+    ValidatorConnectionError, so code that handles a lost connection
+    drops the work in the same way."""
+
+    def __init__(self, reason):
+        super().__init__()
+        self.args = ("the stream to the validator is full: " + reason,)
+
+
 class WorkloadConfigurationError(Exception):
     def __init__(self):
         super().__init__("A workload object is not set.")
 
 
+class WorkloadConnectionError(Exception):
+    def __init__(self, url):
+        super().__init__("Unable to reach the validator at {}".format(url))
+        self.url = url
+
+
 # ValidatorVersionError is used internal to the sdk, and
 # any other use can cause undesirable or unexpected behavior.
 class ValidatorVersionError(Exception):
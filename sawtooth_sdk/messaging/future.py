@@ -13,6 +13,7 @@
 # limitations under the License.
 # ------------------------------------------------------------------------------
 
+import logging
 from threading import Condition
 from threading import RLock
 
@@ -20,6 +21,9 @@ from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
 from sawtooth_sdk.protobuf import validator_pb2
 
 
+LOGGER = logging.getLogger(__name__)
+
+
 class FutureResult:
     def __init__(self, message_type, content):
         self.message_type = message_type
@@ -42,31 +46,84 @@ class FutureError:
         raise ValidatorConnectionError()
 
 
+class FutureTimedOut:
+    """Used when resolving a future whose response did not arrive in
+    time. Raises FutureTimeoutError when accessing attributes, as
+    Future.result does when its own timeout passes.
+    """
+
+    def __init__(self, request_type=None):
+        self._request_type = request_type
+
+    def _raise(self):
+        raise FutureTimeoutError(
+            'Future timed out waiting for response to {}'.format(
+                _type_name(self._request_type)))
+
+    @property
+    def content(self):
+        self._raise()
+
+    @property
+    def message_type(self):
+        self._raise()
+
+
+def _type_name(message_type):
+    return validator_pb2.Message.MessageType.Name(message_type) \
+        if message_type else None
+
+
 class Future:
     def __init__(self, correlation_id, request_type=None):
         self.correlation_id = correlation_id
         self._result = None
         self._condition = Condition()
         self._request_type = request_type
+        self._callbacks = []
+
+    @property
+    def request_type(self):
+        return self._request_type
 
     def done(self):
         return self._result is not None
 
+    def add_done_callback(self, callback):
+        """Arrange for callback to be called with this future once its
+        result is set. If the result is already set, callback is called
+        immediately. Callbacks run on the thread that sets the result, so
+        they should not block. An exception raised by a callback is logged
+        rather than passed to whoever set the result.
+
+        Args:
+            callback (callable): takes the future as its only argument
+        """
+        with self._condition:
+            if self._result is None:
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
     def result(self, timeout=None):
         with self._condition:
             if self._result is None:
                 if not self._condition.wait(timeout):
-                    message_type = validator_pb2.Message.MessageType.Name(
-                        self._request_type) if self._request_type else None
                     raise FutureTimeoutError(
                         'Future timed out waiting for response to {}'.format(
-                            message_type))
+                            _type_name(self._request_type)))
         return self._result
 
     def set_result(self, result):
         with self._condition:
             self._result = result
             self._condition.notify()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('Future done callback failed')
 
 
 class FutureCollectionKeyError(Exception):
@@ -108,3 +165,7 @@ class FutureCollection:
     def future_values(self):
         with self._lock:
             return self._futures.values()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._futures)
@@ -14,10 +14,17 @@
 # ------------------------------------------------------------------------------
 
 import asyncio
-import uuid
+from collections import deque
+from collections import namedtuple
+from collections import OrderedDict
+import concurrent.futures
+import functools
+import heapq
 import logging
+import os
 from queue import Queue
 from threading import Event
+from threading import Lock
 from threading import Thread
 from threading import Condition
 
@@ -26,12 +33,14 @@ import zmq.asyncio
 
 from sawtooth_sdk.protobuf import validator_pb2
 
+from sawtooth_sdk.messaging.exceptions import StreamFullError
 from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
 from sawtooth_sdk.messaging.future import Future
 from sawtooth_sdk.messaging.future import FutureCollection
 from sawtooth_sdk.messaging.future import FutureCollectionKeyError
 from sawtooth_sdk.messaging.future import FutureResult
 from sawtooth_sdk.messaging.future import FutureError
+from sawtooth_sdk.messaging.future import FutureTimedOut
 
 LOGGER = logging.getLogger(__file__)
 
@@ -43,8 +52,199 @@ RECONNECT_EVENT = -1
 _NO_ERROR = -1
 
 
+class ReconnectEvent:
+    """Received from a Stream with several connections in place of
+    RECONNECT_EVENT, naming the connection that reconnected, so that only
+    it needs to register again.
+
+    Attributes:
+        connection (int): the index of the connection
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+
+# How many expired correlation ids to remember, so that late responses to
+# them are dropped rather than received as requests
+_EXPIRED_MEMORY = 1024
+
+
 def _generate_id():
-    return uuid.uuid4().hex.encode()
+    return os.urandom(16).hex().encode()
+
+
+# A validator_pb2.Message ready to write to the socket, with the fields
+# the I/O thread needs to track it
+_OutboundMessage = namedtuple(
+    '_OutboundMessage', ['message_type', 'correlation_id', 'data'])
+
+# Wire format tags of the validator_pb2.Message fields: the field number
+# shifted left by three, plus the wire type (0 varint, 2 length delimited)
+_MESSAGE_TYPE_TAG = b'\x08'
+_CORRELATION_ID_TAG = b'\x12'
+_CONTENT_TAG = b'\x1a'
+
+
+def _varint(value):
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return encoded
+
+
+def _encode_message(message_type, correlation_id, content):
+    """Serializes a validator_pb2.Message, giving the same bytes as
+    SerializeToString, but writing the envelope fields directly so the
+    content is copied only once, into the frame sent to the socket,
+    rather than into the Message and again out of it.
+
+    Returns:
+        _OutboundMessage
+    """
+    header = bytearray()
+    if message_type:
+        header += _MESSAGE_TYPE_TAG
+        header += _varint(message_type)
+    if correlation_id:
+        encoded_id = correlation_id.encode()
+        header += _CORRELATION_ID_TAG
+        header += _varint(len(encoded_id))
+        header += encoded_id
+    if content:
+        header += _CONTENT_TAG
+        header += _varint(len(content))
+        data = b''.join((header, content))
+    else:
+        data = bytes(header)
+    return _OutboundMessage(message_type, correlation_id, data)
+
+
+class StreamLimits:
+    """Limits on the work a Stream holds for a slow validator.
+
+    Args:
+        max_pending (int): the most requests awaiting a response at once
+        max_queued_bytes (int): the most bytes of messages waiting to be
+            written to the sockets. A single message larger than this is
+            still sent once nothing else is queued.
+        send_timeout (float): seconds a send waits for room before raising
+            StreamFullError; 0 to raise at once, None to wait indefinitely
+        max_inbound (int): the number of received messages waiting for
+            receive() at which a connection stops reading from its socket,
+            leaving the validator to hold further messages. Reading carries
+            on while the connection has requests awaiting responses.
+    """
+
+    def __init__(self, max_pending=None, max_queued_bytes=None,
+                 send_timeout=None, max_inbound=None):
+        self.max_pending = max_pending
+        self.max_queued_bytes = max_queued_bytes
+        self.send_timeout = send_timeout
+        self.max_inbound = max_inbound
+
+
+class ReconnectPolicy:
+    """How a Stream reconnects after losing the validator.
+
+    Args:
+        initial_interval (float): seconds before retrying a connection
+            attempt that failed
+        max_interval (float): the most seconds between attempts; the
+            interval doubles after each failed attempt up to this
+        replay_reads (bool): keep the state reads that were awaiting a
+            response when the connection dropped, and send them again once
+            it is back, rather than failing them. This only helps if the
+            validator kept the transaction's context, as it does over a
+            network interruption but not over a restart.
+    """
+
+    def __init__(self, initial_interval=0.02, max_interval=1.0,
+                 replay_reads=False):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.replay_reads = replay_reads
+
+
+# Requests that are safe to send again after a reconnect
+_REPLAYABLE_TYPES = frozenset([validator_pb2.Message.TP_STATE_GET_REQUEST])
+
+
+class _FlowControl:
+    """Counts a Stream's pending requests and queued bytes against its
+    StreamLimits, making senders wait for room."""
+
+    def __init__(self, limits, connections):
+        self._limits = limits
+        self._condition = Condition()
+        self._pending = 0
+        self._queued_bytes = [0] * connections
+        self.blocked = 0
+        self.rejected = 0
+
+    @property
+    def queued_bytes(self):
+        return sum(self._queued_bytes)
+
+    def _full(self, size, request):
+        limits = self._limits
+        if request and limits.max_pending is not None \
+                and self._pending >= limits.max_pending:
+            return 'max_pending'
+        queued = sum(self._queued_bytes)
+        if limits.max_queued_bytes is not None and queued \
+                and queued + size > limits.max_queued_bytes:
+            return 'max_queued_bytes'
+        return None
+
+    def acquire(self, index, size, request):
+        """Waits for room to queue a message of `size` bytes on connection
+        `index`, counting it as a pending request if `request`.
+
+        Raises:
+            StreamFullError: if there is no room within the send_timeout
+        """
+        with self._condition:
+            reason = self._full(size, request)
+            if reason is not None:
+                self.blocked += 1
+                if self._limits.send_timeout != 0:
+                    self._condition.wait_for(
+                        lambda: self._full(size, request) is None,
+                        self._limits.send_timeout)
+                    reason = self._full(size, request)
+                if reason is not None:
+                    self.rejected += 1
+                    raise StreamFullError(reason)
+            self._queued_bytes[index] += size
+            if request:
+                self._pending += 1
+
+    def sent(self, index, size):
+        with self._condition:
+            self._queued_bytes[index] -= size
+            self._condition.notify_all()
+
+    def unqueued(self, index, size):
+        """Gives back the bytes of a message that was never queued. They may
+        already be forgotten, if the connection was dropped meanwhile."""
+        with self._condition:
+            self._queued_bytes[index] = max(
+                0, self._queued_bytes[index] - size)
+            self._condition.notify_all()
+
+    def dropped(self, index):
+        """Forgets the messages queued on a connection that was lost."""
+        with self._condition:
+            self._queued_bytes[index] = 0
+            self._condition.notify_all()
+
+    def responded(self, _future=None):
+        with self._condition:
+            self._pending -= 1
+            self._condition.notify_all()
 
 
 class _SendReceiveThread(Thread):
@@ -52,7 +252,9 @@ class _SendReceiveThread(Thread):
     Internal thread to Stream class that runs the asyncio event loop.
     """
 
-    def __init__(self, url, futures, ready_event, error_queue):
+    def __init__(self, url, futures, ready_event, error_queue, deliver=None,
+                 inbound_size=None, max_inbound=None, on_sent=None,
+                 on_dropped=None, reconnect=None):
         """constructor for background thread
 
         :param url (str): the address to connect to the validator on
@@ -61,6 +263,19 @@ class _SendReceiveThread(Thread):
         :param ready_event (threading.Event): used to notify waiting/asking
                classes that the background thread of Stream is ready after
                a disconnect event.
+        :param deliver (callable): called with each message that is not a
+               response, and RECONNECT_EVENT, instead of queueing them for
+               get_message
+        :param inbound_size (callable): returns the number of delivered
+               messages not yet received, if not the recv_queue's size
+        :param max_inbound (int): the inbound size at which to stop reading
+               the socket while no responses are awaited
+        :param on_sent (callable): called with the size of each message
+               written to the socket
+        :param on_dropped (callable): called when the messages still queued
+               are dropped on a disconnect
+        :param reconnect (ReconnectPolicy): the reconnect timing, and
+               whether to replay state reads
         """
         super().__init__()
         self._futures = futures
@@ -75,6 +290,22 @@ class _SendReceiveThread(Thread):
         self._context = None
         self._ready_event = ready_event
         self._error_queue = error_queue
+        self._deliver = deliver
+        self._inbound_size = inbound_size
+        self._max_inbound = max_inbound
+        self._inbound_space = None
+        self._on_sent = on_sent
+        self._on_dropped = on_dropped
+        self._reconnect = reconnect or ReconnectPolicy()
+        # Serialized replayable requests awaiting a response, by
+        # correlation id
+        self._in_flight = {}
+        # (loop time, correlation id) of the requests sent with a timeout,
+        # and the timer for the earliest; only used on the event loop
+        self._deadlines = []
+        self._expiry = None
+        self._expired = OrderedDict()
+        self.timeouts = 0
         self._condition = Condition()
         self.identity = _generate_id()[0:16]
 
@@ -96,11 +327,44 @@ class _SendReceiveThread(Thread):
                     FutureResult(message_type=message.message_type,
                                  content=message.content))
                 self._futures.remove(message.correlation_id)
+                if self._in_flight:
+                    self._in_flight.pop(message.correlation_id, None)
             except FutureCollectionKeyError:
+                if self._expired.pop(message.correlation_id, False):
+                    LOGGER.debug("dropping late response to %s",
+                                 message.correlation_id)
+                    continue
                 # if we are getting an initial message, not a response
                 if not self._ready_event.is_set():
                     break
-                self._recv_queue.put_nowait(message)
+                if self._deliver is not None:
+                    self._deliver(message)
+                else:
+                    self._recv_queue.put_nowait(message)
+                if self._max_inbound is not None:
+                    yield from self._wait_for_inbound_space()
+
+    @asyncio.coroutine
+    def _wait_for_inbound_space(self):
+        """Stops reading while too many received messages are waiting for
+        receive(), unless responses are awaited, which must be read for
+        the receiver to make progress."""
+        while True:
+            self._inbound_space.clear()
+            size = self._recv_queue.qsize() if self._inbound_size is None \
+                else self._inbound_size()
+            if size < self._max_inbound or len(self._futures) > 0:
+                return
+            # pylint: disable=not-an-iterable
+            yield from self._inbound_space.wait()
+
+    def notify_inbound_space(self):
+        """Wakes the reader after messages were received, or a request was
+        sent, from another thread."""
+        loop = self._event_loop
+        space = self._inbound_space
+        if loop is not None and space is not None:
+            loop.call_soon_threadsafe(space.set)
 
     @asyncio.coroutine
     def _send_message(self):
@@ -111,15 +375,90 @@ class _SendReceiveThread(Thread):
             if not self._ready_event.is_set():
                 break
             msg = yield from self._send_queue.get()
-            yield from self._sock.send_multipart([msg.SerializeToString()])
+            yield from self._write(msg)
+            # Flush anything else that was queued alongside it before
+            # yielding back to the event loop
+            while not self._send_queue.empty():
+                yield from self._write(self._send_queue.get_nowait())
+
+    @asyncio.coroutine
+    def _write(self, msg):
+        if self._reconnect.replay_reads \
+                and msg.message_type in _REPLAYABLE_TYPES:
+            self._in_flight[msg.correlation_id] = msg.data
+        # zmq takes large frames by reference rather than copying them
+        yield from self._sock.send_multipart([msg.data], copy=False)
+        if self._on_sent is not None:
+            self._on_sent(len(msg.data))
+
+    @asyncio.coroutine
+    def _replay_in_flight(self):
+        """Sends the replayable requests that were awaiting a response when
+        the connection dropped."""
+        LOGGER.debug("replaying %s requests", len(self._in_flight))
+        for data in list(self._in_flight.values()):
+            yield from self._sock.send_multipart([data])
 
     @asyncio.coroutine
-    def _put_message(self, message):
+    def _put_message(self, message, timeout=None):
         """
         Puts a message on the send_queue. Not to be accessed directly.
-        :param message: protobuf generated validator_pb2.Message
+        :param message: _OutboundMessage
+        :param timeout (float): seconds after which to expire the
+               message's future
         """
+        if timeout is not None:
+            self._add_deadline(message.correlation_id, timeout)
         self._send_queue.put_nowait(message)
+        if self._inbound_space is not None:
+            self._inbound_space.set()
+
+    def _add_deadline(self, correlation_id, timeout):
+        deadline = (self._event_loop.time() + timeout, correlation_id)
+        heapq.heappush(self._deadlines, deadline)
+        if self._deadlines[0] is deadline:
+            self._schedule_expiry()
+
+    def _schedule_expiry(self):
+        if self._expiry is not None:
+            self._expiry.cancel()
+            self._expiry = None
+        if self._deadlines:
+            self._expiry = self._event_loop.call_at(
+                self._deadlines[0][0], self._expire_futures)
+
+    def _expire_futures(self):
+        """Fails the futures whose deadlines have passed with
+        FutureTimedOut and forgets them. Deadlines of requests that were
+        answered are dropped as they come up."""
+        self._expiry = None
+        now = self._event_loop.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, correlation_id = heapq.heappop(self._deadlines)
+            try:
+                future = self._futures.get(correlation_id)
+                self._futures.remove(correlation_id)
+            except FutureCollectionKeyError:
+                continue
+            self._in_flight.pop(correlation_id, None)
+            self._expired[correlation_id] = True
+            if len(self._expired) > _EXPIRED_MEMORY:
+                self._expired.popitem(last=False)
+            self.timeouts += 1
+            future.set_result(FutureTimedOut(future.request_type))
+        self._schedule_expiry()
+
+    @asyncio.coroutine
+    def _put_messages(self, messages):
+        """
+        Puts several messages on the send_queue in one pass of the event
+        loop. Not to be accessed directly.
+        :param messages: list of _OutboundMessage
+        """
+        for message in messages:
+            self._send_queue.put_nowait(message)
+        if self._inbound_space is not None:
+            self._inbound_space.set()
 
     @asyncio.coroutine
     def _get_message(self):
@@ -129,9 +468,28 @@ class _SendReceiveThread(Thread):
         with self._condition:
             self._condition.wait_for(lambda: self._recv_queue is not None)
         msg = yield from self._recv_queue.get()
+        if self._inbound_space is not None:
+            self._inbound_space.set()
 
         return msg
 
+    @asyncio.coroutine
+    def _get_messages(self, max_count):
+        """
+        Waits for a message on the recv_queue, then takes any others that
+        are already available, up to max_count in total. Not to be accessed
+        directly.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._recv_queue is not None)
+        msgs = [(yield from self._recv_queue.get())]
+        while len(msgs) < max_count and not self._recv_queue.empty():
+            msgs.append(self._recv_queue.get_nowait())
+        if self._inbound_space is not None:
+            self._inbound_space.set()
+
+        return msgs
+
     @asyncio.coroutine
     def _monitor_disconnects(self):
         """Monitors the client socket for disconnects
@@ -144,8 +502,17 @@ class _SendReceiveThread(Thread):
         self._sock.disconnect(self._url)
         self._ready_event.clear()
         LOGGER.debug("monitor socket received disconnect event")
-        for future in self._futures.future_values():
+        replay = {}
+        for future in list(self._futures.future_values()):
+            if future.correlation_id in self._in_flight:
+                replay[future.correlation_id] = \
+                    self._in_flight[future.correlation_id]
+                continue
             future.set_result(FutureError())
+            self._futures.remove(future.correlation_id)
+        self._in_flight = replay
+        if self._on_dropped is not None:
+            self._on_dropped()
         tasks = list(asyncio.Task.all_tasks(self._event_loop))
         for task in tasks:
             task.cancel()
@@ -153,12 +520,26 @@ class _SendReceiveThread(Thread):
         self._send_queue = None
         self._recv_queue = None
 
-    def put_message(self, message):
+    @property
+    def send_queue_size(self):
+        queue = self._send_queue
+        return 0 if queue is None else queue.qsize()
+
+    @property
+    def receive_queue_size(self):
+        queue = self._recv_queue
+        return 0 if queue is None else queue.qsize()
+
+    def put_message(self, message, timeout=None):
         """
-        :param message: protobuf generated validator_pb2.Message
+        :param message: _OutboundMessage
+        :param timeout (float): seconds after which to fail the message's
+               future with FutureTimedOut, if it has not been answered
+        :return (bool): False if the connection is not ready and the
+                message was not queued
         """
         if not self._ready_event.is_set():
-            return
+            return False
 
         with self._condition:
             self._condition.wait_for(
@@ -167,7 +548,39 @@ class _SendReceiveThread(Thread):
             )
 
         asyncio.run_coroutine_threadsafe(
-            self._put_message(message),
+            self._put_message(message, timeout),
+            self._event_loop)
+        return True
+
+    def put_messages(self, messages):
+        """
+        :param messages: list of _OutboundMessage
+        :return (bool): False if the connection is not ready and the
+                messages were not queued
+        """
+        if not self._ready_event.is_set():
+            return False
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._event_loop is not None
+                and self._send_queue is not None
+            )
+
+        asyncio.run_coroutine_threadsafe(
+            self._put_messages(messages),
+            self._event_loop)
+        return True
+
+    def get_messages(self, max_count):
+        """
+        :param max_count (int): the most messages to return at once
+        :return messages: concurrent.futures.Future
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._event_loop is not None)
+        return asyncio.run_coroutine_threadsafe(
+            self._get_messages(max_count),
             self._event_loop)
 
     def get_message(self):
@@ -216,6 +629,12 @@ class _SendReceiveThread(Thread):
                 if self._sock is None:
                     self._sock = self._context.socket(zmq.DEALER)
                 self._sock.identity = self.identity
+                self._sock.setsockopt(
+                    zmq.RECONNECT_IVL,
+                    int(self._reconnect.initial_interval * 1000))
+                self._sock.setsockopt(
+                    zmq.RECONNECT_IVL_MAX,
+                    int(self._reconnect.max_interval * 1000))
 
                 self._sock.connect(self._url)
 
@@ -226,8 +645,14 @@ class _SendReceiveThread(Thread):
                     addr=self._monitor_fd)
                 self._send_queue = asyncio.Queue(loop=self._event_loop)
                 self._recv_queue = asyncio.Queue(loop=self._event_loop)
+                if self._max_inbound is not None:
+                    self._inbound_space = asyncio.Event(
+                        loop=self._event_loop)
                 if first_time is False:
-                    self._recv_queue.put_nowait(RECONNECT_EVENT)
+                    if self._deliver is not None:
+                        self._deliver(RECONNECT_EVENT)
+                    else:
+                        self._recv_queue.put_nowait(RECONNECT_EVENT)
                 with self._condition:
                     self._condition.notify_all()
                 asyncio.ensure_future(self._send_message(),
@@ -236,6 +661,9 @@ class _SendReceiveThread(Thread):
                                       loop=self._event_loop)
                 asyncio.ensure_future(self._monitor_disconnects(),
                                       loop=self._event_loop)
+                if self._in_flight:
+                    asyncio.ensure_future(self._replay_in_flight(),
+                                          loop=self._event_loop)
                 # pylint: disable=broad-except
             except Exception as e:
                 LOGGER.error("Exception connecting to validator "
@@ -255,22 +683,153 @@ class _SendReceiveThread(Thread):
                 first_time = False
 
 
+class _InboundQueue:
+    """Merges the messages received on several connections for
+    Stream.receive, in the order they arrive. Each connection's I/O thread
+    adds its messages as it reads them, so a busy connection cannot hold
+    back the others.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._messages = deque()
+        # (concurrent.futures.Future, max_count), where max_count is None
+        # for a single message rather than a list
+        self._waiters = deque()
+
+    def put(self, message):
+        with self._lock:
+            while self._waiters:
+                future, max_count = self._waiters.popleft()
+                if future.set_running_or_notify_cancel():
+                    break
+            else:
+                self._messages.append(message)
+                return
+
+        future.set_result(message if max_count is None else [message])
+
+    def get(self, max_count=None):
+        """
+        :param max_count (int): the most messages to return in a list, or
+            None for a single message
+        :return: concurrent.futures.Future
+        """
+        future = concurrent.futures.Future()
+        with self._lock:
+            if not self._messages:
+                self._waiters.append((future, max_count))
+                return future
+
+            if max_count is None:
+                result = self._messages.popleft()
+            else:
+                result = [
+                    self._messages.popleft()
+                    for _ in range(min(max_count, len(self._messages)))]
+
+        future.set_result(result)
+        return future
+
+    def qsize(self):
+        return len(self._messages)
+
+    def cancel_waiters(self):
+        with self._lock:
+            waiters, self._waiters = self._waiters, deque()
+        for future, _ in waiters:
+            future.cancel()
+
+
+_Connection = namedtuple('_Connection', ['thread', 'futures', 'ready'])
+
+
 class Stream:
-    def __init__(self, url):
+    def __init__(self, url, connections=1, limits=None, reconnect=None):
+        """
+        :param url (str): the address to connect to the validator on
+        :param connections (int): the number of DEALER connections to open,
+            each with its own I/O thread. Requests are spread across them by
+            correlation id, responses go back on the connection the request
+            came in on, and the messages received on all of them are merged
+            for receive().
+        :param limits (StreamLimits): bounds on pending requests, queued
+            bytes and received messages; unbounded if not given
+        :param reconnect (ReconnectPolicy): how to reconnect after losing
+            the validator; ReconnectPolicy's defaults if not given
+        """
+        if connections < 1:
+            raise ValueError('A Stream needs at least one connection')
         self._url = url
-        self._futures = FutureCollection()
-        self._event = Event()
-        self._event.set()
-        error_queue = Queue()
-        self._send_recieve_thread = _SendReceiveThread(
-            url,
-            futures=self._futures,
-            ready_event=self._event,
-            error_queue=error_queue)
-        self._send_recieve_thread.start()
-        err = error_queue.get()
-        if err is not _NO_ERROR:
-            raise err
+        self._limits = limits
+        self._flow = None
+        if limits is not None and (
+                limits.max_pending is not None
+                or limits.max_queued_bytes is not None):
+            self._flow = _FlowControl(limits, connections)
+        max_inbound = None if limits is None else limits.max_inbound
+        self._inbound = _InboundQueue() if connections > 1 else None
+        # Correlation id of each message received through _inbound that is
+        # awaiting send_back, to the index of its connection
+        self._origins = {}
+        self._origins_lock = Lock()
+        self._connections = []
+        for index in range(connections):
+            futures = FutureCollection()
+            ready = Event()
+            ready.set()
+            error_queue = Queue()
+            thread = _SendReceiveThread(
+                url,
+                futures=futures,
+                ready_event=ready,
+                error_queue=error_queue,
+                deliver=None if self._inbound is None
+                else functools.partial(self._deliver, index),
+                inbound_size=None if self._inbound is None
+                else self._inbound.qsize,
+                max_inbound=max_inbound,
+                on_sent=None if self._flow is None
+                else functools.partial(self._flow.sent, index),
+                on_dropped=None if self._flow is None
+                else functools.partial(self._flow.dropped, index),
+                reconnect=reconnect)
+            thread.start()
+            err = error_queue.get()
+            if err is not _NO_ERROR:
+                self.close()
+                raise err
+            self._connections.append(_Connection(thread, futures, ready))
+
+    def _deliver(self, index, message):
+        with self._origins_lock:
+            if message is RECONNECT_EVENT:
+                # Requests that came in before the disconnect can no longer
+                # be answered
+                for correlation_id in [
+                        c for c, i in self._origins.items() if i == index]:
+                    del self._origins[correlation_id]
+                message = ReconnectEvent(index)
+            else:
+                self._origins[message.correlation_id] = index
+        self._inbound.put(message)
+
+    def _connection_for(self, correlation_id):
+        if len(self._connections) == 1:
+            return self._connections[0]
+        return self._connections[hash(correlation_id) % len(self._connections)]
+
+    def _origin_of(self, correlation_id, forget=True):
+        if self._inbound is None:
+            return self._connections[0]
+        with self._origins_lock:
+            if forget:
+                index = self._origins.pop(correlation_id, None)
+            else:
+                index = self._origins.get(correlation_id)
+        if index is None:
+            return self._connection_for(correlation_id)
+        return self._connections[index]
 
     @property
     def url(self):
@@ -280,29 +839,122 @@ class Stream:
 
     @property
     def zmq_id(self):
-        return self._send_recieve_thread.identity
+        """The zmq identity of the first connection."""
+        return self._connections[0].thread.identity
 
-    def send(self, message_type, content):
+    @property
+    def connections(self):
+        """The number of connections to the validator."""
+        return len(self._connections)
+
+    @property
+    def send_queue_size(self):
+        """The number of messages waiting to be sent."""
+        return sum(c.thread.send_queue_size for c in self._connections)
+
+    @property
+    def receive_queue_size(self):
+        """The number of received messages waiting for receive()."""
+        if self._inbound is not None:
+            return self._inbound.qsize()
+        return self._connections[0].thread.receive_queue_size
+
+    @property
+    def pending_requests(self):
+        """The number of sent messages awaiting a response."""
+        return sum(len(c.futures) for c in self._connections)
+
+    @property
+    def queued_bytes(self):
+        """The bytes of messages waiting to be sent, if the Stream has a
+        limit on pending requests or queued bytes; otherwise 0."""
+        return 0 if self._flow is None else self._flow.queued_bytes
+
+    @property
+    def sends_blocked(self):
+        """The number of sends that had to wait for room under the
+        Stream's limits."""
+        return 0 if self._flow is None else self._flow.blocked
+
+    @property
+    def sends_rejected(self):
+        """The number of sends that failed with StreamFullError."""
+        return 0 if self._flow is None else self._flow.rejected
+
+    @property
+    def timeouts(self):
+        """The number of requests whose timeout passed without a
+        response."""
+        return sum(c.thread.timeouts for c in self._connections)
+
+    def send(self, message_type, content, timeout=None, connection=None):
         """Send a message to the validator
 
         :param: message_type(validator_pb2.Message.MessageType)
         :param: content(bytes)
+        :param: timeout(float) seconds after which, if no response has
+            arrived, the future is resolved with FutureTimedOut, whose
+            attributes raise FutureTimeoutError, and forgotten. Waiting on
+            the future is not needed for this, so callbacks may be used
+            instead. Never, if None.
+        :param: connection(int) the index of the connection to send on,
+            such as from a ReconnectEvent; chosen by correlation id if None
         :return: (future.Future)
         :raises: (ValidatorConnectionError)
         """
 
-        if not self._event.is_set():
+        correlation_id = _generate_id().decode()
+        return self._send_on(
+            self._connection_for(correlation_id) if connection is None
+            else self._connections[connection],
+            message_type, correlation_id, content, timeout)
+
+    def broadcast(self, message_type, content, timeout=None):
+        """Send a message to the validator on every connection, such as a
+        registration, which the validator applies per connection
+
+        :param: message_type(validator_pb2.Message.MessageType)
+        :param: content(bytes)
+        :param: timeout(float) as for send
+        :return: (list of future.Future) one per connection
+        :raises: (ValidatorConnectionError)
+        """
+        return [
+            self._send_on(
+                connection, message_type, _generate_id().decode(), content,
+                timeout)
+            for connection in self._connections
+        ]
+
+    def _send_on(self, connection, message_type, correlation_id, content,
+                 timeout=None):
+        if not connection.ready.is_set():
+            raise ValidatorConnectionError()
+        message = _encode_message(message_type, correlation_id, content)
+        future = Future(correlation_id, request_type=message_type)
+        if self._flow is not None:
+            self._flow.acquire(
+                self._connections.index(connection), len(message.data),
+                request=True)
+            future.add_done_callback(self._flow.responded)
+        connection.futures.put(future)
+
+        if not connection.thread.put_message(message, timeout):
+            # The connection went down after the check above
+            try:
+                connection.futures.remove(correlation_id)
+            except FutureCollectionKeyError:
+                pass
+            if not future.done():
+                future.set_result(FutureError())
+            self._unqueue(connection, len(message.data))
             raise ValidatorConnectionError()
-        message = validator_pb2.Message(
-            message_type=message_type,
-            correlation_id=_generate_id(),
-            content=content)
-        future = Future(message.correlation_id, request_type=message_type)
-        self._futures.put(future)
-
-        self._send_recieve_thread.put_message(message)
         return future
 
+    def _unqueue(self, connection, size):
+        if self._flow is not None:
+            self._flow.unqueued(self._connections.index(connection), size)
+
     def send_back(self, message_type, correlation_id, content):
         """
         Return a response to a message.
@@ -311,34 +963,103 @@ class Stream:
         :param content: protobuf bytes
         :raises (ValidatorConnectionError):
         """
-        if not self._event.is_set():
+        connection = self._origin_of(correlation_id)
+        if not connection.ready.is_set():
+            raise ValidatorConnectionError()
+        message = _encode_message(message_type, correlation_id, content)
+        if self._flow is not None:
+            self._flow.acquire(
+                self._connections.index(connection), len(message.data),
+                request=False)
+        if not connection.thread.put_message(message):
+            self._unqueue(connection, len(message.data))
+            raise ValidatorConnectionError()
+
+    def send_back_batch(self, responses):
+        """
+        Return responses to several messages with a single hand-off to the
+        background thread.
+        :param responses: iterable of (message_type, correlation_id, content)
+        :raises (ValidatorConnectionError):
+        """
+        by_connection = {}
+        for message_type, correlation_id, content in responses:
+            connection = self._origin_of(correlation_id)
+            by_connection.setdefault(connection, []).append(
+                _encode_message(message_type, correlation_id, content))
+        disconnected = False
+        for connection, messages in by_connection.items():
+            # Responses on the other connections still go out
+            if not connection.ready.is_set():
+                disconnected = True
+                continue
+            size = sum(len(message.data) for message in messages)
+            if self._flow is not None:
+                self._flow.acquire(
+                    self._connections.index(connection), size, request=False)
+            if not connection.thread.put_messages(messages):
+                self._unqueue(connection, size)
+                disconnected = True
+        if disconnected:
             raise ValidatorConnectionError()
-        message = validator_pb2.Message(
-            message_type=message_type,
-            correlation_id=correlation_id,
-            content=content)
-        self._send_recieve_thread.put_message(message)
 
     def receive(self):
         """
         Receive messages that are not responses
         :return: concurrent.futures.Future
         """
-        return self._send_recieve_thread.get_message()
+        if self._inbound is not None:
+            future = self._inbound.get()
+            self._notify_inbound_space()
+            return future
+        return self._connections[0].thread.get_message()
 
-    def wait_for_ready(self):
+    def receive_batch(self, max_count):
+        """
+        Receive all of the messages that are not responses and are currently
+        available, waiting for at least one.
+        :param max_count (int): the most messages to return at once
+        :return: concurrent.futures.Future resolving to a list of messages
+        """
+        if self._inbound is not None:
+            future = self._inbound.get(max_count)
+            self._notify_inbound_space()
+            return future
+        return self._connections[0].thread.get_messages(max_count)
+
+    def _notify_inbound_space(self):
+        if self._limits is not None and self._limits.max_inbound is not None:
+            for connection in self._connections:
+                connection.thread.notify_inbound_space()
+
+    def wait_for_ready(self, connection=None):
         """Blocks until the background thread has recovered
         from a disconnect with the validator.
+
+        :param connection (int): the index of the connection to wait for;
+            all of them if None
         """
-        self._event.wait()
+        connections = self._connections if connection is None \
+            else [self._connections[connection]]
+        for conn in connections:
+            conn.ready.wait()
 
-    def is_ready(self):
+    def is_ready(self, correlation_id=None):
         """Whether the background thread has recovered from
         a disconnect with the validator
 
+        :param correlation_id (str): the correlation id of a received
+            message, to ask only whether the connection it came in on, and
+            which a reply goes back on, is ready
         :return: (bool) whether the background thread is ready
         """
-        return self._event.is_set()
+        if correlation_id is not None:
+            return self._origin_of(
+                correlation_id, forget=False).ready.is_set()
+        return all(c.ready.is_set() for c in self._connections)
 
     def close(self):
-        self._send_recieve_thread.shutdown()
+        for connection in self._connections:
+            connection.thread.shutdown()
+        if self._inbound is not None:
+            self._inbound.cancel_waiters()
@@ -0,0 +1,155 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import abc
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+import logging
+from socketserver import ThreadingMixIn
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsExporter(metaclass=abc.ABCMeta):
+    """Publishes the metrics in a MetricsRegistry from a background thread.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    @abc.abstractmethod
+    def start(self):
+        """Starts publishing. Returns immediately."""
+
+    @abc.abstractmethod
+    def stop(self):
+        """Stops publishing and waits for the background thread."""
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class PrometheusExporter(MetricsExporter):
+    """Serves the metrics in the Prometheus text format at /metrics on a
+    local port, for a Prometheus server to scrape."""
+
+    def __init__(self, registry, port, host='127.0.0.1'):
+        """
+        Args:
+            registry (MetricsRegistry): the metrics to serve
+            port (int): the port to listen on; 0 picks a free one
+            host (str): the address to listen on
+        """
+        super().__init__(registry)
+        self._address = (host, port)
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        """The URL the metrics are served at, once started."""
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}/metrics'.format(host, port)
+
+    def start(self):
+        registry = self._registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # pylint: disable=redefined-builtin
+                LOGGER.debug(format, *args)
+
+        self._server = _ThreadingHTTPServer(self._address, Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name='PrometheusExporter',
+            daemon=True)
+        self._thread.start()
+        LOGGER.info('Serving metrics at %s', self.url)
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+
+class LogExporter(MetricsExporter):
+    """Logs every metric sample periodically, for processors without a
+    metrics server to scrape them."""
+
+    def __init__(self, registry, interval=60, logger=LOGGER,
+                 level=logging.INFO):
+        """
+        Args:
+            registry (MetricsRegistry): the metrics to log
+            interval (float): seconds between dumps
+            logger (logging.Logger): the logger to write to
+            level (int): the level to log at
+        """
+        super().__init__(registry)
+        self._interval = interval
+        self._logger = logger
+        self._level = level
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='LogExporter', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        self.dump()
+
+    def dump(self):
+        """Logs the metrics now."""
+        if not self._logger.isEnabledFor(self._level):
+            return
+        for line in self._registry.to_prometheus_text().splitlines():
+            if not line.startswith('#'):
+                self._logger.log(self._level, 'metric %s', line)
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.dump()
@@ -0,0 +1,215 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from bisect import bisect_left
+import math
+import threading
+
+# Upper bounds, in seconds, suited to round-trips and handler calls
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+def _format_labels(names, values):
+    pairs = list(zip(names, values))
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+        for name, value in pairs) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError('{} takes labels {}, not {}'.format(
+                self.name, self.label_names, sorted(labels)))
+        return tuple(labels[name] for name in self.label_names)
+
+    def samples(self):
+        """Returns the current samples as (suffix, label names, label
+        values, value) tuples."""
+        with self._lock:
+            return [
+                ('', self.label_names, key, value)
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class _ValueMetric(_Metric):
+    """A metric with one value for each set of labels, which is either
+    kept by the metric or read from a function at collection time."""
+
+    def __init__(self, name, documentation, label_names=()):
+        super().__init__(name, documentation, label_names)
+        self._function = None
+
+    def set_function(self, function):
+        """Reads the metric's value from function(), which takes no
+        arguments, whenever it is collected. Only for unlabelled metrics."""
+        self._function = function
+
+    def get(self, **labels):
+        if self._function is not None:
+            return self._function()
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        if self._function is not None:
+            return [('', (), (), self._function())]
+        return super().samples()
+
+
+class Counter(_ValueMetric):
+    """A value that only goes up, such as a number of requests. A function
+    given to set_function must not decrease either, such as one reading a
+    count kept elsewhere."""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_ValueMetric):
+    """A value that can go up and down, such as a queue depth. It is
+    either set directly or read from a function at collection time."""
+
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    """Counts observations, such as latencies, into cumulative buckets,
+    keeping their count and sum."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(),
+                 buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(
+                key, ([0] * len(self.buckets), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def get(self, **labels):
+        """Returns the count and sum of the observations."""
+        with self._lock:
+            counts, total = self._values.get(
+                self._key(labels), ([0] * len(self.buckets), 0.0))
+            return sum(counts), total
+
+    def samples(self):
+        with self._lock:
+            values = sorted(
+                (key, (list(counts), total))
+                for key, (counts, total) in self._values.items())
+
+        samples = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((
+                    '_bucket', self.label_names + ('le',),
+                    key + (_format_value(bound),), cumulative))
+            samples.append(('_count', self.label_names, key, cumulative))
+            samples.append(('_sum', self.label_names, key, total))
+        return samples
+
+
+class MetricsRegistry:
+    """Holds named metrics and renders them for exporters.
+
+    Asking for a metric that already exists returns the existing one, so
+    independent components can share a registry.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(
+                    'Metric {} is already a {}'.format(name, metric.kind))
+            return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def gauge(self, name, documentation, label_names=()):
+        return self._get_or_create(Gauge, name, documentation, label_names)
+
+    def histogram(self, name, documentation, label_names=(),
+                  buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(
+            Histogram, name, documentation, label_names, buckets=buckets)
+
+    def metrics(self):
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def to_prometheus_text(self):
+        """Renders every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self.metrics():
+            lines.append('# HELP {} {}'.format(
+                metric.name, metric.documentation))
+            lines.append('# TYPE {} {}'.format(metric.name, metric.kind))
+            for suffix, names, values, value in metric.samples():
+                lines.append('{}{}{} {}'.format(
+                    metric.name, suffix, _format_labels(names, values),
+                    _format_value(value)))
+        return '\n'.join(lines) + '\n'
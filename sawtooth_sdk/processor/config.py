@@ -12,10 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ------------------------------------------------------------------------------
+import copy
+import functools
 import os
 import sys
-import toml
-import yaml
+
+
+@functools.lru_cache(maxsize=None)
+def _load_config_file(conf_file):
+    """Parses a toml or yaml config file, once per process.
+
+    toml and yaml are imported here rather than at module level, since
+    most processors never find a file to parse.
+
+    Returns:
+        dict: the parsed file, or None if it does not exist
+    """
+    if not os.path.exists(conf_file):
+        return None
+
+    with open(conf_file) as fd:
+        raw_config = fd.read()
+    if conf_file.endswith(".yaml"):
+        import yaml
+        return yaml.safe_load(raw_config)
+
+    import toml
+    return toml.loads(raw_config)
+
+
+def _read_config_file(conf_file):
+    # Callers such as logging.config.dictConfig may modify the result
+    return copy.deepcopy(_load_config_file(conf_file))
+
+
+def clear_config_cache():
+    """Forgets the config files parsed so far, so that changes to them are
+    seen."""
+    _load_config_file.cache_clear()
 
 
 def get_config_dir():
@@ -52,13 +86,10 @@ def _get_dir(toml_config_setting,
     Returns:
         directory (str): The path.
     """
-    conf_file = os.path.join(get_config_dir(), 'path.toml')
-    if os.path.exists(conf_file):
-        with open(conf_file) as fd:
-            raw_config = fd.read()
-        toml_config = toml.loads(raw_config)
-        if toml_config_setting in toml_config:
-            return toml_config[toml_config_setting]
+    toml_config = _load_config_file(
+        os.path.join(get_config_dir(), 'path.toml'))
+    if toml_config is not None and toml_config_setting in toml_config:
+        return toml_config[toml_config_setting]
 
     if 'SAWTOOTH_HOME' in os.environ:
         return os.path.join(os.environ['SAWTOOTH_HOME'], sawtooth_home_dir)
@@ -83,16 +114,7 @@ def _get_log_config(filename=None):
         log_config (dict): The dictionary to pass to logging.config.dictConfig
     """
     if filename is not None:
-
-        conf_file = os.path.join(get_config_dir(), filename)
-        if os.path.exists(conf_file):
-            with open(conf_file) as fd:
-                raw_config = fd.read()
-            if filename.endswith(".yaml"):
-                log_config = yaml.safe_load(raw_config)
-            else:
-                log_config = toml.loads(raw_config)
-            return log_config
+        return _read_config_file(os.path.join(get_config_dir(), filename))
     return None
 
 
@@ -109,13 +131,7 @@ def _get_processor_config(filename=None):
     """
 
     if filename is not None:
-
-        conf_file = os.path.join(get_config_dir(), filename)
-        if os.path.exists(conf_file):
-            with open(conf_file) as fd:
-                raw_config = fd.read()
-                log_config = toml.loads(raw_config)
-                return log_config
+        return _read_config_file(os.path.join(get_config_dir(), filename))
     return None
 
 
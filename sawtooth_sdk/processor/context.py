@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ------------------------------------------------------------------------------
+import time
+
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 from sawtooth_sdk.protobuf import state_context_pb2
 from sawtooth_sdk.protobuf import events_pb2
@@ -28,12 +30,32 @@ class Context:
     Attributes:
         _stream (sawtooth.client.stream.Stream): client grpc communication
         _context_id (str): the context_id passed in from the validator
+        _on_request (callable): called as on_request(name, start, duration)
+            after each round-trip to the validator, where name is the
+            Context method, such as 'get_state'
 
     """
 
-    def __init__(self, stream, context_id):
+    def __init__(self, stream, context_id, on_request=None):
         self._stream = stream
         self._context_id = context_id
+        self._on_request = on_request
+
+    def _request(self, name, message_type, content, timeout):
+        """Sends a request to the validator and waits for the response
+        content, timing the round-trip if anything is observing it."""
+        if self._on_request is None:
+            return self._stream.send(
+                message_type, content, timeout=timeout).result(
+                    timeout).content
+
+        start = time.time()
+        try:
+            return self._stream.send(
+                message_type, content, timeout=timeout).result(
+                    timeout).content
+        finally:
+            self._on_request(name, start, time.time() - start)
 
     def get_state(self, addresses, timeout=None):
         """
@@ -54,9 +76,11 @@ class Context:
         request = state_context_pb2.TpStateGetRequest(
             context_id=self._context_id,
             addresses=addresses)
-        response_string = self._stream.send(
+        response_string = self._request(
+            'get_state',
             Message.TP_STATE_GET_REQUEST,
-            request.SerializeToString()).result(timeout).content
+            request.SerializeToString(),
+            timeout)
         response = state_context_pb2.TpStateGetResponse()
         response.ParseFromString(response_string)
         if response.status == \
@@ -93,8 +117,8 @@ class Context:
             context_id=self._context_id).SerializeToString()
         response = state_context_pb2.TpStateSetResponse()
         response.ParseFromString(
-            self._stream.send(Message.TP_STATE_SET_REQUEST,
-                              request).result(timeout).content)
+            self._request('set_state', Message.TP_STATE_SET_REQUEST,
+                          request, timeout))
         if response.status == \
                 state_context_pb2.TpStateSetResponse.AUTHORIZATION_ERROR:
             addresses = [e.address for e in state_entries]
@@ -123,8 +147,8 @@ class Context:
             addresses=addresses).SerializeToString()
         response = state_context_pb2.TpStateDeleteResponse()
         response.ParseFromString(
-            self._stream.send(Message.TP_STATE_DELETE_REQUEST,
-                              request).result(timeout).content)
+            self._request('delete_state', Message.TP_STATE_DELETE_REQUEST,
+                          request, timeout))
         if response.status == \
                 state_context_pb2.TpStateDeleteResponse.AUTHORIZATION_ERROR:
             raise AuthorizationException(
@@ -142,9 +166,11 @@ class Context:
             data=data).SerializeToString()
         response = state_context_pb2.TpReceiptAddDataResponse()
         response.ParseFromString(
-            self._stream.send(
+            self._request(
+                'add_receipt_data',
                 Message.TP_RECEIPT_ADD_DATA_REQUEST,
-                request).result(timeout).content)
+                request,
+                timeout))
         if response.status == state_context_pb2.TpReceiptAddDataResponse.ERROR:
             raise InternalError(
                 "Failed to add receipt data: {}".format((data)))
@@ -177,9 +203,11 @@ class Context:
             context_id=self._context_id, event=event).SerializeToString()
         response = state_context_pb2.TpEventAddResponse()
         response.ParseFromString(
-            self._stream.send(
+            self._request(
+                'add_event',
                 Message.TP_EVENT_ADD_REQUEST,
-                request).result(timeout).content)
+                request,
+                timeout))
         if response.status == state_context_pb2.TpEventAddResponse.ERROR:
             raise InternalError(
                 "Failed to add event: ({}, {}, {})".format(
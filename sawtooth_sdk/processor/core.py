@@ -15,6 +15,7 @@
 
 from concurrent.futures import CancelledError
 import concurrent.futures
+import contextlib
 import itertools
 import logging
 
@@ -24,12 +25,14 @@ from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
 from sawtooth_sdk.messaging.exceptions import ValidatorVersionError
 from sawtooth_sdk.messaging.future import FutureTimeoutError
 from sawtooth_sdk.messaging.stream import RECONNECT_EVENT
+from sawtooth_sdk.messaging.stream import ReconnectEvent
 from sawtooth_sdk.messaging.stream import Stream
 
 from sawtooth_sdk.processor.context import Context
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 from sawtooth_sdk.processor.exceptions import InternalError
 from sawtooth_sdk.processor.exceptions import AuthorizationException
+from sawtooth_sdk.processor.metrics import ProcessorMetrics
 
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterRequest
 from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterResponse
@@ -61,17 +64,51 @@ class TransactionProcessor:
         FEATURE_CUSTOM_HEADER_STYLE = 1
         SDK_PROTOCOL_VERSION = 1
 
-    def __init__(self, url):
+    def __init__(self, url, max_occupancy=None, metrics=None, tracer=None,
+                 profiler=None, connections=1, stream_limits=None,
+                 reconnect=None):
         """
         Args:
             url (string): The URL of the validator
+            max_occupancy (int): The most transactions the validator should
+                send this processor at once; the validator's default if not
+                given
+            metrics (MetricsRegistry): a registry to record request counts,
+                latencies and stream queue depths in, for an exporter from
+                sawtooth_sdk.metrics.exporters to publish; nothing is
+                recorded if not given
+            tracer (Tracer): records a span for each transaction, with
+                its Context round-trips; nothing is traced if not given
+            profiler (HandlerProfiler): profiles a fraction of
+                handler.apply calls; it is started and stopped by the
+                caller
+            connections (int): The number of connections to open to the
+                validator, each with its own I/O thread. Each registers
+                separately, so the validator sends up to max_occupancy
+                transactions on each.
+            stream_limits (StreamLimits): bounds on the requests and bytes
+                the connection to the validator holds; Context calls wait
+                for room, or fail with StreamFullError once the limits'
+                send_timeout passes
+            reconnect (ReconnectPolicy): the backoff between attempts to
+                reconnect to the validator, and whether state reads in
+                flight are sent again afterwards
         """
-        self._stream = Stream(url)
+        self._stream = Stream(
+            url, connections=connections, limits=stream_limits,
+            reconnect=reconnect)
+        self._metrics = None if metrics is None \
+            else ProcessorMetrics(metrics, self._stream)
+        self._tracer = tracer
+        self._profiler = profiler
         self._url = url
+        self._max_occupancy = max_occupancy
         self._handlers = []
         self._highest_sdk_feature_requested = \
             self._FeatureVersion.FEATURE_UNUSED
         self._header_style = TpRegisterRequest.HEADER_STYLE_UNSET
+        # Serialized TpRegisterRequests, sent again on every reconnect
+        self._register_contents = None
 
     @property
     def zmq_id(self):
@@ -83,6 +120,7 @@ class TransactionProcessor:
             handler (TransactionHandler): the handler to be added
         """
         self._handlers.append(handler)
+        self._register_contents = None
 
     def set_header_style(self, style):
         """Sets a flag to request the validator for custom transaction header
@@ -95,6 +133,7 @@ class TransactionProcessor:
             self._highest_sdk_feature_requested = \
                 self._FeatureVersion.FEATURE_CUSTOM_HEADER_STYLE
         self._header_style = style
+        self._register_contents = None
 
     def _matches(self, handler, header):
         return header.family_name == handler.family_name \
@@ -124,6 +163,7 @@ class TransactionProcessor:
                     family=n,
                     version=v,
                     namespaces=h.namespaces,
+                    max_occupancy=self._max_occupancy or 0,
                     protocol_version=self._highest_sdk_feature_requested.value,
                     request_header_style=self._header_style)
                  for n, v in itertools.product(
@@ -139,6 +179,21 @@ class TransactionProcessor:
         """
         return TpUnregisterRequest()
 
+    def _observers(self, header, request):
+        """Returns the metrics timer, tracing span and profile for a
+        transaction, for those that are enabled."""
+        observers = []
+        if self._metrics is not None:
+            observers.append(self._metrics.transaction_timer(header))
+        if self._tracer is not None:
+            observers.append(
+                self._tracer.transaction_span(header, request.signature))
+        if self._profiler is not None:
+            profile = self._profiler.transaction_profile(header)
+            if profile is not None:
+                observers.append(profile)
+        return observers
+
     def _process(self, msg):
         if msg.message_type != Message.TP_PROCESS_REQUEST:
             LOGGER.debug(
@@ -149,19 +204,37 @@ class TransactionProcessor:
 
         request = TpProcessRequest()
         request.ParseFromString(msg.content)
-        state = Context(self._stream, request.context_id)
         if self._header_style == TpRegisterRequest.RAW:
             header = TransactionHeader()
             header.ParseFromString(request.header_bytes)
         else:
             header = request.header
+        observers = self._observers(header, request)
+        on_request = [
+            o.on_request for o in observers if o.on_request is not None]
+        if not on_request:
+            state = Context(self._stream, request.context_id)
+        elif len(on_request) == 1:
+            state = Context(self._stream, request.context_id,
+                            on_request=on_request[0])
+        else:
+            state = Context(self._stream, request.context_id,
+                            on_request=_call_all(on_request))
+        status = None
         try:
-            if not self._stream.is_ready():
+            if not self._stream.is_ready(msg.correlation_id):
                 raise ValidatorConnectionError()
             handler = self._find_handler(header)
             if handler is None:
                 return
-            handler.apply(request, state)
+            if not observers:
+                handler.apply(request, state)
+            else:
+                with contextlib.ExitStack() as stack:
+                    for observer in observers:
+                        stack.enter_context(observer)
+                    handler.apply(request, state)
+            status = TpProcessResponse.OK
             self._stream.send_back(
                 message_type=Message.TP_PROCESS_RESPONSE,
                 correlation_id=msg.correlation_id,
@@ -170,6 +243,7 @@ class TransactionProcessor:
                 ).SerializeToString())
         except InvalidTransaction as it:
             LOGGER.warning("Invalid Transaction %s", it)
+            status = TpProcessResponse.INVALID_TRANSACTION
             try:
                 self._stream.send_back(
                     message_type=Message.TP_PROCESS_RESPONSE,
@@ -187,6 +261,7 @@ class TransactionProcessor:
                 LOGGER.warning("during invalid transaction response: %s", vce)
         except InternalError as ie:
             LOGGER.warning("internal error: %s", ie)
+            status = TpProcessResponse.INTERNAL_ERROR
             try:
                 self._stream.send_back(
                     message_type=Message.TP_PROCESS_RESPONSE,
@@ -209,6 +284,7 @@ class TransactionProcessor:
                            "with error status: %s", vce)
         except AuthorizationException as ae:
             LOGGER.warning("AuthorizationException: %s", ae)
+            status = TpProcessResponse.INVALID_TRANSACTION
             try:
                 self._stream.send_back(
                     message_type=Message.TP_PROCESS_RESPONSE,
@@ -223,6 +299,9 @@ class TransactionProcessor:
                 # sent back but the validator has disconnected and so it
                 # doesn't care about the response.
                 LOGGER.warning("during invalid transaction response: %s", vce)
+        finally:
+            for observer in observers:
+                observer.finish(status)
 
     def _process_future(self, future, timeout=None, sigint=False):
         try:
@@ -232,15 +311,22 @@ class TransactionProcessor:
             # disconnect from the validator in stream.py, for
             # this future.
             return
-        if msg is RECONNECT_EVENT:
+        if msg is RECONNECT_EVENT or isinstance(msg, ReconnectEvent):
+            if self._metrics is not None:
+                self._metrics.reconnects.inc()
             if sigint is False:
+                # With several connections, only the one that reconnected
+                # registers again
+                connection = None if msg is RECONNECT_EVENT \
+                    else msg.connection
                 LOGGER.info("reregistering with validator")
-                self._stream.wait_for_ready()
-                self._register()
+                self._stream.wait_for_ready(connection)
+                self._register(connection)
         else:
-            LOGGER.debug(
-                'received message of type: %s',
-                Message.MessageType.Name(msg.message_type))
+            if LOGGER.isEnabledFor(logging.DEBUG):
+                LOGGER.debug(
+                    'received message of type: %s',
+                    Message.MessageType.Name(msg.message_type))
             if msg.message_type == Message.PING_REQUEST:
                 self._stream.send_back(
                     message_type=Message.PING_RESPONSE,
@@ -249,14 +335,26 @@ class TransactionProcessor:
                 return
             self._process(msg)
 
-    def _register(self):
+    def _register(self, connection=None):
+        """Registers the handlers on one connection to the validator, or on
+        all of them if `connection` is None."""
+        if self._register_contents is None:
+            self._register_contents = [
+                message.SerializeToString()
+                for message in self._register_requests()]
+
         futures = []
-        for message in self._register_requests():
-            self._stream.wait_for_ready()
-            future = self._stream.send(
-                message_type=Message.TP_REGISTER_REQUEST,
-                content=message.SerializeToString())
-            futures.append(future)
+        for content in self._register_contents:
+            self._stream.wait_for_ready(connection)
+            if connection is None:
+                futures.extend(self._stream.broadcast(
+                    message_type=Message.TP_REGISTER_REQUEST,
+                    content=content))
+            else:
+                futures.append(self._stream.send(
+                    message_type=Message.TP_REGISTER_REQUEST,
+                    content=content,
+                    connection=connection))
 
         for future in futures:
             resp = TpRegisterResponse()
@@ -283,17 +381,20 @@ class TransactionProcessor:
     def _unregister(self):
         message = self._unregister_request()
         self._stream.wait_for_ready()
-        future = self._stream.send(
+        futures = self._stream.broadcast(
             message_type=Message.TP_UNREGISTER_REQUEST,
-            content=message.SerializeToString())
-        response = TpUnregisterResponse()
-        try:
-            response.ParseFromString(future.result(1).content)
-            LOGGER.info("unregister attempt: %s",
-                        TpUnregisterResponse.Status.Name(response.status))
-        except ValidatorConnectionError as vce:
-            LOGGER.info("during waiting for response on unregistration: %s",
-                        vce)
+            content=message.SerializeToString(),
+            timeout=1)
+        for future in futures:
+            response = TpUnregisterResponse()
+            try:
+                response.ParseFromString(future.result(1).content)
+                LOGGER.info("unregister attempt: %s",
+                            TpUnregisterResponse.Status.Name(response.status))
+            except ValidatorConnectionError as vce:
+                LOGGER.info(
+                    "during waiting for response on unregistration: %s",
+                    vce)
 
     def start(self):
         """Connects the transaction processor to a validator and starts
@@ -339,3 +440,10 @@ class TransactionProcessor:
         validator.
         """
         self._stream.close()
+
+
+def _call_all(callbacks):
+    def call(*args):
+        for callback in callbacks:
+            callback(*args)
+    return call
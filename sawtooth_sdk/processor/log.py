@@ -13,11 +13,13 @@
 # limitations under the License.
 # ------------------------------------------------------------------------------
 
+import atexit
 import logging
 import logging.config
+import logging.handlers
 import os
-
-from colorlog import ColoredFormatter
+import queue
+import threading
 
 
 def create_console_handler(verbose_level):
@@ -26,6 +28,9 @@ def create_console_handler(verbose_level):
     Args:
         verbose_level (int): The log level that the console should print out
     """
+    # colorlog is only needed once there is a console to log to
+    from colorlog import ColoredFormatter
+
     clog = logging.StreamHandler()
     formatter = ColoredFormatter(
         "%(log_color)s[%(asctime)s.%(msecs)03d "
@@ -53,36 +58,129 @@ def create_console_handler(verbose_level):
     return clog
 
 
-def init_console_logging(verbose_level=2):
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Marks the handlers added by queue_handlers. The message is
+    formatted on the logging thread, so its arguments are captured as
+    they were at the call, and only the handlers' I/O is left to the
+    listener's thread."""
+
+
+# Logger name to the QueueListener writing its handlers' records
+_LISTENERS = {}
+_LISTENERS_LOCK = threading.Lock()
+
+
+def queue_handlers(logger=None):
+    """Moves the handlers of a logger behind a queue, so that they are
+    called from one background thread and logging calls return without
+    waiting on I/O. Messages are still formatted by the logging call.
+    Handlers added to the logger afterwards can be moved by calling this
+    again.
+
+    Records below the level of every moved handler are not enqueued, and
+    the logger's level is raised to the lowest handler level so that they
+    are not even created.
+
+    Args:
+        logger (logging.Logger): the logger; the root logger if not given
+    """
+    if logger is None:
+        logger = logging.getLogger()
+
+    with _LISTENERS_LOCK:
+        previous = list(logger.handlers)
+        handlers = [
+            handler for handler in previous
+            if not isinstance(handler, _QueueHandler)]
+        old_listener = _LISTENERS.pop(logger.name, None)
+        if old_listener is not None:
+            handlers = list(old_listener.handlers) + handlers
+        if not handlers:
+            return
+
+        # Start the new queue before retiring the old one, so that no
+        # record is dropped in between
+        level = min(handler.level for handler in handlers)
+        log_queue = queue.Queue()
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _LISTENERS[logger.name] = listener
+
+        queue_handler = _QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
+        for handler in previous:
+            logger.removeHandler(handler)
+        if level > logger.getEffectiveLevel():
+            logger.setLevel(level)
+
+    if old_listener is not None:
+        old_listener.stop()
+
+
+def stop_queued_logging():
+    """Writes out the records still queued by queue_handlers, and stops
+    the background threads. Called at exit."""
+    with _LISTENERS_LOCK:
+        listeners = list(_LISTENERS.values())
+        _LISTENERS.clear()
+    for listener in listeners:
+        listener.stop()
+
+
+atexit.register(stop_queued_logging)
+
+
+def init_console_logging(verbose_level=2, queued=False):
     """
     Set up the console logging for a transaction processor.
     Args:
         verbose_level (int): The log level that the console should print out
+        queued (bool): Write to the console from a background thread; see
+            queue_handlers
     """
     logger = logging.getLogger()
     logger.setLevel(logging.DEBUG)
     logger.addHandler(create_console_handler(verbose_level))
+    if queued:
+        queue_handlers(logger)
+
 
+def _create_file_handler(filename, max_bytes, backup_count):
+    if max_bytes:
+        return logging.handlers.RotatingFileHandler(
+            filename, maxBytes=max_bytes, backupCount=backup_count)
+    return logging.FileHandler(filename)
 
-def log_configuration(log_config=None, log_dir=None, name=None):
+
+def log_configuration(log_config=None, log_dir=None, name=None,
+                      queued=False, max_bytes=0, backup_count=5):
     """
     Sets up the loggers for a transaction processor.
     Args:
         log_config (dict): A dictinary of log config options
         log_dir (string): The log directory's path
         name (string): The name of the expected logging file
+        queued (bool): Write the root logger's handlers from a background
+            thread; see queue_handlers
+        max_bytes (int): Rotate each log file once it would grow past this
+            many bytes; never if 0. Ignored with log_config.
+        backup_count (int): The rotated files to keep for each log
     """
     if log_config is not None:
         logging.config.dictConfig(log_config)
     else:
         log_filename = os.path.join(log_dir, name)
-        debug_handler = logging.FileHandler(log_filename + "-debug.log")
+        debug_handler = _create_file_handler(
+            log_filename + "-debug.log", max_bytes, backup_count)
         debug_handler.setFormatter(logging.Formatter(
             '[%(asctime)s.%(msecs)03d [%(threadName)s] %(module)s'
             ' %(levelname)s] %(message)s', "%H:%M:%S"))
         debug_handler.setLevel(logging.DEBUG)
 
-        error_handler = logging.FileHandler(log_filename + "-error.log")
+        error_handler = _create_file_handler(
+            log_filename + "-error.log", max_bytes, backup_count)
         error_handler.setFormatter(logging.Formatter(
             '[%(asctime)s.%(msecs)03d [%(threadName)s] %(module)s'
             ' %(levelname)s] %(message)s', "%H:%M:%S"))
@@ -90,3 +188,6 @@ def log_configuration(log_config=None, log_dir=None, name=None):
 
         logging.getLogger().addHandler(error_handler)
         logging.getLogger().addHandler(debug_handler)
+
+    if queued:
+        queue_handlers()
@@ -0,0 +1,128 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import time
+
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+
+
+class ProcessorMetrics:
+    """The metrics a TransactionProcessor records in a MetricsRegistry.
+
+    Args:
+        registry (MetricsRegistry): the registry to create the metrics in
+        stream (Stream): the processor's connection, whose queues are
+            reported as gauges and whose rejected sends and timed out
+            requests as counters
+    """
+
+    def __init__(self, registry, stream):
+        self.process_requests = registry.counter(
+            'sawtooth_tp_process_requests_total',
+            'Transactions processed, by family, version and response '
+            'status; NO_RESPONSE if the validator disconnected first',
+            ('family', 'version', 'status'))
+        self.apply_seconds = registry.histogram(
+            'sawtooth_tp_apply_seconds',
+            'Time spent in handler.apply, including Context round-trips',
+            ('family', 'version'))
+        self.apply_context_seconds = registry.histogram(
+            'sawtooth_tp_apply_context_seconds',
+            'Time within each handler.apply spent waiting on Context '
+            'round-trips to the validator',
+            ('family', 'version'))
+        self.context_request_seconds = registry.histogram(
+            'sawtooth_tp_context_request_seconds',
+            'Round-trip time of Context requests, by Context method',
+            ('method',))
+        self.reconnects = registry.counter(
+            'sawtooth_tp_reconnects_total',
+            'Times the processor reconnected to the validator')
+
+        registry.gauge(
+            'sawtooth_stream_send_queue_depth',
+            'Messages waiting to be sent to the validator'
+        ).set_function(lambda: stream.send_queue_size)
+        registry.gauge(
+            'sawtooth_stream_receive_queue_depth',
+            'Messages from the validator waiting to be processed'
+        ).set_function(lambda: stream.receive_queue_size)
+        registry.gauge(
+            'sawtooth_stream_pending_requests',
+            'Requests sent to the validator that are awaiting a response'
+        ).set_function(lambda: stream.pending_requests)
+        registry.gauge(
+            'sawtooth_stream_queued_bytes',
+            'Bytes of messages waiting to be written to the validator, '
+            'when the stream has limits'
+        ).set_function(lambda: stream.queued_bytes)
+        registry.counter(
+            'sawtooth_stream_sends_rejected_total',
+            'Sends that failed because the stream to the validator was full'
+        ).set_function(lambda: stream.sends_rejected)
+        registry.counter(
+            'sawtooth_stream_request_timeouts_total',
+            'Requests to the validator whose timeout passed without a '
+            'response'
+        ).set_function(lambda: stream.timeouts)
+
+    def transaction_timer(self, header):
+        return TransactionTimer(self, header)
+
+
+class TransactionTimer:
+    """Times one transaction's handler.apply, and the Context round-trips
+    within it. Pass on_request to the transaction's Context and wrap the
+    apply call in the timer, then call finish() with the response status.
+    """
+
+    def __init__(self, metrics, header):
+        self._metrics = metrics
+        self._family = header.family_name
+        self._version = header.family_version
+        self._start = None
+        self._apply_seconds = 0.0
+        self._context_seconds = 0.0
+
+    def on_request(self, name, start, duration):
+        # pylint: disable=unused-argument
+        self._context_seconds += duration
+        self._metrics.context_request_seconds.observe(duration, method=name)
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._apply_seconds = time.time() - self._start
+
+    def finish(self, status):
+        """Records the transaction, if it was applied.
+
+        Args:
+            status (TpProcessResponse.Status): the response sent, or None
+                if none could be
+        """
+        if self._start is None:
+            return
+
+        labels = {'family': self._family, 'version': self._version}
+        self._metrics.process_requests.inc(
+            status='NO_RESPONSE' if status is None
+            else TpProcessResponse.Status.Name(status),
+            **labels)
+        self._metrics.apply_seconds.observe(self._apply_seconds, **labels)
+        self._metrics.apply_context_seconds.observe(
+            self._context_seconds, **labels)
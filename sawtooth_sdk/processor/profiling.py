@@ -0,0 +1,234 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import cProfile
+from collections import Counter
+import logging
+import os
+import pstats
+import random
+import re
+import signal
+import sys
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+CPROFILE = 'cprofile'
+SAMPLE = 'sample'
+
+
+def _file_prefix(family, version):
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', '{}-{}'.format(family, version))
+
+
+def _collapse(frame):
+    """Returns the stack ending at `frame` in the collapsed format read
+    by flamegraph tools: outermost function first, separated by ';'."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append('{} ({}:{})'.format(
+            code.co_name, os.path.basename(code.co_filename),
+            code.co_firstlineno))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class HandlerProfiler:
+    """Profiles a fraction of handler.apply calls and aggregates the
+    results per transaction family and version.
+
+    In 'cprofile' mode, each sampled apply runs under cProfile and the
+    aggregates are written as <family>-<version>.pstats, readable by
+    pstats, snakeviz or flameprof. In 'sample' mode, a background thread
+    records the stack of each sampled apply every `sample_interval`
+    seconds, which costs far less than tracing every call, and the
+    aggregates are written as <family>-<version>.collapsed for
+    flamegraph.pl or speedscope.
+
+    The files are rewritten with the aggregates so far every `interval`
+    seconds, and on stop().
+    """
+
+    def __init__(self, directory, mode=CPROFILE, rate=0.01, interval=60,
+                 sample_interval=0.005, enabled=True):
+        """
+        Args:
+            directory (str): where the aggregates are written
+            mode (str): 'cprofile' or 'sample'
+            rate (float): the fraction of apply calls to profile
+            interval (float): seconds between writes of the aggregates
+            sample_interval (float): seconds between stack samples, in
+                'sample' mode
+            enabled (bool): whether to profile from the start, rather
+                than from the first toggle()
+        """
+        if mode not in (CPROFILE, SAMPLE):
+            raise ValueError('Unknown profiler mode: {}'.format(mode))
+        self._directory = directory
+        self._mode = mode
+        self._rate = rate
+        self._interval = interval
+        self._sample_interval = sample_interval
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        # (family, version) to pstats.Stats or Counter of collapsed stacks
+        self._aggregates = {}
+        self._changed = set()
+        # Thread id to (family, version), of the applies being sampled
+        self._active = {}
+
+        self._stopped = threading.Event()
+        self._threads = []
+
+    @property
+    def mode(self):
+        return self._mode
+
+    def start(self):
+        """Starts the background threads that write the aggregates and,
+        in 'sample' mode, sample the stacks."""
+        os.makedirs(self._directory, exist_ok=True)
+        self._stopped.clear()
+        targets = [self._write_periodically]
+        if self._mode == SAMPLE:
+            targets.append(self._sample_stacks)
+        self._threads = [
+            threading.Thread(target=target, daemon=True)
+            for target in targets]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stops the background threads and writes the aggregates."""
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.write()
+
+    def toggle(self):
+        """Switches profiling on or off."""
+        self.enabled = not self.enabled
+        LOGGER.info(
+            'Handler profiling %s', 'enabled' if self.enabled else 'disabled')
+
+    def install_signal_handler(self, signum=signal.SIGUSR2):
+        """Makes `signum` toggle profiling. Must be called from the main
+        thread."""
+        signal.signal(signum, lambda *_: self.toggle())
+
+    def transaction_profile(self, header):
+        """Returns a profile for one transaction's apply call, or None if
+        this call is not to be profiled."""
+        if not self.enabled or random.random() >= self._rate:
+            return None
+        key = (header.family_name, header.family_version)
+        if self._mode == CPROFILE:
+            return _CProfile(self, key)
+        return _SampledProfile(self, key)
+
+    def _add_profile(self, key, profile):
+        with self._lock:
+            stats = self._aggregates.get(key)
+            if stats is None:
+                self._aggregates[key] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+            self._changed.add(key)
+
+    def _sample_stacks(self):
+        while not self._stopped.wait(self._sample_interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                # pylint: disable=protected-access
+                frames = sys._current_frames()
+                for thread_id, key in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        self._aggregates.setdefault(key, Counter())[
+                            _collapse(frame)] += 1
+                        self._changed.add(key)
+
+    def _write_periodically(self):
+        while not self._stopped.wait(self._interval):
+            self.write()
+
+    def write(self):
+        """Writes the aggregates of the families profiled since the last
+        write."""
+        with self._lock:
+            changed, self._changed = self._changed, set()
+            for key in changed:
+                path = os.path.join(
+                    self._directory, _file_prefix(*key))
+                try:
+                    if self._mode == CPROFILE:
+                        self._aggregates[key].dump_stats(path + '.pstats')
+                    else:
+                        with open(path + '.collapsed', 'w') as fd:
+                            for stack, count in sorted(
+                                    self._aggregates[key].items()):
+                                fd.write('{} {}\n'.format(stack, count))
+                except OSError as e:
+                    LOGGER.warning('Could not write profile %s: %s', path, e)
+
+
+class _CProfile:
+    # pylint: disable=protected-access
+    on_request = None
+
+    def __init__(self, profiler, key):
+        self._profiler = profiler
+        self._key = key
+        self._profile = cProfile.Profile()
+        self._applied = False
+
+    def __enter__(self):
+        self._applied = True
+        self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profile.disable()
+
+    def finish(self, status):
+        # pylint: disable=unused-argument
+        if self._applied:
+            self._profiler._add_profile(self._key, self._profile)
+
+
+class _SampledProfile:
+    # pylint: disable=protected-access
+    on_request = None
+
+    def __init__(self, profiler, key):
+        self._profiler = profiler
+        self._key = key
+
+    def __enter__(self):
+        with self._profiler._lock:
+            self._profiler._active[threading.get_ident()] = self._key
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        with self._profiler._lock:
+            self._profiler._active.pop(threading.get_ident(), None)
+
+    def finish(self, status):
+        pass
@@ -0,0 +1,207 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import abc
+from collections import deque
+import json
+import logging
+import threading
+import time
+
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Span:
+    """A timed operation, and the operations timed within it.
+
+    Args:
+        name (str): what was timed, such as 'get_state'
+        start (float): the time.time() it started at
+        duration (float): how long it took, in seconds
+        attributes (dict): JSON serializable details
+        children (list of Span): the operations within this one, in the
+            order they started
+    """
+
+    def __init__(self, name, start, duration=0.0, attributes=None,
+                 children=None):
+        self.name = name
+        self.start = start
+        self.duration = duration
+        self.attributes = attributes or {}
+        self.children = children or []
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'start': self.start,
+            'duration': self.duration,
+            'attributes': self.attributes,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    def __repr__(self):
+        return 'Span({!r}, {:.6f}s, {} children)'.format(
+            self.name, self.duration, len(self.children))
+
+
+class SpanSink(metaclass=abc.ABCMeta):
+    """Receives finished transaction spans. Sinks are called from the
+    processor's worker threads, so they must be thread-safe."""
+
+    @abc.abstractmethod
+    def emit(self, span):
+        """Records one finished transaction span.
+
+        Args:
+            span (Span): the span, which is not modified afterwards
+        """
+
+    def close(self):
+        """Releases anything the sink holds open."""
+
+
+class RingBufferSink(SpanSink):
+    """Keeps the most recent spans in memory."""
+
+    def __init__(self, capacity=1000):
+        """
+        Args:
+            capacity (int): the number of spans to keep
+        """
+        self._spans = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def emit(self, span):
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self):
+        """Returns the kept spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonLinesSink(SpanSink):
+    """Appends each span to a file as one line of JSON."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): the file to append to
+        """
+        # pylint: disable=consider-using-with
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+
+    def emit(self, span):
+        line = json.dumps(span.to_dict(), sort_keys=True)
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + '\n')
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Records a span for each TP_PROCESS_REQUEST a TransactionProcessor
+    handles, and sends it to a sink once the response has been sent.
+
+    Each transaction's span, named 'tp_process_request', is keyed by the
+    transaction signature and covers the time from receiving the request
+    to sending the response. Its child 'apply' span covers handler.apply,
+    with a child span for each Context round-trip named for the Context
+    method, and the handler's own time outside them as the
+    'handler_seconds' attribute.
+    """
+
+    def __init__(self, sink):
+        """
+        Args:
+            sink (SpanSink): where finished spans are sent
+        """
+        self._sink = sink
+
+    def transaction_span(self, header, signature):
+        return TransactionSpan(self._sink, header, signature)
+
+    def close(self):
+        self._sink.close()
+
+
+class TransactionSpan:
+    """Traces one transaction. Pass on_request to the transaction's
+    Context and wrap the apply call in the span, then call finish() with
+    the response status."""
+
+    def __init__(self, sink, header, signature):
+        self._sink = sink
+        self._span = Span(
+            'tp_process_request',
+            time.time(),
+            attributes={
+                'signature': signature,
+                'family': header.family_name,
+                'version': header.family_version,
+            })
+        self._apply = None
+
+    def on_request(self, name, start, duration):
+        span = Span(name, start, duration)
+        if self._apply is not None:
+            self._apply.children.append(span)
+        else:
+            self._span.children.append(span)
+
+    def __enter__(self):
+        self._apply = Span('apply', time.time())
+        self._span.children.append(self._apply)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        apply = self._apply
+        apply.duration = time.time() - apply.start
+        apply.attributes['handler_seconds'] = max(
+            apply.duration - sum(c.duration for c in apply.children), 0.0)
+        if exc_type is not None:
+            apply.attributes['error'] = exc_type.__name__
+        self._apply = None
+
+    def finish(self, status):
+        """Sends the transaction's span to the sink.
+
+        Args:
+            status (TpProcessResponse.Status): the response sent, or None
+                if none could be
+        """
+        span = self._span
+        span.duration = time.time() - span.start
+        span.attributes['status'] = 'NO_RESPONSE' if status is None \
+            else TpProcessResponse.Status.Name(status)
+        try:
+            self._sink.emit(span)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception('Span sink failed')
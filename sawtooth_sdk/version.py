@@ -0,0 +1,76 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import argparse
+
+
+def get_distribution_version(name):
+    """Returns the installed version of a distribution, or 'UNKNOWN' if it
+    is not installed.
+
+    Uses importlib.metadata where available, which reads only the one
+    distribution's metadata, rather than pkg_resources, which scans every
+    installed distribution when imported.
+
+    Args:
+        name (str): the distribution name, such as 'sawtooth-intkey'
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        metadata = None
+
+    if metadata is not None:
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return 'UNKNOWN'
+
+    import pkg_resources
+    try:
+        return pkg_resources.get_distribution(name).version
+    except pkg_resources.DistributionNotFound:
+        return 'UNKNOWN'
+
+
+class VersionAction(argparse.Action):
+    """Like argparse's 'version' action, but looks the version of a
+    distribution up only when the option is given, keeping the lookup
+    off the startup path.
+
+    Usage:
+        parser.add_argument(
+            '-V', '--version',
+            action=VersionAction,
+            distribution='sawtooth-intkey',
+            template='sawtooth-intkey version {}')
+    """
+
+    def __init__(self, option_strings, distribution, template='{}',
+                 dest=argparse.SUPPRESS, default=argparse.SUPPRESS,
+                 help=None):
+        # pylint: disable=redefined-builtin
+        super().__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help)
+        self._distribution = distribution
+        self._template = template
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=self._template.format(
+            get_distribution_version(self._distribution)) + '\n')
@@ -0,0 +1,104 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+from collections import deque
+import threading
+import time
+
+
+def _percentile(ordered, fraction):
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class WorkloadMetrics:
+    """Counts a workload's batches through submission and commit, and times
+    each submission request and each batch from submission to commit.
+
+    Commit latency percentiles are taken over the most recent `window`
+    committed batches.
+    """
+
+    def __init__(self, window=10000):
+        self._lock = threading.Lock()
+        self._submit_times = {}
+        self._commit_latencies = deque(maxlen=window)
+
+        self.submitted = 0
+        self.rejected = 0
+        self.committed = 0
+        self.dropped = 0
+        self.unreachable = 0
+        self._submit_requests = 0
+        self._submit_time = 0.0
+        self._submit_max = 0.0
+
+    def record_submit(self, batch_ids, accepted, duration):
+        """Records one submission request.
+
+        Args:
+            batch_ids (list of str): the batches in the request
+            accepted (bool): whether they were accepted
+            duration (float): seconds the request took
+        """
+        now = time.time()
+        with self._lock:
+            self._submit_requests += 1
+            self._submit_time += duration
+            self._submit_max = max(self._submit_max, duration)
+            if accepted:
+                self.submitted += len(batch_ids)
+                for batch_id in batch_ids:
+                    self._submit_times[batch_id] = now
+            else:
+                self.rejected += len(batch_ids)
+
+    def record_unreachable(self):
+        with self._lock:
+            self.unreachable += 1
+
+    def record_committed(self, batch_id):
+        now = time.time()
+        with self._lock:
+            self.committed += 1
+            submitted = self._submit_times.pop(batch_id, None)
+            if submitted is not None:
+                self._commit_latencies.append(now - submitted)
+
+    def record_dropped(self, batch_id):
+        """Records a batch that will not commit, such as an invalid one."""
+        with self._lock:
+            self.dropped += 1
+            self._submit_times.pop(batch_id, None)
+
+    def snapshot(self):
+        """Returns the counts and latencies so far as a dict."""
+        with self._lock:
+            latencies = sorted(self._commit_latencies)
+            return {
+                'submitted': self.submitted,
+                'rejected': self.rejected,
+                'committed': self.committed,
+                'dropped': self.dropped,
+                'unreachable': self.unreachable,
+                'pending': len(self._submit_times),
+                'submit_latency_mean': self._submit_time
+                / self._submit_requests if self._submit_requests else 0.0,
+                'submit_latency_max': self._submit_max,
+                'commit_latency_p50': _percentile(latencies, 0.5),
+                'commit_latency_p99': _percentile(latencies, 0.99),
+                'commit_latency_max': latencies[-1] if latencies else 0.0,
+            }
@@ -0,0 +1,246 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import abc
+import json
+import logging
+import threading
+
+from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
+from sawtooth_sdk.messaging.exceptions import WorkloadConnectionError
+from sawtooth_sdk.messaging.future import FutureTimeoutError
+from sawtooth_sdk.messaging.stream import Stream
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import ClientBatchStatus
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchStatusRequest
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchStatusResponse
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchSubmitRequest
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchSubmitResponse
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+LOGGER = logging.getLogger(__name__)
+
+# The error code the REST API returns when it has lost its validator
+_VALIDATOR_DISCONNECTED = 18
+
+
+class Transport(metaclass=abc.ABCMeta):
+    """Submits batches to validators and looks up their statuses on behalf
+    of a WorkloadGenerator. Methods may be called from several threads at
+    once.
+    """
+
+    @abc.abstractmethod
+    def submit_batches(self, url, batch_list):
+        """Submits a BatchList.
+
+        Args:
+            url (str): the validator or REST API to submit to
+            batch_list (BatchList): the batches to submit
+
+        Returns:
+            bool: whether the batches were accepted
+
+        Raises:
+            WorkloadConnectionError: if `url` cannot be reached
+        """
+
+    @abc.abstractmethod
+    def batch_statuses(self, url, batch_ids):
+        """Looks up the statuses of batches.
+
+        Args:
+            url (str): the validator or REST API to ask
+            batch_ids (list of str): the batches to look up
+
+        Returns:
+            dict: the status name of each batch, such as 'COMMITTED' or
+                'PENDING', or 'UNKNOWN' if it could not be found out
+
+        Raises:
+            WorkloadConnectionError: if `url` cannot be reached
+        """
+
+    def close(self):
+        """Releases any connections held by the transport."""
+
+
+class HttpTransport(Transport):
+    """Submits batches to REST APIs over a pooled requests.Session, keeping
+    up to `pool_size` connections to each one alive for reuse. requests is
+    only needed by this transport, so it is imported when one is created.
+    """
+
+    def __init__(self, auth_info=None, pool_size=10, timeout=None):
+        """
+        Args:
+            auth_info (str): base64 encoded Basic Auth credentials
+            pool_size (int): the most connections to keep per REST API
+            timeout (float): seconds to wait for each response; no limit if
+                not given
+        """
+        # pylint: disable=import-error
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._connection_error = requests.exceptions.ConnectionError
+        self._auth_info = auth_info
+        self._timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def _headers(self, content_type):
+        headers = {'Content-Type': content_type}
+        if self._auth_info is not None:
+            headers['Authorization'] = 'Basic {}'.format(self._auth_info)
+        return headers
+
+    def submit_batches(self, url, batch_list):
+        try:
+            result = self._session.post(
+                url + '/batches',
+                data=batch_list.SerializeToString(),
+                headers=self._headers('application/octet-stream'),
+                timeout=self._timeout)
+        except self._connection_error as err:
+            raise WorkloadConnectionError(url) from err
+
+        if result.status_code != 202:
+            LOGGER.warning("(%s): %s", result.status_code, result.reason)
+            return False
+        return True
+
+    def batch_statuses(self, url, batch_ids):
+        unknown = {batch_id: 'UNKNOWN' for batch_id in batch_ids}
+        try:
+            result = self._session.post(
+                url + '/batch_statuses',
+                data=json.dumps(batch_ids).encode(),
+                headers=self._headers('application/json'),
+                timeout=self._timeout)
+            json_result = result.json()
+        except self._connection_error as err:
+            raise WorkloadConnectionError(url) from err
+        except ValueError as err:
+            LOGGER.warning('Unable to retrieve status: %s', err)
+            return unknown
+
+        if result.ok:
+            statuses = dict(unknown)
+            statuses.update(
+                (entry['id'], entry['status'])
+                for entry in json_result['data'])
+            return statuses
+
+        error = json_result.get('error', {})
+        if error.get('code') == _VALIDATOR_DISCONNECTED:
+            raise WorkloadConnectionError(url)
+
+        LOGGER.debug("(%s): %s", result.status_code,
+                     error.get('message', json_result))
+        return unknown
+
+    def close(self):
+        self._session.close()
+
+
+class ZmqTransport(Transport):
+    """Submits batches directly to validators' client endpoints, such as
+    tcp://localhost:4004, with one Stream per validator.
+    """
+
+    def __init__(self, timeout=10):
+        """
+        Args:
+            timeout (float): seconds to wait for each response
+        """
+        self._timeout = timeout
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    def _stream(self, url):
+        with self._lock:
+            if url not in self._streams:
+                self._streams[url] = Stream(url)
+            return self._streams[url]
+
+    def _request(self, url, message_type, request, response):
+        try:
+            future = self._stream(url).send(
+                message_type, request.SerializeToString(),
+                timeout=self._timeout)
+            response.ParseFromString(future.result(self._timeout).content)
+        except (ValidatorConnectionError, FutureTimeoutError) as err:
+            raise WorkloadConnectionError(url) from err
+        return response
+
+    def submit_batches(self, url, batch_list):
+        response = self._request(
+            url,
+            Message.CLIENT_BATCH_SUBMIT_REQUEST,
+            ClientBatchSubmitRequest(batches=batch_list.batches),
+            ClientBatchSubmitResponse())
+
+        if response.status != ClientBatchSubmitResponse.OK:
+            LOGGER.warning(
+                'Batches rejected by %s: %s', url,
+                ClientBatchSubmitResponse.Status.Name(response.status))
+            return False
+        return True
+
+    def batch_statuses(self, url, batch_ids):
+        response = self._request(
+            url,
+            Message.CLIENT_BATCH_STATUS_REQUEST,
+            ClientBatchStatusRequest(batch_ids=batch_ids),
+            ClientBatchStatusResponse())
+
+        statuses = {batch_id: 'UNKNOWN' for batch_id in batch_ids}
+        if response.status != ClientBatchStatusResponse.OK:
+            LOGGER.debug(
+                'Unable to retrieve status: %s',
+                ClientBatchStatusResponse.Status.Name(response.status))
+            return statuses
+
+        statuses.update(
+            (status.batch_id, ClientBatchStatus.Status.Name(status.status))
+            for status in response.batch_statuses)
+        return statuses
+
+    def close(self):
+        with self._lock:
+            streams, self._streams = self._streams, {}
+        for stream in streams.values():
+            stream.close()
+
+
+def create_transport(name, auth_info=None, pool_size=10):
+    """Creates the transport named on the command line.
+
+    Args:
+        name (str): 'http' or 'zmq'
+        auth_info (str): Basic Auth credentials, for 'http'
+        pool_size (int): the most connections per REST API, for 'http'
+    """
+    if name == 'http':
+        return HttpTransport(auth_info=auth_info, pool_size=pool_size)
+    if name == 'zmq':
+        return ZmqTransport()
+    raise ValueError('Unknown transport: {}'.format(name))
@@ -15,36 +15,57 @@
 import asyncio
 import logging
 import time
-import json
-from http.client import RemoteDisconnected
 
 from threading import Lock
 from collections import deque
 from collections import namedtuple
 from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures._base import CancelledError
-import requests
+from sawtooth_sdk.client.events import EventClient
 from sawtooth_sdk.messaging.exceptions import WorkloadConfigurationError
+from sawtooth_sdk.messaging.exceptions import WorkloadConnectionError
+from sawtooth_sdk.workload.metrics import WorkloadMetrics
+from sawtooth_sdk.workload.transport import create_transport
 
 PendingBatch = namedtuple('PendingBatch', ['id', 'url'])
 
 LOGGER = logging.getLogger(__name__)
 LOGGER.setLevel(logging.DEBUG)
 
+_THREAD_POOL_SIZE = 10
+
 
 class WorkloadGenerator:
     """
     This is the object that manages the workload sent to the validators and
     keeps track of submitted and committed batches. To run, it must first have
     a Workload set, as this is where the batches are created.
+
+    Workloads submit their batches through submit_batches(), which sends
+    them over the generator's transport: pooled HTTP to REST APIs by
+    default, or ZMQ directly to validators with args.transport set to
+    'zmq'. The progress of the batches is counted in `metrics`.
     """
 
-    def __init__(self, args):
+    def __init__(self, args, transport=None):
+        """
+        Args:
+            args: the command line arguments, with urls, rate,
+                display_frequency and auth_info, and optionally transport
+                and events_url
+            transport (Transport): the transport to submit batches over;
+                one named by args.transport if not given
+        """
         self._workload = None
         self._auth_info = args.auth_info
         self._lock = Lock()
         # needs to be locked
         self._pending_batches = deque()
+        # With events, the (batch id, status) of batches the validator has
+        # reported on, and how many batches are still awaiting a report;
+        # also locked
+        self._resolved_batches = deque()
+        self._watched_batches = 0
         self._validators = args.urls.split(",")
         self._number_of_outstanding_requests = 0
         self._submitted_batches_sample = 0
@@ -56,8 +77,17 @@ class WorkloadGenerator:
 
         self._rate = 1.0 / int(args.rate)
         self._display_frequency = args.display_frequency
+        self._transport = transport or create_transport(
+            getattr(args, 'transport', None) or 'http',
+            auth_info=self._auth_info,
+            pool_size=_THREAD_POOL_SIZE)
+        self.metrics = WorkloadMetrics()
+        # When set, batch commits are pushed by the validator instead of
+        # each pending batch being polled for
+        events_url = getattr(args, 'events_url', None)
+        self._events = EventClient(events_url) if events_url else None
         self.loop = asyncio.get_event_loop()
-        self.thread_pool = ThreadPoolExecutor(10)
+        self.thread_pool = ThreadPoolExecutor(_THREAD_POOL_SIZE)
         asyncio.ensure_future(self._simulator_loop(), loop=self.loop)
 
     def set_workload(self, workload):
@@ -113,10 +143,17 @@ class WorkloadGenerator:
                         sum(self._committed_batch_samples)
                         / len(self._committed_batch_samples))
 
+                    LOGGER.warning(
+                        'Workload metrics: %s', self.metrics.snapshot())
+
                     self._submitted_batches_sample = 0
                     self._committed_batches_sample = 0
                     self._time_since_last_check = now
 
+                if self._events is not None:
+                    self._dispatch_resolved_batch()
+                    continue
+
                 self._number_of_outstanding_requests += 1
                 # If there are pending batchess, then pull off the first
                 # one.
@@ -126,6 +163,25 @@ class WorkloadGenerator:
                 self.loop.run_in_executor(
                     self.thread_pool, self._check_on_batch, batch)
 
+    def _dispatch_resolved_batch(self):
+        """Hands one batch the validator has reported on to the workload,
+        or asks for more batches if none are awaiting a report. As when
+        polling, the workload is called at most once a tick, so the rate
+        bounds its submissions. Called with the lock held.
+        """
+        if self._resolved_batches:
+            self._watched_batches -= 1
+            resolved = self._resolved_batches.popleft()
+        elif self._watched_batches == 0:
+            resolved = None
+        else:
+            # Wait for the validator to report on the outstanding batches
+            return
+
+        self._number_of_outstanding_requests += 1
+        self.loop.run_in_executor(
+            self.thread_pool, self._check_on_resolved_batch, resolved)
+
     def stop(self):
         tasks = list(asyncio.Task.all_tasks(self.loop))
         for task in tasks:
@@ -134,6 +190,9 @@ class WorkloadGenerator:
             self.loop.run_until_complete(asyncio.gather(*tasks))
         except CancelledError:
             self.loop.call_soon_threadsafe(self.loop.stop)
+        if self._events is not None:
+            self._events.close()
+        self._transport.close()
         self._workload.on_will_stop()
 
     def _check_on_batch(self, batch):
@@ -146,11 +205,11 @@ class WorkloadGenerator:
                        the url the batch was submitted to.
         """
         if batch is not None:
-            status = self._status_request([batch.id], batch.url,
-                                          auth_info=self._auth_info)
+            status = self._status_request([batch.id], batch.url)
             if status == "COMMITTED":
                 with self._lock:
                     self._committed_batches_sample += 1
+                self.metrics.record_committed(batch.id)
                 self._workload.on_batch_committed(batch.id)
 
             else:
@@ -162,6 +221,7 @@ class WorkloadGenerator:
                     LOGGER.debug("Batch's status is %s, "
                                  "dropping batch: %s.",
                                  status, batch.id)
+                    self.metrics.record_dropped(batch.id)
                     self._workload.on_batch_not_yet_committed()
         else:
             self._workload.on_all_batches_committed()
@@ -178,6 +238,33 @@ class WorkloadGenerator:
             self._validators.remove(validator)
         self._workload.on_validator_removed(validator)
 
+    def submit_batches(self, url, batch_list):
+        """
+        Called by the workload to submit batches over the generator's
+        transport. Each accepted batch should then be passed to
+        on_new_batch to be tracked.
+
+        Args:
+            url: The validator or rest_api to submit to.
+            batch_list: The BatchList to submit.
+
+        Returns:
+            bool: Whether the batches were accepted.
+        """
+        batch_ids = [batch.header_signature for batch in batch_list.batches]
+        start = time.time()
+        try:
+            accepted = self._transport.submit_batches(url, batch_list)
+        except WorkloadConnectionError:
+            LOGGER.warning(
+                'Unable to connect to "%s": make sure URL is correct', url)
+            self.metrics.record_unreachable()
+            self._remove_unresponsive_validator(url)
+            return False
+
+        self.metrics.record_submit(batch_ids, accepted, time.time() - start)
+        return accepted
+
     def on_new_batch(self, batch_id, url):
         """
         Called by the workload to let the workload_generator know that a new
@@ -193,53 +280,51 @@ class WorkloadGenerator:
         if batch_id is not None:
             with self._lock:
                 self._submitted_batches_sample += 1
-                self._pending_batches.append(
-                    PendingBatch(id=batch_id, url=url))
-
-    def _status_request(self, batch_id, url, auth_info=None):
-        data = json.dumps(batch_id).encode()
-        headers = {'Content-Type': 'application/json'}
-        headers['Content-Length'] = '%d' % len(data)
-        if auth_info is not None:
-            headers['Authorization'] = 'Basic {}'.format(auth_info)
-
-        try:
-            result = requests.post(
-                url + '/batch_statuses', data=data, headers=headers)
+                if self._events is None:
+                    self._pending_batches.append(
+                        PendingBatch(id=batch_id, url=url))
+                else:
+                    self._watched_batches += 1
 
-            code, json_result = \
-                result.status_code, result.json()
-            result.raise_for_status()
+            if self._events is not None:
+                self._events.watch_batches([batch_id], self._on_batch_status)
 
-            if code in (200, 201, 202):
-                return json_result['data'][0]['status']
+    def _on_batch_status(self, batch_id, status):
+        # Called on the event client's thread; the workload is told on the
+        # next tick
+        with self._lock:
+            self._resolved_batches.append((batch_id, status))
 
-            if 'error' in json_result:
-                message = json_result['error']['message']
+    def _check_on_resolved_batch(self, resolved):
+        """Like _check_on_batch, for a (batch id, status) reported by the
+        validator, or None if no batches are outstanding. This function is
+        run in a separate thread.
+        """
+        if resolved is None:
+            self._workload.on_all_batches_committed()
+        else:
+            batch_id, status = resolved
+            if status == "COMMITTED":
+                with self._lock:
+                    self._committed_batches_sample += 1
+                self.metrics.record_committed(batch_id)
+                self._workload.on_batch_committed(batch_id)
             else:
-                message = json_result
+                LOGGER.debug("Batch's status is %s, dropping batch: %s.",
+                             status, batch_id)
+                self.metrics.record_dropped(batch_id)
+                self._workload.on_batch_not_yet_committed()
 
-            LOGGER.debug("(%s): %s", code, message)
-            return "UNKNOWN"
-
-        except json.decoder.JSONDecodeError as e:
-            LOGGER.warning('Unable to retrieve status: %s', str(e))
-            return "UNKNOWN"
+        with self._lock:
+            self._number_of_outstanding_requests -= 1
 
-        except requests.exceptions.HTTPError as e:
-            error_code = e.response.json()['error']['code']
-            if error_code == 18:
-                self._remove_unresponsive_validator(url)
-                LOGGER.warning("The validator at %s is no longer connected. "
-                               "Removing Validator.", url)
-            return "UNKNOWN"
-        except RemoteDisconnected as e:
+    def _status_request(self, batch_ids, url):
+        try:
+            statuses = self._transport.batch_statuses(url, batch_ids)
+        except WorkloadConnectionError:
             self._remove_unresponsive_validator(url)
             LOGGER.warning("The validator at %s is no longer connected. "
                            "Removing Validator.", url)
             return "UNKNOWN"
-        except requests.exceptions.ConnectionError as e:
-            LOGGER.warning(
-                'Unable to connect to "%s": make sure URL is correct', url)
-            self._remove_unresponsive_validator(url)
-            return "UNKNOWN"
+
+        return statuses[batch_ids[0]]
@@ -0,0 +1,28 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Puts the example packages on sys.path when imported, so tests can import
+them as bin/tp-benchmark does.
+"""
+
+import os
+import sys
+
+EXAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+for example in ('intkey_python', 'xo_python'):
+    if os.path.join(EXAMPLES_DIR, example) not in sys.path:
+        sys.path.insert(0, os.path.join(EXAMPLES_DIR, example))
@@ -0,0 +1,137 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import unittest
+import unittest.mock
+
+from sawtooth_processor_test import benchmark
+from sawtooth_processor_test.mock_validator import MockValidator
+
+from test_mock_validator import CounterHandler
+from test_mock_validator import make_request
+
+TP_BENCHMARK = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'bin', 'tp-benchmark')
+
+
+def counter_workload(transactions, payload_size):
+    """Increments a handful of counters, with no invalid transactions."""
+    del payload_size
+    return CounterHandler(), [
+        make_request('counter{}'.format(i % 5), i)
+        for i in range(transactions)
+    ]
+
+
+@unittest.mock.patch.dict(benchmark.WORKLOADS, {'counter': counter_workload})
+class TestBenchmark(unittest.TestCase):
+    def test_run(self):
+        """Test that a run against the MockValidator processes every
+        transaction and reports its parameters and results.
+        """
+        result = benchmark.run_benchmark(
+            'counter',
+            transactions=20,
+            concurrency=2,
+            transport='tcp',
+            timeout=30,
+            processors=2,
+            dispatch='least_loaded')
+
+        self.assertEqual(result['workload'], 'counter')
+        self.assertEqual(result['transport'], 'tcp')
+        self.assertEqual(result['processors'], 2)
+        self.assertEqual(result['dispatch'], 'least_loaded')
+        self.assertEqual(result['concurrency'], 2)
+        self.assertEqual(result['transactions'], 20)
+        self.assertEqual(result['valid'], 20)
+        self.assertEqual(result['invalid'], 0)
+        self.assertEqual(result['internal_errors'], 0)
+        self.assertGreater(result['tps'], 0)
+        self.assertGreater(result['cpu_per_txn'], 0)
+        self.assertLessEqual(result['latency_p50'], result['latency_p99'])
+        self.assertLessEqual(result['latency_p99'], result['latency_max'])
+        self.assertEqual(len(result['processor_tps']), 2)
+
+    def test_recovery(self):
+        """Test that a recovery run processes both halves of the workload
+        around the validator restart.
+        """
+        result = benchmark.run_recovery_benchmark(
+            'counter', transactions=20, timeout=30, downtime=0.05)
+
+        self.assertEqual(result['transactions'], 20)
+        self.assertEqual(result['valid'], 20)
+        self.assertEqual(result['internal_errors'], 0)
+        self.assertGreater(result['tps_before'], 0)
+        self.assertGreater(result['tps_after'], 0)
+        self.assertGreaterEqual(
+            result['outage_seconds'], result['recovery_seconds'])
+        self.assertGreaterEqual(result['outage_seconds'], 0.05)
+
+    def test_failed_registration(self):
+        """Test that a run fails if its processors do not register."""
+        with unittest.mock.patch.object(
+                MockValidator, 'register_processors', return_value=False):
+            with self.assertRaises(RuntimeError):
+                benchmark.run_benchmark(
+                    'counter', transactions=2, transport='tcp')
+
+
+def tp_benchmark(*args):
+    """Runs bin/tp-benchmark and returns its parsed JSON results."""
+    output = subprocess.run(
+        [sys.executable, TP_BENCHMARK, '--timeout', '60'] + list(args),
+        stdout=subprocess.PIPE,
+        check=True,
+        timeout=120).stdout
+    return json.loads(output.decode())
+
+
+class TestTpBenchmark(unittest.TestCase):
+    @unittest.skipIf(importlib.util.find_spec('cbor') is None,
+                     'the intkey workload needs cbor')
+    def test_intkey(self):
+        """Test that bin/tp-benchmark runs the intkey example's handler and
+        prints one JSON result per run.
+        """
+        results = tp_benchmark('-w', 'intkey', '-n', '150', '-c', '1', '4')
+
+        self.assertEqual(
+            [result['concurrency'] for result in results], [1, 4])
+        for result in results:
+            self.assertEqual(result['workload'], 'intkey')
+            self.assertEqual(result['transactions'], 150)
+            self.assertEqual(result['valid'], 150)
+            self.assertEqual(result['internal_errors'], 0)
+
+    def test_xo_ordered(self):
+        """Test that concurrent xo runs keep each game's moves in order, so
+        none of them is rejected.
+        """
+        results = tp_benchmark(
+            '-w', 'xo', '-n', '120', '-c', '4', '-p', '1', '2')
+
+        self.assertEqual(
+            [result['processors'] for result in results], [1, 2])
+        for result in results:
+            self.assertEqual(result['concurrency'], 4)
+            self.assertEqual(result['valid'], 120)
+            self.assertEqual(result['invalid'], 0)
@@ -0,0 +1,118 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+from unittest import mock
+
+from sawtooth_sdk.consensus.caching_service import CachingService
+from sawtooth_sdk.consensus.service import Block
+from sawtooth_sdk.protobuf import consensus_pb2
+
+
+def _make_block(block_id, block_num):
+    return Block(consensus_pb2.ConsensusBlock(
+        block_id=block_id,
+        previous_id=b'',
+        signer_id=b'signer',
+        block_num=block_num,
+        payload=b'',
+        summary=b''))
+
+
+class TestCachingService(unittest.TestCase):
+    def setUp(self):
+        self.blocks = {
+            b'block0': _make_block(b'block0', 0),
+            b'block1': _make_block(b'block1', 1),
+            b'block2': _make_block(b'block2', 2),
+        }
+        self.mock_service = mock.Mock()
+        self.mock_service.get_blocks.side_effect = \
+            lambda block_ids: {
+                block_id: self.blocks[block_id] for block_id in block_ids
+            }
+        self.mock_service.get_settings.side_effect = \
+            lambda block_id, keys: {
+                key: 'value' for key in keys if key != 'unset'
+            }
+        self.service = CachingService(self.mock_service, max_size=2)
+
+    def test_get_blocks(self):
+        """Test that blocks are only fetched once, and that a partial hit
+        only requests the missing blocks.
+        """
+        self.service.get_blocks([b'block0'])
+        result = self.service.get_blocks([b'block0', b'block1'])
+
+        self.assertEqual(
+            self.mock_service.get_blocks.call_args_list,
+            [mock.call([b'block0']), mock.call([b'block1'])])
+        self.assertEqual(
+            result,
+            {b'block0': self.blocks[b'block0'],
+             b'block1': self.blocks[b'block1']})
+
+    def test_size_eviction(self):
+        """Test that the least recently used block is evicted once the cache
+        is full.
+        """
+        self.service.get_blocks([b'block0'])
+        self.service.get_blocks([b'block1'])
+        self.service.get_blocks([b'block0'])
+        self.service.get_blocks([b'block2'])
+
+        self.mock_service.get_blocks.reset_mock()
+        self.service.get_blocks([b'block0'])
+        self.mock_service.get_blocks.assert_not_called()
+        self.service.get_blocks([b'block1'])
+        self.mock_service.get_blocks.assert_called_once_with([b'block1'])
+
+    def test_get_settings(self):
+        """Test that settings, including unset ones, are cached per block.
+        """
+        result = self.service.get_settings(b'block1', ['a', 'unset'])
+        self.assertEqual(result, {'a': 'value'})
+
+        result = self.service.get_settings(b'block1', ['a', 'unset'])
+        self.assertEqual(result, {'a': 'value'})
+        self.mock_service.get_settings.assert_called_once_with(
+            b'block1', ['a', 'unset'])
+
+        self.service.get_settings(b'block2', ['a'])
+        self.mock_service.get_settings.assert_called_with(b'block2', ['a'])
+
+    def test_block_commit(self):
+        """Test that a commit invalidates the chain head and evicts entries
+        for blocks at or below the committed height.
+        """
+        self.mock_service.get_chain_head.return_value = self.blocks[b'block1']
+
+        self.service.get_blocks([b'block0'])
+        self.service.get_settings(b'block0', ['a'])
+        self.service.get_chain_head()
+        self.service.get_chain_head()
+        self.assertEqual(self.mock_service.get_chain_head.call_count, 1)
+
+        self.service.block_commit(b'block1')
+
+        self.service.get_chain_head()
+        self.assertEqual(self.mock_service.get_chain_head.call_count, 2)
+
+        self.mock_service.get_blocks.reset_mock()
+        self.service.get_blocks([b'block0', b'block1'])
+        self.mock_service.get_blocks.assert_called_once_with([b'block0'])
+
+        self.service.get_settings(b'block0', ['a'])
+        self.assertEqual(self.mock_service.get_settings.call_count, 2)
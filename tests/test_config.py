@@ -0,0 +1,72 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sawtooth_sdk.processor.config import clear_config_cache
+from sawtooth_sdk.processor.config import get_log_config
+from sawtooth_sdk.processor.config import get_log_dir
+
+
+class TestConfig(unittest.TestCase):
+    def setUp(self):
+        self._home = tempfile.TemporaryDirectory()
+        self.home = self._home.name
+        os.mkdir(os.path.join(self.home, 'etc'))
+        patcher = mock.patch.dict(os.environ, {'SAWTOOTH_HOME': self.home})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        clear_config_cache()
+        self.addCleanup(clear_config_cache)
+
+    def tearDown(self):
+        self._home.cleanup()
+
+    def write(self, filename, content):
+        with open(os.path.join(self.home, 'etc', filename), 'w') as fd:
+            fd.write(content)
+
+    def test_config_files_parsed_once(self):
+        """Test that config files are parsed once, until the cache is
+        cleared.
+        """
+        self.assertEqual(get_log_dir(), os.path.join(self.home, 'logs'))
+
+        self.write('path.toml', 'log_dir = "/tmp/first"\n')
+        # The missing file was cached too
+        self.assertEqual(get_log_dir(), os.path.join(self.home, 'logs'))
+
+        clear_config_cache()
+        self.assertEqual(get_log_dir(), '/tmp/first')
+        self.write('path.toml', 'log_dir = "/tmp/second"\n')
+        self.assertEqual(get_log_dir(), '/tmp/first')
+
+    def test_log_config_copies(self):
+        """Test that toml and yaml log configs are parsed, and that callers
+        cannot change the cached copy.
+        """
+        self.write('tp_log_config.toml', 'version = 1\n')
+        self.write('tp_log_config.yaml', 'version: 1\n')
+
+        config = get_log_config('tp_log_config.toml')
+        self.assertEqual(config, {'version': 1})
+        config['version'] = 2
+        self.assertEqual(get_log_config('tp_log_config.toml'), {'version': 1})
+
+        self.assertEqual(get_log_config('tp_log_config.yaml'), {'version': 1})
+        self.assertIsNone(get_log_config('missing.toml'))
@@ -78,7 +78,8 @@ class ContextTest(unittest.TestCase):
             Message.TP_STATE_GET_REQUEST,
             TpStateGetRequest(
                 context_id=self.context_id,
-                addresses=self.addresses).SerializeToString())
+                addresses=self.addresses).SerializeToString(),
+            timeout=None)
 
     def test_state_set(self):
         """Tests that State sets addresses correctly."""
@@ -94,7 +95,8 @@ class ContextTest(unittest.TestCase):
             Message.TP_STATE_SET_REQUEST,
             TpStateSetRequest(
                 context_id=self.context_id,
-                entries=self._make_entries()).SerializeToString())
+                entries=self._make_entries()).SerializeToString(),
+            timeout=None)
 
     def test_state_delete(self):
         """Tests that State deletes addresses correctly."""
@@ -110,7 +112,8 @@ class ContextTest(unittest.TestCase):
             Message.TP_STATE_DELETE_REQUEST,
             TpStateDeleteRequest(
                 context_id=self.context_id,
-                addresses=self.addresses).SerializeToString())
+                addresses=self.addresses).SerializeToString(),
+            timeout=None)
 
     def test_add_receipt_data(self):
         """Tests that State adds receipt data correctly."""
@@ -125,7 +128,8 @@ class ContextTest(unittest.TestCase):
             Message.TP_RECEIPT_ADD_DATA_REQUEST,
             TpReceiptAddDataRequest(
                 context_id=self.context_id,
-                data=b"test").SerializeToString())
+                data=b"test").SerializeToString(),
+            timeout=None)
 
     def test_add_event(self):
         """Tests that State adds events correctly."""
@@ -143,4 +147,5 @@ class ContextTest(unittest.TestCase):
                 event=Event(
                     event_type="test",
                     attributes=[Event.Attribute(key="test", value="test")],
-                    data=b"test")).SerializeToString())
+                    data=b"test")).SerializeToString(),
+            timeout=None)
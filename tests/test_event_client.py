@@ -0,0 +1,169 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import queue
+import threading
+import unittest
+
+import zmq
+
+from sawtooth_sdk.client.events import EventClient
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import ClientBatchStatus
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchStatusRequest
+from sawtooth_sdk.protobuf.client_batch_submit_pb2 import \
+    ClientBatchStatusResponse
+from sawtooth_sdk.protobuf.client_event_pb2 import \
+    ClientEventsSubscribeRequest
+from sawtooth_sdk.protobuf.client_event_pb2 import \
+    ClientEventsSubscribeResponse
+from sawtooth_sdk.protobuf.client_event_pb2 import \
+    ClientEventsUnsubscribeResponse
+from sawtooth_sdk.protobuf.events_pb2 import Event
+from sawtooth_sdk.protobuf.events_pb2 import EventList
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+
+class FakeValidator(threading.Thread):
+    '''Answers event subscriptions and batch status requests from a
+    dict of statuses, and sends block commit events on request.'''
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.statuses = {}
+        self.status_requests = []
+        self.subscriptions = []
+        self._commits = queue.Queue()
+        self._exit = False
+        self._ident = None
+
+        self._socket = zmq.Context.instance().socket(zmq.ROUTER)
+        self._socket.bind('tcp://127.0.0.1:*')
+        self.url = self._socket.getsockopt_string(zmq.LAST_ENDPOINT)
+
+    def commit_block(self, block_id, batch_ids):
+        self._commits.put((block_id, batch_ids))
+
+    def stop(self):
+        self._exit = True
+        self.join()
+        self._socket.close(linger=0)
+
+    def run(self):
+        while not self._exit:
+            try:
+                block_id, batch_ids = self._commits.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                for batch_id in batch_ids:
+                    self.statuses[batch_id] = ClientBatchStatus.COMMITTED
+                self._send(Message.CLIENT_EVENTS, EventList(events=[Event(
+                    event_type='sawtooth/block-commit',
+                    attributes=[
+                        Event.Attribute(key='block_id', value=block_id)])]))
+
+            if self._socket.poll(10):
+                self._handle(*self._socket.recv_multipart())
+
+    def _handle(self, ident, message_bytes):
+        self._ident = ident
+        message = Message()
+        message.ParseFromString(message_bytes)
+
+        if message.message_type == Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST:
+            request = ClientEventsSubscribeRequest()
+            request.ParseFromString(message.content)
+            self.subscriptions.append(request)
+            self._send(
+                Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE,
+                ClientEventsSubscribeResponse(
+                    status=ClientEventsSubscribeResponse.OK),
+                message.correlation_id)
+        elif message.message_type == Message.CLIENT_BATCH_STATUS_REQUEST:
+            request = ClientBatchStatusRequest()
+            request.ParseFromString(message.content)
+            self.status_requests.append(list(request.batch_ids))
+            self._send(
+                Message.CLIENT_BATCH_STATUS_RESPONSE,
+                ClientBatchStatusResponse(
+                    status=ClientBatchStatusResponse.OK,
+                    batch_statuses=[
+                        ClientBatchStatus(
+                            batch_id=batch_id,
+                            status=self.statuses.get(
+                                batch_id, ClientBatchStatus.PENDING))
+                        for batch_id in request.batch_ids]),
+                message.correlation_id)
+        elif message.message_type == Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST:
+            self._send(
+                Message.CLIENT_EVENTS_UNSUBSCRIBE_RESPONSE,
+                ClientEventsUnsubscribeResponse(
+                    status=ClientEventsUnsubscribeResponse.OK),
+                message.correlation_id)
+
+    def _send(self, message_type, content, correlation_id=''):
+        self._socket.send_multipart([self._ident, Message(
+            message_type=message_type,
+            correlation_id=correlation_id,
+            content=content.SerializeToString()).SerializeToString()])
+
+
+class TestEventClient(unittest.TestCase):
+    def setUp(self):
+        self.validator = FakeValidator()
+        self.validator.start()
+        self.client = EventClient(self.validator.url, request_timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.validator.stop()
+
+    def test_subscribes_to_block_commits(self):
+        self.assertEqual(
+            [s.event_type for s in self.validator.subscriptions[0]
+             .subscriptions],
+            ['sawtooth/block-commit'])
+
+    def test_wait_for_batches(self):
+        """Test that already committed batches resolve at once, that the
+        rest resolve on the next block commit with one status request for
+        all of them, and that unresolved batches are reported as pending.
+        """
+        self.validator.statuses['a'] = ClientBatchStatus.COMMITTED
+        self.assertEqual(
+            self.client.wait_for_batches(['a'], timeout=5),
+            {'a': 'COMMITTED'})
+
+        self.validator.statuses['c'] = ClientBatchStatus.INVALID
+        results = {}
+        resolved = threading.Event()
+
+        def on_status(batch_id, status):
+            results[batch_id] = status
+            if len(results) == 2:
+                resolved.set()
+
+        self.client.watch_batches(['b', 'c', 'd'], on_status)
+        self.validator.commit_block('block-1', ['b'])
+        self.assertTrue(resolved.wait(5))
+        self.assertEqual(results, {'b': 'COMMITTED', 'c': 'INVALID'})
+        self.assertEqual(self.client.last_block_id, 'block-1')
+        self.assertEqual(
+            self.validator.status_requests[-1], ['b', 'd'])
+
+        self.assertEqual(
+            self.client.wait_for_batches(['d'], timeout=0.2),
+            {'d': 'PENDING'})
@@ -0,0 +1,105 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+# The modules a transaction processor imports at startup
+PROCESSOR_MODULES = [
+    'sawtooth_sdk.processor.core',
+    'sawtooth_sdk.processor.config',
+    'sawtooth_sdk.processor.log',
+    'sawtooth_sdk.version',
+]
+
+# Optional or slow modules that must stay off the startup path until they
+# are used
+DEFERRED_MODULES = [
+    'colorlog',
+    'http.server',
+    'pkg_resources',
+    'toml',
+    'uuid',
+    'yaml',
+]
+
+INTKEY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', 'examples', 'intkey_python')
+
+
+def import_times(modules, path=None):
+    """Imports `modules` in a fresh interpreter under -X importtime.
+
+    Args:
+        modules (list of str): the modules to import
+        path (str): a directory to add to the interpreter's PYTHONPATH
+
+    Returns:
+        dict: the cumulative import time in microseconds of every module
+            imported, by name
+    """
+    env = dict(os.environ)
+    if path is not None:
+        env['PYTHONPATH'] = os.pathsep.join(
+            p for p in (path, env.get('PYTHONPATH')) if p)
+
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         'import ' + ', '.join(modules)],
+        env=env,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Skips the header line
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipIf(sys.version_info < (3, 7), '-X importtime needs 3.7')
+class TestImportTime(unittest.TestCase):
+    def test_processor_startup_imports(self):
+        """Test that importing the processor modules does not import the
+        optional dependencies, which are loaded when first used.
+        """
+        times = import_times(PROCESSOR_MODULES)
+
+        for module in PROCESSOR_MODULES:
+            self.assertIn(module, times)
+        for module in DEFERRED_MODULES:
+            self.assertNotIn(module, times)
+
+    @unittest.skipIf(importlib.util.find_spec('cbor') is None,
+                     'the intkey processor needs cbor')
+    def test_intkey_processor_imports(self):
+        """Test that starting the intkey processor's main module does not
+        import the optional dependencies.
+        """
+        module = 'sawtooth_intkey.processor.main'
+        times = import_times([module], path=INTKEY_PATH)
+
+        self.assertIn(module, times)
+        for deferred in DEFERRED_MODULES:
+            self.assertNotIn(deferred, times)
@@ -0,0 +1,290 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import argparse
+import base64
+import io
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+import cbor
+
+from sawtooth_signing import create_context
+
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+
+import example_paths  # pylint: disable=unused-import
+
+from sawtooth_intkey.client_cli.exceptions import IntkeyClientException
+from sawtooth_intkey.client_cli.intkey_cli import do_batch_ops
+from sawtooth_intkey.client_cli.intkey_client import IntkeyClient
+
+
+def make_response(text='{}', status_code=200):
+    return unittest.mock.Mock(
+        status_code=status_code, ok=status_code < 400, text=text)
+
+
+class FakeEvents:
+    '''Reports every batch waited for with the same status.'''
+
+    def __init__(self, status):
+        self.status = status
+        self.waits = []
+
+    def wait_for_batches(self, batch_ids, timeout=None):
+        self.waits.append((list(batch_ids), timeout))
+        return {batch_id: self.status for batch_id in batch_ids}
+
+
+class IntkeyClientTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.priv', delete=False) as keyfile:
+            keyfile.write(
+                create_context('secp256k1').new_random_private_key().as_hex())
+        self.addCleanup(os.remove, keyfile.name)
+        self.keyfile = keyfile.name
+        self.session = unittest.mock.MagicMock()
+        self.session.post.return_value = make_response('{"link": "x"}', 202)
+
+    def client(self, **kwargs):
+        return IntkeyClient(
+            'http://rest-api:8008',
+            keyfile=self.keyfile,
+            session=self.session,
+            **kwargs)
+
+    def posted_batches(self):
+        """Returns the names operated on by each batch of each request
+        posted to the session."""
+        return [
+            [[cbor.loads(transaction.payload)['Name']
+              for transaction in batch.transactions]
+             for batch in BatchList.FromString(
+                 call[1]['data']).batches]
+            for call in self.session.post.call_args_list
+        ]
+
+    def statuses(self, *statuses):
+        """Answers batch status requests with the given statuses."""
+        self.session.get.return_value = make_response(
+            '{{"data": [{}]}}'.format(', '.join(
+                '{{"status": "{}"}}'.format(status) for status in statuses)))
+
+
+class TestIntkeyClientWait(IntkeyClientTest):
+    def test_events_committed(self):
+        """Test that a batch committed while waiting on events returns the
+        REST API's response.
+        """
+        events = FakeEvents('COMMITTED')
+
+        response = self.client(events=events).set('a', 1, wait=5)
+
+        self.assertEqual(response, '{"link": "x"}')
+        self.assertEqual(len(events.waits), 1)
+        self.assertEqual(events.waits[0][1], 5)
+
+    def test_events_invalid(self):
+        """Test that an invalid or timed out batch waited for on events
+        raises instead of being reported as sent.
+        """
+        for status in ('INVALID', 'PENDING'):
+            with self.subTest(status=status):
+                with self.assertRaises(IntkeyClientException):
+                    self.client(events=FakeEvents(status)).set(
+                        'a', 1, wait=5)
+
+    def test_poll_invalid(self):
+        """Test that an invalid batch waited for by polling its status
+        raises.
+        """
+        self.session.get.return_value = make_response(
+            '{"data": [{"status": "INVALID"}]}')
+
+        with self.assertRaises(IntkeyClientException):
+            self.client().set('a', 1, wait=5)
+
+
+class TestIntkeyClientPaging(IntkeyClientTest):
+    def test_path_prefix(self):
+        """Test that listing follows the REST API's paging link under the
+        path prefix of its url.
+        """
+        def page(values, next_url=None):
+            return make_response(json.dumps({
+                'data': [{
+                    'address': 'a',
+                    'data': base64.b64encode(cbor.dumps(values)).decode()
+                }],
+                'paging': {} if next_url is None else {'next': next_url},
+            }))
+
+        self.session.get.side_effect = [
+            page({'a': 1}, 'http://host/sawtooth/state?address=1cf126'
+                 '&start=2'),
+            page({'b': 2}),
+        ]
+        client = IntkeyClient(
+            'http://host/sawtooth', session=self.session)
+
+        self.assertEqual(
+            list(client.list_values()), [('a', 1), ('b', 2)])
+        self.assertEqual(
+            [call[0][0] for call in self.session.get.call_args_list],
+            ['http://host/sawtooth/state?address=1cf126',
+             'http://host/sawtooth/state?address=1cf126&start=2'])
+
+
+class TestIntkeyClientSession(unittest.TestCase):
+    def test_close_own_session(self):
+        """Test that leaving the client's context closes the session it
+        created, but not one it was given.
+        """
+        with unittest.mock.patch(
+                'sawtooth_intkey.client_cli.intkey_client.create_session'
+        ) as create_session:
+            with IntkeyClient('http://rest-api:8008') as client:
+                pass
+        create_session.return_value.close.assert_called_once_with()
+        # pylint: disable=protected-access
+        self.assertIs(client._session, create_session.return_value)
+
+        session = unittest.mock.Mock()
+        with IntkeyClient('http://rest-api:8008', session=session):
+            pass
+        session.close.assert_not_called()
+
+
+class TestIntkeyBatch(IntkeyClientTest):
+    def test_single_batch(self):
+        """Test that without a batch size every operation is submitted in
+        one batch, in the order they were added.
+        """
+        self.statuses('COMMITTED')
+
+        response = self.client().batch() \
+            .set('a', 1).inc('b', 2).dec('c', 3).submit(wait=5)
+
+        self.assertEqual(response, '{"link": "x"}')
+        self.assertEqual(self.posted_batches(), [[['a', 'b', 'c']]])
+
+    def test_batch_size(self):
+        """Test that a batch size splits the operations into batches sent
+        in one request, and that all of their statuses are checked at once.
+        """
+        self.statuses('COMMITTED', 'COMMITTED', 'COMMITTED')
+        batch = self.client().batch(batch_size=2)
+        for name in 'abcde':
+            batch.set(name, 1)
+
+        batch.submit(wait=5)
+
+        self.assertEqual(
+            self.posted_batches(), [[['a', 'b'], ['c', 'd'], ['e']]])
+        batch_ids = [
+            batch.header_signature for batch in BatchList.FromString(
+                self.session.post.call_args[1]['data']).batches]
+        self.assertIn(
+            'batch_statuses?id={}&'.format(','.join(batch_ids)),
+            self.session.get.call_args[0][0])
+
+    def test_worst_status(self):
+        """Test that one invalid batch fails the whole submission, even
+        when the others committed.
+        """
+        self.statuses('COMMITTED', 'INVALID', 'UNKNOWN')
+        batch = self.client().batch(batch_size=1)
+        for name in 'abc':
+            batch.set(name, 1)
+
+        with self.assertRaisesRegex(IntkeyClientException, 'invalid'):
+            batch.submit(wait=5)
+
+        self.assertEqual(self.session.get.call_count, 1)
+
+    def test_worst_status_pending(self):
+        """Test that a batch still pending when the wait ends fails the
+        submission, even if another batch was invalid.
+        """
+        self.statuses('INVALID', 'PENDING', 'COMMITTED')
+        batch = self.client().batch(batch_size=1)
+        for name in 'abc':
+            batch.set(name, 1)
+
+        with self.assertRaisesRegex(IntkeyClientException, 'Timed out'):
+            batch.submit(wait=1)
+
+    def test_submit_once(self):
+        """Test that a batch cannot be submitted twice, or added to after
+        it was submitted.
+        """
+        batch = self.client().batch().set('a', 1)
+        batch.submit()
+
+        with self.assertRaises(IntkeyClientException):
+            batch.submit()
+        with self.assertRaises(IntkeyClientException):
+            batch.set('b', 2)
+        self.assertEqual(self.posted_batches(), [[['a']]])
+
+
+class TestBatchOps(IntkeyClientTest):
+    def batch_ops(self, lines, **kwargs):
+        args = argparse.Namespace(
+            url='http://rest-api:8008',
+            keyfile=self.keyfile,
+            wait=None,
+            events_url=None,
+            timeout=None,
+            retries=3,
+            atomic=False)
+        for name, value in kwargs.items():
+            setattr(args, name, value)
+
+        with unittest.mock.patch(
+                'sawtooth_intkey.client_cli.intkey_cli.create_session',
+                return_value=self.session) as create_session, \
+                unittest.mock.patch('sys.stdin', io.StringIO(lines)), \
+                unittest.mock.patch('sys.stdout', io.StringIO()):
+            do_batch_ops(args)
+        return create_session
+
+    def test_atomic(self):
+        """Test that --atomic submits every operation in a single batch."""
+        self.batch_ops('set a 1\n# comment\ninc b 2\n\ndec a 1\n',
+                       atomic=True)
+
+        self.assertEqual(self.posted_batches(), [[['a', 'b', 'a']]])
+
+    def test_not_atomic(self):
+        """Test that without --atomic each operation is its own batch."""
+        self.batch_ops('set a 1\ninc b 2\ndec a 1\n')
+
+        self.assertEqual(self.posted_batches(), [[['a']], [['b']], [['a']]])
+
+    def test_retries(self):
+        """Test that --retries sets the retries of the one pooled session
+        the operations are sent on.
+        """
+        create_session = self.batch_ops('set a 1\n', retries=7)
+
+        create_session.assert_called_once_with(pool_size=1, retries=7)
+        self.session.close.assert_not_called()
+        self.session.__exit__.assert_called_once()
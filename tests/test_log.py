@@ -0,0 +1,125 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from sawtooth_sdk.processor.log import log_configuration
+from sawtooth_sdk.processor.log import queue_handlers
+from sawtooth_sdk.processor.log import stop_queued_logging
+
+
+class ThreadRecorder:
+    """Records the thread it is formatted on."""
+
+    def __init__(self):
+        self.thread = None
+
+    def __str__(self):
+        self.thread = threading.current_thread()
+        return 'recorded'
+
+
+class ThreadHandler(logging.Handler):
+    """Records the messages it emits and the thread it emits them on."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.thread = None
+
+    def emit(self, record):
+        self.thread = threading.current_thread()
+        self.messages.append(record.getMessage())
+
+
+class TestLog(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.root_handlers = list(logging.getLogger().handlers)
+
+    def tearDown(self):
+        stop_queued_logging()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if handler not in self.root_handlers:
+                root.removeHandler(handler)
+                handler.close()
+        self._directory.cleanup()
+
+    def test_queue_handlers(self):
+        """Test that queued handlers write records on a background thread,
+        with the message formatted when it was logged, and that records
+        below every handler's level are not created.
+        """
+        path = os.path.join(self.directory, 'test.log')
+        logger = logging.getLogger('test_log.queue')
+        logger.setLevel(logging.DEBUG)
+        # Keep the records away from any handlers on the root logger
+        logger.propagate = False
+        file_handler = logging.FileHandler(path)
+        file_handler.setLevel(logging.INFO)
+        logger.addHandler(file_handler)
+        self.addCleanup(file_handler.close)
+        self.addCleanup(logger.removeHandler, file_handler)
+        thread_handler = ThreadHandler()
+        thread_handler.setLevel(logging.INFO)
+        logger.addHandler(thread_handler)
+
+        queue_handlers(logger)
+        self.assertNotIn(file_handler, logger.handlers)
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+
+        recorder = ThreadRecorder()
+        logger.info('value: %s', recorder)
+        mutable = {'a': 1}
+        logger.info('value: %s', mutable)
+        mutable['a'] = 2
+        logger.debug('hidden')
+        stop_queued_logging()
+
+        with open(path) as fd:
+            self.assertEqual(
+                fd.read(), "value: recorded\nvalue: {'a': 1}\n")
+        self.assertIs(recorder.thread, threading.current_thread())
+        self.assertEqual(
+            thread_handler.messages, ['value: recorded', "value: {'a': 1}"])
+        self.assertIsNotNone(thread_handler.thread)
+        self.assertIsNot(thread_handler.thread, threading.current_thread())
+
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+    def test_rotation(self):
+        """Test that the log files rotate at max_bytes when queued."""
+        log_configuration(
+            log_dir=self.directory, name='tp', queued=True, max_bytes=200,
+            backup_count=2)
+        logger = logging.getLogger('test_log.rotation')
+        for i in range(20):
+            logger.error('message %s', i)
+        stop_queued_logging()
+
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(files, [
+            'tp-debug.log', 'tp-debug.log.1', 'tp-debug.log.2',
+            'tp-error.log', 'tp-error.log.1', 'tp-error.log.2'])
+        for name in files:
+            self.assertLessEqual(
+                os.path.getsize(os.path.join(self.directory, name)), 200)
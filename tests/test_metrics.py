@@ -0,0 +1,158 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import threading
+import time
+import unittest
+import urllib.request
+
+from sawtooth_sdk.metrics.exporters import PrometheusExporter
+from sawtooth_sdk.metrics.registry import MetricsRegistry
+from sawtooth_sdk.processor.core import TransactionProcessor
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+
+from test_mock_validator import CounterHandler
+from test_mock_validator import make_request
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_prometheus_text(self):
+        """Test that counters, gauges and histograms render in the
+        Prometheus text format, with cumulative histogram buckets.
+        """
+        registry = MetricsRegistry()
+        requests = registry.counter('requests_total', 'Requests', ('status',))
+        requests.inc(status='OK')
+        requests.inc(2, status='OK')
+        requests.inc(status='INVALID')
+        registry.gauge('depth', 'Depth').set_function(lambda: 7)
+        registry.counter('dropped_total', 'Dropped').set_function(lambda: 4)
+        latency = registry.histogram(
+            'latency_seconds', 'Latency', buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5)
+
+        self.assertIs(
+            registry.counter('requests_total', 'Requests', ('status',)),
+            requests)
+        self.assertEqual(requests.get(status='OK'), 3)
+        self.assertEqual(latency.get(), (3, 5.55))
+
+        self.assertEqual(registry.to_prometheus_text(), '\n'.join([
+            '# HELP depth Depth',
+            '# TYPE depth gauge',
+            'depth 7.0',
+            '# HELP dropped_total Dropped',
+            '# TYPE dropped_total counter',
+            'dropped_total 4.0',
+            '# HELP latency_seconds Latency',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{le="0.1"} 1.0',
+            'latency_seconds_bucket{le="1.0"} 2.0',
+            'latency_seconds_bucket{le="+Inf"} 3.0',
+            'latency_seconds_count 3.0',
+            'latency_seconds_sum 5.55',
+            '# HELP requests_total Requests',
+            '# TYPE requests_total counter',
+            'requests_total{status="INVALID"} 1.0',
+            'requests_total{status="OK"} 3.0',
+        ]) + '\n')
+
+    def test_wrong_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('requests_total', 'Requests', ('status',))
+
+        with self.assertRaises(ValueError):
+            counter.inc(family='intkey')
+        with self.assertRaises(ValueError):
+            registry.gauge('requests_total', 'Requests')
+
+    def test_prometheus_exporter(self):
+        registry = MetricsRegistry()
+        registry.counter('requests_total', 'Requests').inc()
+
+        with PrometheusExporter(registry, 0) as exporter:
+            with urllib.request.urlopen(exporter.url) as response:
+                body = response.read().decode()
+
+        self.assertIn('requests_total 1.0\n', body)
+
+
+class TestProcessorMetrics(unittest.TestCase):
+    def setUp(self):
+        self.validator = MockValidator()
+        self.validator.listen('tcp://127.0.0.1:*')
+        self.registry = MetricsRegistry()
+        self.processor = TransactionProcessor(
+            self.validator.url, metrics=self.registry)
+        self.processor.add_handler(CounterHandler())
+        threading.Thread(target=self.processor.start, daemon=True).start()
+        self.assertTrue(self.validator.register_processors(1))
+
+    def tearDown(self):
+        self.processor.stop()
+        self.validator.close()
+
+    def test_process_metrics(self):
+        """Test that the processor counts transactions by status and times
+        apply and each Context method.
+        """
+        names = ['a', 'b', 'invalid']
+        self.validator.run(
+            (make_request(name, i) for i, name in enumerate(names)),
+            state=InMemoryState(),
+            timeout=30)
+
+        requests = self.registry.counter(
+            'sawtooth_tp_process_requests_total', '',
+            ('family', 'version', 'status'))
+        # The last transaction is recorded just after its response is sent
+        deadline = time.time() + 5
+        while requests.get(
+                family='counter', version='1.0',
+                status='INVALID_TRANSACTION') == 0 \
+                and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(
+            requests.get(family='counter', version='1.0', status='OK'), 2)
+        self.assertEqual(
+            requests.get(
+                family='counter', version='1.0',
+                status='INVALID_TRANSACTION'),
+            1)
+
+        apply_seconds = self.registry.histogram(
+            'sawtooth_tp_apply_seconds', '', ('family', 'version'))
+        self.assertEqual(
+            apply_seconds.get(family='counter', version='1.0')[0], 3)
+
+        context_seconds = self.registry.histogram(
+            'sawtooth_tp_context_request_seconds', '', ('method',))
+        self.assertEqual(context_seconds.get(method='get_state')[0], 3)
+        self.assertEqual(context_seconds.get(method='set_state')[0], 3)
+        self.assertEqual(context_seconds.get(method='add_event')[0], 2)
+
+        text = self.registry.to_prometheus_text()
+        self.assertIn('sawtooth_stream_pending_requests 0.0\n', text)
+        self.assertIn(
+            '# TYPE sawtooth_stream_sends_rejected_total counter\n'
+            'sawtooth_stream_sends_rejected_total 0.0\n', text)
+        self.assertIn(
+            '# TYPE sawtooth_stream_request_timeouts_total counter\n'
+            'sawtooth_stream_request_timeouts_total 0.0\n', text)
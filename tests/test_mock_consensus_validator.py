@@ -0,0 +1,129 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import queue
+import threading
+import unittest
+
+from sawtooth_sdk.consensus.engine import Engine
+from sawtooth_sdk.consensus.zmq_driver import ZmqDriver
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from sawtooth_processor_test.mock_consensus_validator import \
+    MockConsensusValidator
+
+
+class CommittingEngine(Engine):
+    '''Checks every new block and commits it once it is valid, unless
+    passive, in which case it only records commits.'''
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def __init__(self, passive=False):
+        self.passive = passive
+        self.exit = False
+        self.committed = []
+        self.peer_messages = 0
+
+    def start(self, updates, service, startup_state):
+        while not self.exit:
+            try:
+                type_tag, data = updates.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if self.passive:
+                pass
+            elif type_tag == Message.CONSENSUS_NOTIFY_BLOCK_NEW:
+                service.check_blocks([data.block_id])
+            elif type_tag == Message.CONSENSUS_NOTIFY_BLOCK_VALID:
+                service.commit_block(data)
+
+            if type_tag == Message.CONSENSUS_NOTIFY_BLOCK_COMMIT:
+                self.committed.append(data)
+            elif type_tag == Message.CONSENSUS_NOTIFY_PEER_MESSAGE:
+                self.peer_messages += 1
+
+    def stop(self):
+        self.exit = True
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def name(self):
+        return 'committing'
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def version(self):
+        return '1.0'
+
+    def additional_protocols(self):
+        return []
+
+
+class TestMockConsensusValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = MockConsensusValidator()
+        self.validator.listen('tcp://127.0.0.1:*')
+        self.engine = None
+        self.driver_thread = None
+
+    def tearDown(self):
+        if self.driver_thread is not None:
+            self.validator.deactivate_engine()
+            self.driver_thread.join(10)
+        self.validator.close()
+
+    def start_engine(self, engine):
+        self.engine = engine
+        self.driver_thread = threading.Thread(
+            target=ZmqDriver(engine).start,
+            args=(self.validator.url,))
+        self.driver_thread.start()
+
+        self.assertEqual(
+            self.validator.register_engine(timeout=10),
+            ('committing', '1.0'))
+
+    def test_reactive_simulation(self):
+        """Test that every simulated block is checked, validated and
+        committed in response to the engine's commands.
+        """
+        self.start_engine(CommittingEngine())
+        result = self.validator.simulate(
+            blocks=20, block_rate=500, peer_message_rate=100, timeout=20)
+
+        self.assertEqual(result.blocks_committed, 20)
+        self.assertEqual(self.validator.chain_head.block_num, 20)
+        # One check and one commit per block
+        self.assertEqual(result.commands_received, 40)
+        self.assertEqual(result.command_latency.count, 40)
+        self.assertGreater(result.notifications_sent, 60)
+        self.assertGreater(result.notification_throughput, 0)
+        self.assertLessEqual(
+            result.ack_latency.p50, result.ack_latency.max)
+
+    def test_scripted_simulation(self):
+        """Test that scripted notifications are all acknowledged when the
+        validator does not wait for the engine's commands.
+        """
+        self.start_engine(CommittingEngine(passive=True))
+        result = self.validator.simulate(
+            blocks=20, block_rate=500, respond_to_commands=False, timeout=20)
+
+        self.assertEqual(result.blocks_committed, 20)
+        self.assertEqual(result.notifications_sent, 60)
+        self.assertEqual(result.notifications_acked, 60)
+        self.assertEqual(result.commands_received, 0)
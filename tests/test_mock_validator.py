@@ -0,0 +1,181 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import hashlib
+import threading
+import unittest
+
+from sawtooth_sdk.processor.core import TransactionProcessor
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.processor.handler import TransactionHandler
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessResponse
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+
+
+NAMESPACE = hashlib.sha512(b'counter').hexdigest()[:6]
+
+
+def make_address(name):
+    return NAMESPACE + hashlib.sha512(name.encode()).hexdigest()[:64]
+
+
+class CounterHandler(TransactionHandler):
+    '''Increments the counter named in the payload, rejecting "invalid".'''
+
+    @property
+    def family_name(self):
+        return 'counter'
+
+    @property
+    def family_versions(self):
+        return ['1.0']
+
+    @property
+    def namespaces(self):
+        return [NAMESPACE]
+
+    def apply(self, transaction, context):
+        name = transaction.payload.decode()
+        address = make_address(name)
+
+        entries = context.get_state([address])
+        count = int(entries[0].data) if entries else 0
+
+        context.set_state({address: str(count + 1).encode()})
+        if name == 'invalid':
+            raise InvalidTransaction('Rejected')
+
+        context.add_event('counter/inc', [('name', name)])
+        context.add_receipt_data(name.encode())
+
+
+def make_request(name, index):
+    return TpProcessRequest(
+        header=TransactionHeader(
+            family_name='counter',
+            family_version='1.0',
+            inputs=[NAMESPACE],
+            outputs=[NAMESPACE]),
+        payload=name.encode(),
+        signature='txn{}'.format(index))
+
+
+class TestMockValidatorRun(unittest.TestCase):
+    def setUp(self):
+        self.validator = MockValidator()
+        self.validator.listen('tcp://127.0.0.1:*')
+        self.processors = []
+
+    def tearDown(self):
+        for processor in self.processors:
+            processor.stop()
+        self.validator.close()
+
+    def start_processors(self, count, max_occupancy=None):
+        for _ in range(count):
+            processor = TransactionProcessor(
+                self.validator.url, max_occupancy=max_occupancy)
+            processor.add_handler(CounterHandler())
+            threading.Thread(target=processor.start, daemon=True).start()
+            self.processors.append(processor)
+
+        self.assertTrue(self.validator.register_processors(count))
+
+    def test_run(self):
+        """Test that the mock validator drives a real processor against
+        in-memory state, committing only valid transactions.
+        """
+        self.start_processors(1)
+        names = ['a', 'b', 'a', 'invalid', 'a']
+        state = InMemoryState()
+
+        result = self.validator.run(
+            (make_request(name, i) for i, name in enumerate(names)),
+            state=state,
+            max_in_flight=2,
+            timeout=30)
+
+        self.assertEqual(result.transactions, 5)
+        self.assertEqual(result.valid, 4)
+        self.assertEqual(result.invalid, 1)
+        self.assertEqual(result.latency.count, 5)
+        self.assertGreater(result.tps, 0)
+
+        self.assertEqual(state[make_address('a')], b'3')
+        self.assertEqual(state[make_address('b')], b'1')
+        self.assertNotIn(make_address('invalid'), state)
+
+        self.assertEqual(
+            [receipt.signature for receipt in state.receipts],
+            ['txn0', 'txn1', 'txn2', 'txn3', 'txn4'])
+        self.assertEqual(
+            state.receipts[3].status, TpProcessResponse.INVALID_TRANSACTION)
+        self.assertEqual(state.receipts[3].events, [])
+        self.assertEqual(state.receipts[0].data, [b'a'])
+        self.assertEqual(
+            state.receipts[0].events[0].event_type, 'counter/inc')
+
+    def test_run_multiple_processors(self):
+        """Test that work is spread across every registered processor,
+        within each one's max_occupancy, and reported per processor.
+        """
+        self.start_processors(3, max_occupancy=2)
+
+        for dispatch in ('round_robin', 'least_loaded'):
+            state = InMemoryState()
+            result = self.validator.run(
+                (make_request(str(i), i) for i in range(60)),
+                state=state,
+                timeout=30,
+                dispatch=dispatch)
+
+            self.assertEqual(result.valid, 60)
+            self.assertEqual(len(state), 60)
+            self.assertEqual(
+                set(result.processors),
+                {p.zmq_id for p in self.processors})
+            self.assertEqual(
+                sum(p.transactions for p in result.processors.values()), 60)
+            for processor in result.processors.values():
+                self.assertGreater(processor.transactions, 0)
+
+    def test_run_parallel(self):
+        """Test that a parallel run over several processors gives the same
+        state as running the transactions serially.
+        """
+        self.start_processors(3)
+        names = [str(i % 7) for i in range(50)]
+
+        def requests():
+            for i, name in enumerate(names):
+                request = make_request(name, i)
+                request.header.inputs[:] = [make_address(name)]
+                request.header.outputs[:] = [make_address(name)]
+                yield request
+
+        serial = InMemoryState()
+        self.validator.run(
+            requests(), state=serial, parallel=True, window=1, timeout=30)
+        parallel = InMemoryState()
+        result = self.validator.run(
+            requests(), state=parallel, parallel=True, timeout=30)
+
+        self.assertEqual(dict(serial.items()), dict(parallel.items()))
+        self.assertEqual(parallel[make_address('0')], b'8')
+        self.assertGreater(result.peak_in_flight, 1)
@@ -0,0 +1,111 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+
+from sawtooth_sdk.processor.core import TransactionProcessor
+from sawtooth_sdk.processor.profiling import HandlerProfiler
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+
+from test_mock_validator import CounterHandler
+from test_mock_validator import make_request
+
+
+def slow_apply():
+    time.sleep(0.1)
+
+
+class TestHandlerProfiler(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_rate_and_toggle(self):
+        header = TransactionHeader(family_name='counter', family_version='1.0')
+
+        profiler = HandlerProfiler(self.directory, rate=0)
+        self.assertIsNone(profiler.transaction_profile(header))
+
+        profiler = HandlerProfiler(self.directory, rate=1, enabled=False)
+        self.assertIsNone(profiler.transaction_profile(header))
+        profiler.toggle()
+        self.assertIsNotNone(profiler.transaction_profile(header))
+
+    def test_sample(self):
+        """Test that sampling writes collapsed stacks of the applies, per
+        family and version.
+        """
+        profiler = HandlerProfiler(
+            self.directory, mode='sample', rate=1, sample_interval=0.001)
+        profiler.start()
+        profile = profiler.transaction_profile(
+            TransactionHeader(family_name='counter', family_version='1.0'))
+        with profile:
+            slow_apply()
+        profile.finish(None)
+        profiler.stop()
+
+        with open(os.path.join(self.directory, 'counter-1.0.collapsed')) \
+                as fd:
+            lines = fd.read().splitlines()
+
+        self.assertTrue(lines)
+        for line in lines:
+            _, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any('slow_apply' in line for line in lines))
+
+    def test_cprofile_processor(self):
+        """Test that a processor profiles its handler's applies, and the
+        aggregate is written as pstats.
+        """
+        validator = MockValidator()
+        validator.listen('tcp://127.0.0.1:*')
+        profiler = HandlerProfiler(self.directory, rate=1)
+        processor = TransactionProcessor(validator.url, profiler=profiler)
+        processor.add_handler(CounterHandler())
+        threading.Thread(target=processor.start, daemon=True).start()
+        try:
+            self.assertTrue(validator.register_processors(1))
+            profiler.start()
+            validator.run(
+                (make_request(name, i) for i, name in enumerate('abc')),
+                state=InMemoryState(),
+                timeout=30)
+            # The last profile is added just after its response is sent
+            time.sleep(0.1)
+        finally:
+            processor.stop()
+            validator.close()
+            profiler.stop()
+
+        stats = pstats.Stats(
+            os.path.join(self.directory, 'counter-1.0.pstats'))
+        applies = [
+            value for (_, _, name), value in stats.stats.items()
+            if name == 'apply']
+        # Primitive call count of CounterHandler.apply
+        self.assertEqual(applies[0][0], 3)
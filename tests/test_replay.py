@@ -0,0 +1,70 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from sawtooth_processor_test.replay import DependencyCycleError
+from sawtooth_processor_test.replay import diff_states
+from sawtooth_processor_test.replay import order_by_dependencies
+from sawtooth_processor_test.replay import state_digest
+
+
+def make_request(signature, dependencies=()):
+    return TpProcessRequest(
+        header=TransactionHeader(dependencies=dependencies),
+        signature=signature)
+
+
+class TestReplay(unittest.TestCase):
+    def test_order_by_dependencies(self):
+        """Test that transactions follow their dependencies, keep their
+        order otherwise, and that dependencies outside the file are
+        ignored.
+        """
+        requests = [
+            make_request('a', ['c']),
+            make_request('b'),
+            make_request('c', ['external']),
+            make_request('d', ['a', 'b']),
+        ]
+
+        self.assertEqual(
+            [r.signature for r in order_by_dependencies(requests)],
+            ['b', 'c', 'a', 'd'])
+
+    def test_order_by_dependencies_cycle(self):
+        requests = [make_request('a', ['b']), make_request('b', ['a'])]
+
+        with self.assertRaises(DependencyCycleError):
+            order_by_dependencies(requests)
+
+    def test_state_digest_and_diff(self):
+        """Test that the digest depends only on the entries, and that the
+        diff reports added, removed and changed addresses.
+        """
+        before = {'aa': b'1', 'bb': b'2', 'cc': b'3'}
+        after = {'cc': b'4', 'bb': b'2', 'dd': b'5'}
+
+        self.assertEqual(
+            state_digest(before),
+            state_digest(dict(reversed(list(before.items())))))
+        self.assertNotEqual(state_digest(before), state_digest(after))
+
+        self.assertEqual(
+            diff_states(before, after),
+            {'added': ['dd'], 'removed': ['aa'], 'changed': ['cc']})
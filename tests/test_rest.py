@@ -0,0 +1,65 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_sdk.client.rest import create_session
+from sawtooth_sdk.client.rest import get_paging_suffix
+
+
+class TestCreateSession(unittest.TestCase):
+    def test_pool_and_retries(self):
+        """Test that the session pools connections to both schemes and
+        retries failed connections and gateway errors with a backoff.
+        """
+        session = create_session(pool_size=4, retries=5)
+        self.addCleanup(session.close)
+
+        adapter = session.get_adapter('http://rest-api:8008/state')
+        self.assertIs(session.get_adapter('https://rest-api/state'), adapter)
+        # pylint: disable=protected-access
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+        retry = adapter.max_retries
+        self.assertEqual(retry.total, 5)
+        self.assertEqual(retry.backoff_factor, 0.1)
+        self.assertEqual(set(retry.status_forcelist), {502, 503, 504})
+        self.assertFalse(retry.raise_on_status)
+        # POST is not idempotent, so batch submissions are not retried
+        # on a gateway error
+        self.assertFalse(retry.is_retry('POST', 503))
+        self.assertTrue(retry.is_retry('GET', 503))
+
+
+class TestPagingSuffix(unittest.TestCase):
+    def test_path_prefix(self):
+        """Test that paging links keep the path prefix of the REST API url,
+        whether they are absolute, relative, or name another address.
+        """
+        base_url = 'http://host/sawtooth'
+        for next_url in (
+                'http://host/sawtooth/state?start=2',
+                '/sawtooth/state?start=2',
+                'state?start=2',
+                'http://rest-api:8008/state?start=2'):
+            with self.subTest(next_url=next_url):
+                self.assertEqual(
+                    get_paging_suffix(base_url, next_url), 'state?start=2')
+
+        self.assertEqual(
+            get_paging_suffix(
+                'http://host:8008', 'http://host:8008/state?start=2'),
+            'state?start=2')
+        self.assertIsNone(get_paging_suffix(base_url, None))
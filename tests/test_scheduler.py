@@ -0,0 +1,110 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from sawtooth_processor_test.scheduler import ParallelScheduler
+
+
+def make_request(signature, inputs=(), outputs=(), dependencies=()):
+    return TpProcessRequest(
+        header=TransactionHeader(
+            inputs=inputs, outputs=outputs, dependencies=dependencies),
+        signature=signature)
+
+
+def drain(scheduler):
+    signatures = []
+    while True:
+        request = scheduler.next_request()
+        if request is None:
+            return signatures
+        signatures.append(request.signature)
+
+
+class TestParallelScheduler(unittest.TestCase):
+    def test_conflicts(self):
+        """Test that writers wait for earlier readers and writers of
+        overlapping addresses, while readers only wait for writers.
+        """
+        scheduler = ParallelScheduler([
+            make_request('w1', inputs=['aa'], outputs=['aa']),
+            make_request('r1', inputs=['bb']),
+            make_request('r2', inputs=['bb01']),
+            make_request('w2', outputs=['bb']),
+            make_request('r3', inputs=['aa01']),
+            make_request('w3', outputs=['cc']),
+        ])
+
+        self.assertEqual(drain(scheduler), ['w1', 'r1', 'r2', 'w3'])
+
+        scheduler.complete(make_request('r1'))
+        self.assertEqual(drain(scheduler), [])
+
+        scheduler.complete(make_request('r2'))
+        scheduler.complete(make_request('w1'))
+        self.assertEqual(drain(scheduler), ['w2', 'r3'])
+        self.assertFalse(scheduler.done)
+
+        for signature in ('w2', 'r3', 'w3'):
+            scheduler.complete(make_request(signature))
+        self.assertTrue(scheduler.done)
+
+    def test_dependencies(self):
+        """Test that a request waits for its dependencies even when it does
+        not conflict with them.
+        """
+        scheduler = ParallelScheduler([
+            make_request('a', outputs=['aa']),
+            make_request('b', outputs=['bb'], dependencies=['a', 'x']),
+        ])
+
+        self.assertEqual(drain(scheduler), ['a'])
+        scheduler.complete(make_request('a'))
+        self.assertEqual(drain(scheduler), ['b'])
+
+    def test_window(self):
+        """Test that a window of one runs requests strictly in order."""
+        scheduler = ParallelScheduler(
+            [make_request('a', outputs=['aa']),
+             make_request('b', outputs=['bb'])],
+            window=1)
+
+        self.assertEqual(drain(scheduler), ['a'])
+        scheduler.complete(make_request('a'))
+        self.assertEqual(drain(scheduler), ['b'])
+
+    def test_waiting_conflicts(self):
+        """Test that a request waits for an earlier conflicting one that is
+        itself still waiting, and that namespace prefixes conflict with the
+        addresses under them.
+        """
+        scheduler = ParallelScheduler([
+            make_request('w1', outputs=['aa01']),
+            make_request('w2', outputs=['aa']),
+            make_request('r1', inputs=['aa0102']),
+            make_request('r2', inputs=['ab']),
+        ])
+
+        self.assertEqual(drain(scheduler), ['w1', 'r2'])
+
+        scheduler.complete(make_request('w1'))
+        self.assertEqual(drain(scheduler), ['w2'])
+
+        scheduler.complete(make_request('w2'))
+        self.assertEqual(drain(scheduler), ['r1'])
@@ -0,0 +1,484 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import threading
+import time
+import unittest
+import unittest.mock
+
+import zmq
+
+from sawtooth_sdk.messaging.exceptions import StreamFullError
+from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
+from sawtooth_sdk.messaging.future import Future
+from sawtooth_sdk.messaging.future import FutureResult
+from sawtooth_sdk.messaging.future import FutureTimeoutError
+from sawtooth_sdk.messaging.stream import RECONNECT_EVENT
+from sawtooth_sdk.messaging.stream import ReconnectEvent
+from sawtooth_sdk.messaging.stream import ReconnectPolicy
+from sawtooth_sdk.messaging.stream import Stream
+from sawtooth_sdk.messaging.stream import _encode_message
+from sawtooth_sdk.messaging.stream import StreamLimits
+from sawtooth_sdk.processor.core import TransactionProcessor
+from sawtooth_sdk.protobuf.processor_pb2 import TpRegisterResponse
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+
+from test_mock_validator import CounterHandler
+from test_mock_validator import make_request
+
+
+class TestFuture(unittest.TestCase):
+    def test_failing_callback(self):
+        """Test that a done callback that raises neither stops the other
+        callbacks nor reaches whoever set the result.
+        """
+        future = Future('test')
+        called = []
+
+        def fail(_future):
+            raise RuntimeError('callback failed')
+
+        future.add_done_callback(fail)
+        future.add_done_callback(called.append)
+        with self.assertLogs('sawtooth_sdk.messaging.future', 'ERROR'):
+            future.set_result(FutureResult(Message.PING_RESPONSE, b''))
+
+        self.assertEqual(called, [future])
+        self.assertTrue(future.done())
+
+
+class TestEncodeMessage(unittest.TestCase):
+    def test_matches_protobuf(self):
+        """Test that messages framed by hand serialize exactly as
+        validator_pb2.Message does, including defaulted fields and lengths
+        that need multi-byte varints.
+        """
+        for message_type, correlation_id, content in [
+                (Message.DEFAULT, '', b''),
+                (Message.PING_REQUEST, 'abc', b''),
+                (Message.TP_STATE_SET_REQUEST, 'c' * 32, b'x' * 127),
+                (Message.TP_STATE_SET_REQUEST, 'c' * 32, b'x' * 128),
+                (Message.TP_PROCESS_RESPONSE, '\u00e9' * 200, b'y' * 300000),
+        ]:
+            encoded = _encode_message(message_type, correlation_id, content)
+            self.assertEqual(
+                encoded.data,
+                Message(
+                    message_type=message_type,
+                    correlation_id=correlation_id,
+                    content=content).SerializeToString())
+            self.assertEqual(encoded.message_type, message_type)
+            self.assertEqual(encoded.correlation_id, correlation_id)
+
+
+def make_future(message_type, content):
+    """Returns a resolved Future, with a protobuf content serialized."""
+    future = Future('')
+    if message_type is None:
+        future.set_result(content)
+    else:
+        future.set_result(FutureResult(
+            message_type=message_type, content=content.SerializeToString()))
+    return future
+
+
+class _RouterTestCase(unittest.TestCase):
+    """Connects a Stream made by make_stream to a ROUTER socket standing
+    in for the validator."""
+
+    def make_stream(self, url):
+        raise NotImplementedError()
+
+    def setUp(self):
+        self.context = zmq.Context()
+        self.socket = self.context.socket(zmq.ROUTER)
+        self.socket.bind('tcp://127.0.0.1:*')
+        self.url = self.socket.getsockopt_string(zmq.LAST_ENDPOINT)
+        self.stream = self.make_stream(self.url)
+
+    def tearDown(self):
+        self.stream.close()
+        self.socket.close(linger=0)
+        self.context.term()
+
+    def restart(self):
+        """Replaces the socket, as if the validator had restarted."""
+        self.socket.close(linger=0)
+        self.socket = self.context.socket(zmq.ROUTER)
+        # The old socket releases the port asynchronously
+        for _ in range(100):
+            try:
+                self.socket.bind(self.url)
+                return
+            except zmq.ZMQError:
+                time.sleep(0.01)
+        self.socket.bind(self.url)
+
+    def recv(self):
+        self.assertTrue(self.socket.poll(5000))
+        ident, content = self.socket.recv_multipart()
+        message = Message()
+        message.ParseFromString(content)
+        return ident, message
+
+    def send(self, ident, message_type, correlation_id, content=b''):
+        self.socket.send_multipart([ident, Message(
+            message_type=message_type,
+            correlation_id=correlation_id,
+            content=content).SerializeToString()])
+
+
+class TestStreamConnections(_RouterTestCase):
+    def make_stream(self, url):
+        return Stream(url, connections=3)
+
+    def test_requests_are_sharded(self):
+        """Test that requests are spread across the connections, and each
+        response resolves its request.
+        """
+        self.assertEqual(self.stream.connections, 3)
+        futures = [
+            self.stream.send(Message.PING_REQUEST, str(i).encode())
+            for i in range(30)]
+
+        idents = set()
+        for _ in futures:
+            ident, message = self.recv()
+            idents.add(ident)
+            self.send(ident, Message.PING_RESPONSE, message.correlation_id,
+                      message.content)
+
+        self.assertEqual(len(idents), 3)
+        self.assertEqual(
+            [future.result(5).content for future in futures],
+            [str(i).encode() for i in range(30)])
+        self.assertEqual(self.stream.pending_requests, 0)
+
+    def test_broadcast(self):
+        futures = self.stream.broadcast(Message.PING_REQUEST, b'')
+
+        idents = set()
+        for _ in futures:
+            ident, message = self.recv()
+            idents.add(ident)
+            self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+
+        self.assertEqual(len(idents), 3)
+        for future in futures:
+            future.result(5)
+
+    def test_inbound_merged(self):
+        """Test that requests from the validator on every connection are
+        received, and that replies go back on the connection each request
+        came in on.
+        """
+        futures = self.stream.broadcast(Message.PING_REQUEST, b'')
+        idents = set()
+        for _ in futures:
+            ident, message = self.recv()
+            idents.add(ident)
+            self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+        for future in futures:
+            future.result(5)
+
+        for ident in idents:
+            self.send(ident, Message.PING_REQUEST, ident.hex())
+
+        received = [self.stream.receive().result(5) for _ in idents]
+        self.assertEqual(
+            sorted(message.correlation_id for message in received),
+            sorted(ident.hex() for ident in idents))
+
+        for message in received:
+            self.stream.send_back(
+                Message.PING_RESPONSE, message.correlation_id, b'')
+        for _ in idents:
+            ident, message = self.recv()
+            self.assertEqual(message.correlation_id, ident.hex())
+
+    def test_origin_readiness(self):
+        """Test that while one connection is down, messages received on the
+        others can still be answered.
+        """
+        futures = self.stream.broadcast(Message.PING_REQUEST, b'')
+        idents = []
+        for _ in futures:
+            ident, message = self.recv()
+            idents.append(ident)
+            self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+        for future in futures:
+            future.result(5)
+
+        for ident in idents:
+            self.send(ident, Message.PING_REQUEST, ident.hex())
+        received = [self.stream.receive().result(5) for _ in idents]
+
+        # pylint: disable=protected-access
+        down = self.stream._origin_of(
+            received[0].correlation_id, forget=False).ready
+        down.clear()
+        self.addCleanup(down.set)
+        self.assertFalse(self.stream.is_ready())
+        self.assertFalse(self.stream.is_ready(received[0].correlation_id))
+        for message in received[1:]:
+            self.assertTrue(self.stream.is_ready(message.correlation_id))
+
+        with self.assertRaises(ValidatorConnectionError):
+            self.stream.send_back_batch([
+                (Message.PING_RESPONSE, message.correlation_id, b'')
+                for message in received])
+        answered = sorted(self.recv()[1].correlation_id for _ in range(2))
+        self.assertEqual(
+            answered,
+            sorted(message.correlation_id for message in received[1:]))
+
+
+class TestStreamLimits(_RouterTestCase):
+    def make_stream(self, url):
+        return Stream(url, limits=StreamLimits(
+            max_pending=2, send_timeout=0, max_inbound=2))
+
+    def test_max_pending(self):
+        """Test that a send beyond max_pending fails at once with a zero
+        send_timeout, and succeeds once a response frees a slot.
+        """
+        futures = [
+            self.stream.send(Message.PING_REQUEST, b'') for _ in range(2)]
+        with self.assertRaises(StreamFullError):
+            self.stream.send(Message.PING_REQUEST, b'')
+        self.assertEqual(self.stream.sends_blocked, 1)
+        self.assertEqual(self.stream.sends_rejected, 1)
+
+        ident, message = self.recv()
+        self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+        futures[0].result(5)
+
+        self.stream.send(Message.PING_REQUEST, b'')
+        self.assertEqual(self.stream.pending_requests, 2)
+        self.assertEqual(self.stream.sends_rejected, 1)
+
+    def test_unqueued_send(self):
+        """Test that a send failing because the connection went down after
+        the readiness check gives back its slot and forgets its future.
+        """
+        # pylint: disable=protected-access
+        connection = self.stream._connections[0]
+        with unittest.mock.patch.object(
+                connection.thread, 'put_message', return_value=False):
+            with self.assertRaises(ValidatorConnectionError):
+                self.stream.send(Message.PING_REQUEST, b'')
+        self.assertEqual(self.stream.pending_requests, 0)
+        self.assertEqual(self.stream.queued_bytes, 0)
+        self.assertEqual(len(connection.futures), 0)
+
+        futures = [
+            self.stream.send(Message.PING_REQUEST, b'') for _ in range(2)]
+        for _ in futures:
+            ident, message = self.recv()
+            self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+        for future in futures:
+            future.result(5)
+
+    def test_max_inbound(self):
+        """Test that every message is received even though the connection
+        stops reading while max_inbound messages are waiting.
+        """
+        future = self.stream.send(Message.PING_REQUEST, b'')
+        ident, message = self.recv()
+        self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+        future.result(5)
+
+        for i in range(10):
+            self.send(ident, Message.PING_REQUEST, str(i))
+
+        received = [self.stream.receive().result(5) for _ in range(10)]
+        self.assertEqual(
+            [message.correlation_id for message in received],
+            [str(i) for i in range(10)])
+        self.assertEqual(self.stream.queued_bytes, 0)
+
+
+class TestStreamSendTimeout(_RouterTestCase):
+    def make_stream(self, url):
+        return Stream(url, limits=StreamLimits(max_pending=1, send_timeout=5))
+
+    def test_blocked_send(self):
+        """Test that a send waits for a response to make room."""
+        first = self.stream.send(Message.PING_REQUEST, b'')
+        sent = []
+        thread = threading.Thread(
+            target=lambda: sent.append(
+                self.stream.send(Message.PING_REQUEST, b'')))
+        thread.start()
+
+        ident, message = self.recv()
+        self.assertFalse(self.socket.poll(100))
+        self.assertEqual(sent, [])
+        self.send(ident, Message.PING_RESPONSE, message.correlation_id)
+        first.result(5)
+
+        thread.join(5)
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(self.stream.sends_blocked, 1)
+        self.assertEqual(self.stream.sends_rejected, 0)
+        self.recv()
+
+
+class TestStreamReconnect(_RouterTestCase):
+    def make_stream(self, url):
+        return Stream(url, reconnect=ReconnectPolicy(
+            initial_interval=0.01, max_interval=0.05, replay_reads=True))
+
+    def test_replay_reads(self):
+        """Test that a state read in flight across a reconnect is sent
+        again and resolved, while other requests fail.
+        """
+        read = self.stream.send(Message.TP_STATE_GET_REQUEST, b'read')
+        ping = self.stream.send(Message.PING_REQUEST, b'')
+        self.recv()
+        self.recv()
+
+        self.restart()
+        self.assertRaises(
+            ValidatorConnectionError, getattr, ping.result(5), 'content')
+        self.assertEqual(self.stream.receive().result(5), RECONNECT_EVENT)
+
+        ident, message = self.recv()
+        self.assertEqual(message.message_type, Message.TP_STATE_GET_REQUEST)
+        self.assertEqual(message.content, b'read')
+        self.assertFalse(read.done())
+        self.send(ident, Message.TP_STATE_GET_RESPONSE,
+                  message.correlation_id, b'data')
+        self.assertEqual(read.result(5).content, b'data')
+        self.assertEqual(self.stream.pending_requests, 0)
+
+
+class TestStreamTimeouts(_RouterTestCase):
+    def make_stream(self, url):
+        return Stream(url)
+
+    def test_expiry(self):
+        """Test that a request is expired and forgotten once its timeout
+        passes, without anyone waiting on it, and that a late response to
+        it is dropped.
+        """
+        expired = threading.Event()
+        short = self.stream.send(Message.PING_REQUEST, b'', timeout=0.05)
+        short.add_done_callback(lambda future: expired.set())
+        long = self.stream.send(Message.PING_REQUEST, b'', timeout=5)
+        received = [self.recv(), self.recv()]
+
+        self.assertTrue(expired.wait(5))
+        self.assertRaises(
+            FutureTimeoutError, getattr, short.result(), 'content')
+        self.assertFalse(long.done())
+        self.assertEqual(self.stream.timeouts, 1)
+        self.assertEqual(self.stream.pending_requests, 1)
+
+        for ident, message in received:
+            self.send(ident, Message.PING_RESPONSE, message.correlation_id,
+                      b'late')
+        self.assertEqual(long.result(5).content, b'late')
+
+        self.send(received[0][0], Message.PING_REQUEST, 'request')
+        self.assertEqual(
+            self.stream.receive().result(5).correlation_id, 'request')
+        self.assertEqual(self.stream.pending_requests, 0)
+
+
+class TestProcessorConnections(unittest.TestCase):
+    def test_run(self):
+        """Test that a processor with several connections registers each
+        one and processes transactions arriving on all of them.
+        """
+        validator = MockValidator()
+        validator.listen('tcp://127.0.0.1:*')
+        processor = TransactionProcessor(validator.url, connections=2)
+        processor.add_handler(CounterHandler())
+        threading.Thread(target=processor.start, daemon=True).start()
+        try:
+            self.assertTrue(validator.register_processors(2))
+            result = validator.run(
+                (make_request(str(i % 5), i) for i in range(20)),
+                state=InMemoryState(),
+                max_in_flight=2,
+                timeout=30)
+        finally:
+            processor.stop()
+            validator.close()
+
+        self.assertEqual(result.valid, 20)
+        self.assertEqual(len(result.processors), 2)
+        for throughput in result.processors.values():
+            self.assertGreater(throughput.transactions, 0)
+
+    def test_reconnect_registers_one_connection(self):
+        """Test that a reconnect on one of several connections registers
+        only that connection again.
+        """
+        # pylint: disable=protected-access
+        socket_context = zmq.Context()
+        socket = socket_context.socket(zmq.ROUTER)
+        socket.bind('tcp://127.0.0.1:*')
+        processor = TransactionProcessor(
+            socket.getsockopt_string(zmq.LAST_ENDPOINT), connections=2)
+        processor.add_handler(CounterHandler())
+        stream = unittest.mock.Mock()
+        stream.send.return_value = make_future(
+            Message.TP_REGISTER_RESPONSE,
+            TpRegisterResponse(status=TpRegisterResponse.OK))
+        real_stream, processor._stream = processor._stream, stream
+        try:
+            processor._process_future(make_future(None, ReconnectEvent(1)))
+        finally:
+            real_stream.close()
+            socket.close(linger=0)
+            socket_context.term()
+
+        stream.wait_for_ready.assert_called_with(1)
+        stream.broadcast.assert_not_called()
+        self.assertEqual(stream.send.call_count, 1)
+        self.assertEqual(stream.send.call_args[1]['connection'], 1)
+
+    def test_reregister(self):
+        """Test that a processor registers again with a restarted validator
+        and processes its transactions.
+        """
+        validator = MockValidator()
+        validator.listen('tcp://127.0.0.1:*')
+        processor = TransactionProcessor(
+            validator.url,
+            reconnect=ReconnectPolicy(initial_interval=0.01))
+        processor.add_handler(CounterHandler())
+        threading.Thread(target=processor.start, daemon=True).start()
+        try:
+            self.assertTrue(validator.register_processors(1))
+            url = validator.url
+            validator.close()
+            validator = MockValidator()
+            validator.listen(url)
+            self.assertTrue(validator.register_processors(1))
+            result = validator.run(
+                (make_request(str(i % 5), i) for i in range(10)),
+                state=InMemoryState(),
+                timeout=30)
+        finally:
+            processor.stop()
+            validator.close()
+
+        self.assertEqual(result.valid, 10)
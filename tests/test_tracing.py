@@ -0,0 +1,117 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------------
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from sawtooth_sdk.metrics.registry import MetricsRegistry
+from sawtooth_sdk.processor.core import TransactionProcessor
+from sawtooth_sdk.processor.tracing import JsonLinesSink
+from sawtooth_sdk.processor.tracing import RingBufferSink
+from sawtooth_sdk.processor.tracing import Span
+from sawtooth_sdk.processor.tracing import Tracer
+
+from sawtooth_processor_test.in_memory_state import InMemoryState
+from sawtooth_processor_test.mock_validator import MockValidator
+
+from test_mock_validator import CounterHandler
+from test_mock_validator import make_request
+
+
+class TestSinks(unittest.TestCase):
+    def test_ring_buffer(self):
+        sink = RingBufferSink(capacity=2)
+        for i in range(3):
+            sink.emit(Span(str(i), i))
+
+        self.assertEqual([span.name for span in sink.spans()], ['1', '2'])
+
+    def test_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'spans.jsonl')
+            sink = JsonLinesSink(path)
+            sink.emit(Span('parent', 1.0, 2.0, {'signature': 'txn0'},
+                           [Span('get_state', 1.5, 0.5)]))
+            sink.emit(Span('parent', 3.0))
+            sink.close()
+
+            with open(path) as fd:
+                lines = [json.loads(line) for line in fd]
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]['attributes'], {'signature': 'txn0'})
+        self.assertEqual(lines[0]['children'][0]['name'], 'get_state')
+        self.assertEqual(lines[0]['children'][0]['duration'], 0.5)
+
+
+class TestProcessorTracing(unittest.TestCase):
+    def setUp(self):
+        self.validator = MockValidator()
+        self.validator.listen('tcp://127.0.0.1:*')
+        self.sink = RingBufferSink()
+        # Metrics are enabled too, so both observe each transaction
+        self.processor = TransactionProcessor(
+            self.validator.url,
+            metrics=MetricsRegistry(),
+            tracer=Tracer(self.sink))
+        self.processor.add_handler(CounterHandler())
+        threading.Thread(target=self.processor.start, daemon=True).start()
+        self.assertTrue(self.validator.register_processors(1))
+
+    def tearDown(self):
+        self.processor.stop()
+        self.validator.close()
+
+    def test_spans(self):
+        """Test that each transaction gets a span keyed by its signature,
+        with its Context round-trips nested in the apply span.
+        """
+        names = ['a', 'invalid']
+        self.validator.run(
+            (make_request(name, i) for i, name in enumerate(names)),
+            state=InMemoryState(),
+            timeout=30)
+
+        # The last span is emitted just after its response is sent
+        deadline = time.time() + 5
+        while len(self.sink.spans()) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        spans = {
+            span.attributes['signature']: span for span in self.sink.spans()}
+        self.assertEqual(sorted(spans), ['txn0', 'txn1'])
+
+        valid = spans['txn0']
+        self.assertEqual(valid.name, 'tp_process_request')
+        self.assertEqual(valid.attributes['family'], 'counter')
+        self.assertEqual(valid.attributes['status'], 'OK')
+        apply, = valid.children
+        self.assertEqual(apply.name, 'apply')
+        self.assertEqual(
+            [child.name for child in apply.children],
+            ['get_state', 'set_state', 'add_event', 'add_receipt_data'])
+        self.assertGreaterEqual(valid.duration, apply.duration)
+        self.assertAlmostEqual(
+            apply.attributes['handler_seconds'],
+            apply.duration - sum(c.duration for c in apply.children))
+
+        invalid = spans['txn1']
+        self.assertEqual(invalid.attributes['status'], 'INVALID_TRANSACTION')
+        self.assertEqual(
+            invalid.children[0].attributes['error'], 'InvalidTransaction')
@@ -0,0 +1,207 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import argparse
+import asyncio
+import itertools
+import threading
+import unittest
+import unittest.mock
+
+from sawtooth_sdk.messaging.exceptions import WorkloadConnectionError
+from sawtooth_sdk.protobuf.batch_pb2 import Batch
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.workload.metrics import WorkloadMetrics
+from sawtooth_sdk.workload.sawtooth_workload import Workload
+from sawtooth_sdk.workload.transport import Transport
+from sawtooth_sdk.workload.workload_generator import WorkloadGenerator
+
+
+class FakeTransport(Transport):
+    '''Accepts every batch, reports each one committed the second time its
+    status is asked for, and cannot reach "down".'''
+
+    def __init__(self):
+        self.submitted = []
+        self._asked = set()
+
+    def submit_batches(self, url, batch_list):
+        if url == 'down':
+            raise WorkloadConnectionError(url)
+        self.submitted.extend(b.header_signature for b in batch_list.batches)
+        return True
+
+    def batch_statuses(self, url, batch_ids):
+        statuses = {}
+        for batch_id in batch_ids:
+            statuses[batch_id] = \
+                'COMMITTED' if batch_id in self._asked else 'PENDING'
+            self._asked.add(batch_id)
+        return statuses
+
+
+class SequenceWorkload(Workload):
+    '''Submits numbered batches to the first validator.'''
+
+    def __init__(self, delegate, args):
+        super().__init__(delegate, args)
+        self.urls = []
+        self.committed = []
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def on_will_start(self):
+        pass
+
+    def on_will_stop(self):
+        pass
+
+    def on_validator_discovered(self, url):
+        self.urls.append(url)
+
+    def on_validator_removed(self, url):
+        self.urls.remove(url)
+
+    def on_all_batches_committed(self):
+        self._send()
+
+    def on_batch_committed(self, batch_id):
+        with self._lock:
+            self.committed.append(batch_id)
+
+    def on_batch_not_yet_committed(self):
+        self._send()
+
+    def _send(self):
+        if not self.urls:
+            return
+        url = self.urls[0]
+        batch_id = 'batch-{}'.format(next(self._ids))
+        batch_list = BatchList(batches=[Batch(header_signature=batch_id)])
+        if self.delegate.submit_batches(url, batch_list):
+            self.delegate.on_new_batch(batch_id, url)
+
+
+class ChainedWorkload(SequenceWorkload):
+    '''Also submits a batch for each one committed, as the example
+    workloads do.'''
+
+    def on_batch_committed(self, batch_id):
+        super().on_batch_committed(batch_id)
+        self._send()
+
+
+class FakeEventClient:
+    '''Reports every watched batch committed at once.'''
+
+    def __init__(self, url):
+        self.url = url
+
+    def watch_batches(self, batch_ids, callback):
+        for batch_id in batch_ids:
+            callback(batch_id, 'COMMITTED')
+
+    def close(self):
+        pass
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        tasks = asyncio.Task.all_tasks(self.loop)
+        for task in tasks:
+            task.cancel()
+        self.loop.run_until_complete(
+            asyncio.gather(*tasks, return_exceptions=True))
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def test_generator(self):
+        """Test that the generator submits batches through its transport,
+        polls them until they commit, drops validators it cannot reach,
+        and counts it all in its metrics.
+        """
+        transport = FakeTransport()
+        generator = WorkloadGenerator(
+            argparse.Namespace(
+                urls='down,http://rest-api:8008',
+                rate=100,
+                display_frequency=30,
+                auth_info=None),
+            transport=transport)
+        workload = SequenceWorkload(generator, None)
+        generator.set_workload(workload)
+
+        self.loop.call_later(0.5, self.loop.stop)
+        generator.run()
+        generator.thread_pool.shutdown()
+
+        metrics = generator.metrics.snapshot()
+        self.assertEqual(workload.urls, ['http://rest-api:8008'])
+        self.assertEqual(metrics['unreachable'], 1)
+        self.assertGreater(metrics['committed'], 0)
+        self.assertEqual(metrics['submitted'], len(transport.submitted))
+        self.assertEqual(
+            metrics['committed'] + metrics['pending'], metrics['submitted'])
+        self.assertEqual(len(workload.committed), metrics['committed'])
+
+    def test_events_rate(self):
+        """Test that with commit events the generator still calls the
+        workload at most once a tick, so the rate bounds submissions.
+        """
+        transport = FakeTransport()
+        with unittest.mock.patch(
+                'sawtooth_sdk.workload.workload_generator.EventClient',
+                FakeEventClient):
+            generator = WorkloadGenerator(
+                argparse.Namespace(
+                    urls='http://rest-api:8008',
+                    rate=20,
+                    display_frequency=30,
+                    auth_info=None,
+                    events_url='tcp://validator:4004'),
+                transport=transport)
+        workload = ChainedWorkload(generator, None)
+        generator.set_workload(workload)
+
+        self.loop.call_later(0.5, self.loop.stop)
+        generator.run()
+        generator.thread_pool.shutdown()
+
+        # 0.5 seconds at 20 ticks a second
+        self.assertGreater(len(transport.submitted), 2)
+        self.assertLessEqual(len(transport.submitted), 11)
+        self.assertGreater(len(workload.committed), 0)
+
+
+class TestWorkloadMetrics(unittest.TestCase):
+    def test_metrics(self):
+        metrics = WorkloadMetrics()
+        metrics.record_submit(['a', 'b'], True, 0.1)
+        metrics.record_submit(['c'], False, 0.3)
+        metrics.record_committed('a')
+        metrics.record_dropped('b')
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(
+            {key: snapshot[key] for key in (
+                'submitted', 'rejected', 'committed', 'dropped', 'pending')},
+            {'submitted': 2, 'rejected': 1, 'committed': 1, 'dropped': 1,
+             'pending': 0})
+        self.assertAlmostEqual(snapshot['submit_latency_mean'], 0.2)
+        self.assertAlmostEqual(snapshot['submit_latency_max'], 0.3)
@@ -0,0 +1,131 @@
+# Copyright 2018 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import base64
+import json
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from sawtooth_signing import create_context
+
+import example_paths  # pylint: disable=unused-import
+
+from sawtooth_xo.xo_client import XoClient
+from sawtooth_xo.xo_exceptions import XoException
+
+from test_intkey_client import FakeEvents
+from test_intkey_client import make_response
+
+
+class XoClientTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.priv', delete=False) as keyfile:
+            keyfile.write(
+                create_context('secp256k1').new_random_private_key().as_hex())
+        self.addCleanup(os.remove, keyfile.name)
+        self.keyfile = keyfile.name
+        self.session = unittest.mock.Mock()
+        self.session.post.return_value = make_response('{"link": "x"}', 202)
+
+    def client(self, **kwargs):
+        return XoClient(
+            'http://rest-api:8008',
+            keyfile=self.keyfile,
+            session=self.session,
+            **kwargs)
+
+
+class TestXoClientWait(XoClientTest):
+    def test_events_committed(self):
+        """Test that a move committed while waiting on events returns the
+        REST API's response.
+        """
+        events = FakeEvents('COMMITTED')
+
+        response = self.client(events=events).create('game', wait=5)
+
+        self.assertEqual(response, '{"link": "x"}')
+        self.assertEqual(len(events.waits), 1)
+
+    def test_events_invalid(self):
+        """Test that an invalid or timed out move waited for on events
+        raises instead of being reported as sent.
+        """
+        for status in ('INVALID', 'PENDING'):
+            with self.subTest(status=status):
+                with self.assertRaises(XoException):
+                    self.client(events=FakeEvents(status)).take(
+                        'game', 5, wait=5)
+
+    def test_poll_invalid(self):
+        """Test that an invalid move waited for by polling its status
+        raises.
+        """
+        self.session.get.return_value = make_response(
+            '{"data": [{"status": "INVALID"}]}')
+
+        with self.assertRaises(XoException):
+            self.client().take('game', 5, wait=5)
+
+
+class TestXoClientPaging(XoClientTest):
+    def test_path_prefix(self):
+        """Test that listing follows the REST API's paging link under the
+        path prefix of its url.
+        """
+        def page(game, next_url=None):
+            return make_response(json.dumps({
+                'data': [{
+                    'address': 'a',
+                    'data': base64.b64encode(game.encode()).decode()
+                }],
+                'paging': {} if next_url is None else {'next': next_url},
+            }))
+
+        self.session.get.side_effect = [
+            page('g1,---------,P1-NEXT,,',
+                 'http://host/sawtooth/state?address=5b7349&start=2'),
+            page('g2,---------,P1-NEXT,,'),
+        ]
+        client = XoClient('http://host/sawtooth', session=self.session)
+
+        self.assertEqual(
+            [game[0] for game in client.list_games()], ['g1', 'g2'])
+        self.assertEqual(
+            [call[0][0] for call in self.session.get.call_args_list],
+            ['http://host/sawtooth/state?address=5b7349',
+             'http://host/sawtooth/state?address=5b7349&start=2'])
+
+
+class TestXoClientSession(unittest.TestCase):
+    def test_close_own_session(self):
+        """Test that leaving the client's context closes the session it
+        created, but not one it was given.
+        """
+        with unittest.mock.patch(
+                'sawtooth_xo.xo_client.create_session') as create_session:
+            with XoClient('http://rest-api:8008') as client:
+                pass
+        create_session.return_value.close.assert_called_once_with()
+        # pylint: disable=protected-access
+        self.assertIs(client._session, create_session.return_value)
+
+        session = unittest.mock.Mock()
+        with XoClient('http://rest-api:8008', session=session):
+            pass
+        session.close.assert_not_called()
@@ -13,15 +13,18 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+import asyncio
 import logging
 import threading
 import random
 import string
+import time
 import unittest
 import queue
 
 import zmq
 
+from sawtooth_sdk.consensus.engine import AsyncEngine
 from sawtooth_sdk.consensus.engine import Engine
 from sawtooth_sdk.consensus.zmq_driver import ZmqDriver
 from sawtooth_sdk.protobuf import consensus_pb2
@@ -65,6 +68,38 @@ class MockEngine(Engine):
         return [('Test-Name', 'Test-Version')]
 
 
+class MockAsyncEngine(AsyncEngine):
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def __init__(self):
+        self.updates = []
+        self.chain_head = None
+        self.exit = False
+
+    async def start(self, updates, service, startup_state):
+        self.chain_head = await service.get_chain_head()
+        while not self.exit:
+            try:
+                update = await asyncio.wait_for(updates.get(), 0.1)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                self.updates.append(update)
+
+    def stop(self):
+        self.exit = True
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def name(self):
+        return 'test-name'
+
+    # Ignore invalid override pylint issues
+    # pylint: disable=invalid-overridden-method
+    def version(self):
+        return 'test-version'
+
+
 class TestDriver(unittest.TestCase):
     def setUp(self):
         self.ctx = zmq.Context.instance()
@@ -199,6 +234,150 @@ class TestDriver(unittest.TestCase):
         self.driver.stop()
         driver_thread.join()
 
+    def test_driver_batched(self):
+        """Test that a driver in batch mode acknowledges every notification
+        and delivers them to the engine in order, as lists.
+        """
+        self.driver = ZmqDriver(self.engine, batch_size=16)
+        driver_thread = threading.Thread(
+            target=self.driver.start,
+            args=(self.url,))
+
+        driver_thread.start()
+
+        response = consensus_pb2.ConsensusRegisterResponse(
+            status=consensus_pb2.ConsensusRegisterResponse.OK)
+
+        self.recv_rep(
+            consensus_pb2.ConsensusRegisterRequest,
+            response,
+            Message.CONSENSUS_REGISTER_RESPONSE)
+
+        self.send_req_rep(
+            consensus_pb2.ConsensusNotifyEngineActivated(),
+            Message.CONSENSUS_NOTIFY_ENGINE_ACTIVATED)
+
+        notifications = [
+            (consensus_pb2.ConsensusNotifyBlockNew(),
+             Message.CONSENSUS_NOTIFY_BLOCK_NEW),
+            (consensus_pb2.ConsensusNotifyBlockValid(),
+             Message.CONSENSUS_NOTIFY_BLOCK_VALID),
+            (network_pb2.PingRequest(),
+             Message.PING_REQUEST),
+            (consensus_pb2.ConsensusNotifyBlockCommit(),
+             Message.CONSENSUS_NOTIFY_BLOCK_COMMIT),
+        ] * 5
+
+        correlation_ids = set()
+        for request, request_type in notifications:
+            message = Message(
+                message_type=request_type,
+                correlation_id=generate_correlation_id(),
+                content=request.SerializeToString())
+            correlation_ids.add(message.correlation_id)
+            self.socket.send_multipart(
+                [self.connection_id, message.SerializeToString()],
+                0)
+
+        acked = set()
+        for _ in notifications:
+            # pylint: disable=unbalanced-tuple-unpacking
+            _, reply_bytes = self.socket.recv_multipart(0)
+            reply = Message()
+            reply.ParseFromString(reply_bytes)
+            self.assertEqual(
+                reply.message_type,
+                Message.CONSENSUS_NOTIFY_ACK)
+            acked.add(reply.correlation_id)
+
+        self.assertEqual(acked, correlation_ids)
+
+        # Updates are queued after the acks are sent, so give the engine a
+        # moment to pull them off the queue
+        deadline = time.time() + 5
+        while sum(len(update) for update in self.engine.updates) < 15 \
+                and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.driver.stop()
+        driver_thread.join()
+
+        for update in self.engine.updates:
+            self.assertIsInstance(update, list)
+
+        self.assertEqual(
+            [msg_type
+             for update in self.engine.updates
+             for (msg_type, data) in update],
+            [
+                Message.CONSENSUS_NOTIFY_BLOCK_NEW,
+                Message.CONSENSUS_NOTIFY_BLOCK_VALID,
+                Message.CONSENSUS_NOTIFY_BLOCK_COMMIT,
+            ] * 5)
+
+    def test_async_driver(self):
+        """Test that an AsyncEngine can make service requests and receives
+        notifications on an asyncio queue.
+        """
+        engine = MockAsyncEngine()
+        self.driver = ZmqDriver(engine)
+        driver_thread = threading.Thread(
+            target=self.driver.start,
+            args=(self.url,))
+
+        driver_thread.start()
+
+        self.recv_rep(
+            consensus_pb2.ConsensusRegisterRequest,
+            consensus_pb2.ConsensusRegisterResponse(
+                status=consensus_pb2.ConsensusRegisterResponse.OK),
+            Message.CONSENSUS_REGISTER_RESPONSE)
+
+        self.send_req_rep(
+            consensus_pb2.ConsensusNotifyEngineActivated(),
+            Message.CONSENSUS_NOTIFY_ENGINE_ACTIVATED)
+
+        self.recv_rep(
+            consensus_pb2.ConsensusChainHeadGetRequest,
+            consensus_pb2.ConsensusChainHeadGetResponse(
+                status=consensus_pb2.ConsensusChainHeadGetResponse.OK,
+                block=consensus_pb2.ConsensusBlock(
+                    block_id=b'head',
+                    block_num=3)),
+            Message.CONSENSUS_CHAIN_HEAD_GET_RESPONSE)
+
+        self.send_req_rep(
+            consensus_pb2.ConsensusNotifyBlockNew(),
+            Message.CONSENSUS_NOTIFY_BLOCK_NEW)
+
+        self.send_req_rep(
+            consensus_pb2.ConsensusNotifyBlockCommit(),
+            Message.CONSENSUS_NOTIFY_BLOCK_COMMIT)
+
+        deadline = time.time() + 5
+        while len(engine.updates) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.driver.stop()
+        driver_thread.join()
+
+        self.assertEqual(engine.chain_head.block_id, b'head')
+        self.assertEqual(
+            [msg_type for (msg_type, data) in engine.updates],
+            [
+                Message.CONSENSUS_NOTIFY_BLOCK_NEW,
+                Message.CONSENSUS_NOTIFY_BLOCK_COMMIT,
+            ])
+        # pylint: disable=protected-access
+        self.assertTrue(self.driver._update_loop.is_closed())
+
+    def test_async_cache_size(self):
+        """Test that a cache cannot be asked for with an AsyncEngine, whose
+        service does not cache.
+        """
+        with self.assertRaises(ValueError):
+            ZmqDriver(MockAsyncEngine(), cache_size=10)
+
 
 def generate_correlation_id():
     return ''.join(random.choice(string.ascii_letters) for _ in range(16))
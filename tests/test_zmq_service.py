@@ -13,8 +13,12 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+import asyncio
 import unittest
+import unittest.mock
 
+from sawtooth_sdk.consensus.async_zmq_service import AsyncZmqService
+from sawtooth_sdk.consensus.exceptions import UnknownBlock
 from sawtooth_sdk.consensus.zmq_service import ZmqService
 from sawtooth_sdk.messaging.future import Future
 from sawtooth_sdk.messaging.future import FutureResult
@@ -53,7 +57,8 @@ class TestService(unittest.TestCase):
             content=consensus_pb2.ConsensusSendToRequest(
                 message_type='message_type',
                 content=b'payload',
-                receiver_id=b'receiver_id').SerializeToString())
+                receiver_id=b'receiver_id').SerializeToString(),
+            timeout=10)
 
     def test_broadcast(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -70,7 +75,8 @@ class TestService(unittest.TestCase):
             message_type=Message.CONSENSUS_BROADCAST_REQUEST,
             content=consensus_pb2.ConsensusBroadcastRequest(
                 message_type='message_type',
-                content=b'payload').SerializeToString())
+                content=b'payload').SerializeToString(),
+            timeout=10)
 
     def test_initialize_block(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -84,7 +90,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_INITIALIZE_BLOCK_REQUEST,
             content=consensus_pb2.ConsensusInitializeBlockRequest(
-                previous_id=b'test').SerializeToString())
+                previous_id=b'test').SerializeToString(),
+            timeout=10)
 
     def test_summarize_block(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -98,7 +105,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_SUMMARIZE_BLOCK_REQUEST,
             content=consensus_pb2.ConsensusSummarizeBlockRequest()
-                                 .SerializeToString())
+                                 .SerializeToString(),
+            timeout=10)
 
         self.assertEqual(result, b'summary')
 
@@ -114,7 +122,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_FINALIZE_BLOCK_REQUEST,
             content=consensus_pb2.ConsensusFinalizeBlockRequest(
-                data=b'test').SerializeToString())
+                data=b'test').SerializeToString(),
+            timeout=10)
 
         self.assertEqual(result, b'block_id')
 
@@ -131,7 +140,8 @@ class TestService(unittest.TestCase):
 
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_CANCEL_BLOCK_REQUEST,
-            content=request.SerializeToString())
+            content=request.SerializeToString(),
+            timeout=10)
 
     def test_check_blocks(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -145,7 +155,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_CHECK_BLOCKS_REQUEST,
             content=consensus_pb2.ConsensusCheckBlocksRequest(
-                block_ids=[b'test1', b'test2']).SerializeToString())
+                block_ids=[b'test1', b'test2']).SerializeToString(),
+            timeout=10)
 
     def test_commit_block(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -159,7 +170,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_COMMIT_BLOCK_REQUEST,
             content=consensus_pb2.ConsensusCommitBlockRequest(
-                block_id=b'test').SerializeToString())
+                block_id=b'test').SerializeToString(),
+            timeout=10)
 
     def test_ignore_block(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -173,7 +185,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_IGNORE_BLOCK_REQUEST,
             content=consensus_pb2.ConsensusIgnoreBlockRequest(
-                block_id=b'test').SerializeToString())
+                block_id=b'test').SerializeToString(),
+            timeout=10)
 
     def test_fail_block(self):
         self.mock_stream.send.return_value = self._make_future(
@@ -187,7 +200,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_FAIL_BLOCK_REQUEST,
             content=consensus_pb2.ConsensusFailBlockRequest(
-                block_id=b'test').SerializeToString())
+                block_id=b'test').SerializeToString(),
+            timeout=10)
 
     def test_get_blocks(self):
         block_1 = consensus_pb2.ConsensusBlock(
@@ -215,7 +229,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_BLOCKS_GET_REQUEST,
             content=consensus_pb2.ConsensusBlocksGetRequest(
-                block_ids=[b'id1', b'id2']).SerializeToString())
+                block_ids=[b'id1', b'id2']).SerializeToString(),
+            timeout=10)
 
         self.assertEqual({
             block_id: (
@@ -248,7 +263,8 @@ class TestService(unittest.TestCase):
         self.mock_stream.send.assert_called_with(
             message_type=Message.CONSENSUS_CHAIN_HEAD_GET_REQUEST,
             content=consensus_pb2.ConsensusChainHeadGetRequest()
-            .SerializeToString())
+            .SerializeToString(),
+            timeout=10)
 
         self.assertEqual(chain_head.block_id, b'block')
         self.assertEqual(chain_head.previous_id, b'block0')
@@ -277,7 +293,8 @@ class TestService(unittest.TestCase):
             message_type=Message.CONSENSUS_SETTINGS_GET_REQUEST,
             content=consensus_pb2.ConsensusSettingsGetRequest(
                 block_id=b'test',
-                keys=['test1', 'test2']).SerializeToString())
+                keys=['test1', 'test2']).SerializeToString(),
+            timeout=10)
 
         self.assertEqual(
             entries, {
@@ -306,10 +323,100 @@ class TestService(unittest.TestCase):
             message_type=Message.CONSENSUS_STATE_GET_REQUEST,
             content=consensus_pb2.ConsensusStateGetRequest(
                 block_id=b'test',
-                addresses=['test1', 'test2']).SerializeToString())
+                addresses=['test1', 'test2']).SerializeToString(),
+            timeout=10)
 
         self.assertEqual(
             entries, {
                 'address1': b'data1',
                 'address2': b'data2',
             })
+
+
+class TestAsyncService(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.mock_stream = unittest.mock.Mock()
+        self.service = AsyncZmqService(
+            stream=self.mock_stream,
+            timeout=10,
+            loop=self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_response_after_close(self):
+        """Test that a response arriving once the engine's loop is closed is
+        dropped without raising on the stream's side.
+        """
+        future = Future('head')
+        self.mock_stream.send.return_value = future
+
+        with self.assertRaises(asyncio.TimeoutError):
+            self.loop.run_until_complete(asyncio.wait_for(
+                self.service.get_chain_head(), 0.01))
+        self.loop.close()
+
+        with unittest.mock.patch(
+                'sawtooth_sdk.messaging.future.LOGGER') as logger:
+            future.set_result(FutureResult(
+                message_type=Message.CONSENSUS_CHAIN_HEAD_GET_RESPONSE,
+                content=b''))
+        logger.exception.assert_not_called()
+        self.assertTrue(future.done())
+
+    def test_concurrent_requests(self):
+        """Test that requests resolve when their responses arrive, even when
+        several are outstanding at once and they complete out of order.
+        """
+        futures = [Future('settings'), Future('state')]
+        self.mock_stream.send.side_effect = futures
+
+        async def run():
+            pending = asyncio.gather(
+                self.service.get_settings(b'test', ['key1']),
+                self.service.get_state(b'test', ['address1']))
+            await asyncio.sleep(0)
+
+            futures[1].set_result(FutureResult(
+                message_type=Message.CONSENSUS_STATE_GET_RESPONSE,
+                content=consensus_pb2.ConsensusStateGetResponse(
+                    status=consensus_pb2.ConsensusStateGetResponse.OK,
+                    entries=[
+                        consensus_pb2.ConsensusStateEntry(
+                            address='address1',
+                            data=b'data1')]).SerializeToString()))
+            futures[0].set_result(FutureResult(
+                message_type=Message.CONSENSUS_SETTINGS_GET_RESPONSE,
+                content=consensus_pb2.ConsensusSettingsGetResponse(
+                    status=consensus_pb2.ConsensusSettingsGetResponse.OK,
+                    entries=[
+                        consensus_pb2.ConsensusSettingsEntry(
+                            key='key1',
+                            value='value1')]).SerializeToString()))
+
+            return await pending
+
+        settings, state = self.loop.run_until_complete(run())
+
+        self.assertEqual(settings, {'key1': 'value1'})
+        self.assertEqual(state, {'address1': b'data1'})
+
+    def test_unknown_block(self):
+        fut = Future('test')
+        fut.set_result(FutureResult(
+            message_type=Message.CONSENSUS_COMMIT_BLOCK_RESPONSE,
+            content=consensus_pb2.ConsensusCommitBlockResponse(
+                status=consensus_pb2.ConsensusCommitBlockResponse
+                .UNKNOWN_BLOCK).SerializeToString()))
+        self.mock_stream.send.return_value = fut
+
+        with self.assertRaises(UnknownBlock):
+            self.loop.run_until_complete(
+                self.service.commit_block(block_id=b'test'))
+
+        self.mock_stream.send.assert_called_with(
+            message_type=Message.CONSENSUS_COMMIT_BLOCK_REQUEST,
+            content=consensus_pb2.ConsensusCommitBlockRequest(
+                block_id=b'test').SerializeToString(),
+            timeout=10)